@@ -9,12 +9,68 @@ NUMBER_OF_CA_TICKS  = 10       # (test only 5, [10], 15) TESTED
 ACTION_DECODING     = "center" # (test only ['center'], 'majority', 'sum') TESTED
 NEIGHBORHOOD_SIZE = 2 * NEIGHBORHOOD_RADIUS + 1
 
+# CA CONTROLLER PARAMS (DEPLOYED CONTROLLER ONLY)
+CA_CONTROLLER_MODE       = "compiled" # 'direct' (run the CA every step), 'compiled' (observation -> action lookup)
+CA_CONTROLLER_CACHE_SIZE = 65536      # max discrete observations kept in the lazily filled action cache
+CA_CONTROLLER_DENSE_BITS = 16         # precompute every action when 4 * BITS_PER_VALUE <= this
+
 # GA PARAMS
 POPULATION_SIZE = 50
 NUMBER_OF_GENERATIONS = 20
 ELITE_PERCENTAGE = 0.05
 TOURNAMENT_SIZE = 3
 MUTATION_RATE = 0.1
+POPULATION_BACKEND = "matrix"  # 'list' (one Python list per rule, operators applied one child at a time),
+                               # 'matrix' (uint8 population x rule_size array, operators applied to all children at once)
+CROSSOVER_TYPE = "one_point"   # 'one_point' or 'uniform'
+EVALUATION_BACKEND = "batched" # 'serial' (one evaluate_rule per rule), 'batched' (whole population as one 2D array),
+                               # 'thread' / 'process' (batched chunks of the population on a worker pool)
+EVALUATION_WORKERS = None      # pool size for 'thread' / 'process', None = one per CPU
+EVALUATION_CHUNK_SIZE = None   # rules per pool task, None = one chunk per worker
+FITNESS_CACHE_SIZE = 4096      # in-memory LRU entries of the fitness cache, 0 disables the memory tier
+FITNESS_CACHE_PATH = None      # pickle file for the persistent tier (e.g. "results/fitness_cache.pkl"), None disables it
+                               # keys include the episode seeds, so across generations the cache only hits with
+                               # SEED_SCHEDULE = 'fixed'; with 'per_generation' only duplicate rules within a generation hit
+                               # (the GA log reports the hit rate per generation)
+RACING_ENABLED = True          # successive halving: drop rules that can no longer reach the selection cutoff early
+RACING_INITIAL_EPISODES = 2    # episodes every rule plays before the first drop (the budget then doubles per round)
+RACING_SURVIVOR_FRACTION = 0.5 # fraction of the population that must be ranked on all episodes (at least the elites)
+RACING_CONFIDENCE_Z = 2.0      # width of the confidence bound on each mean, in standard errors
+RACING_MINIMUM_STD = 10.0      # floor on the per-rule reward spread, in steps
+RUN_SEED = None                # seeds the GA's random module (and so every episode seed), None = a different run each time
+SEED_SCHEDULE = "per_generation" # 'per_generation' (new reset seeds every generation, shared by all rules),
+                                 # 'fixed' (one seed set for the whole run), 'none' (unseeded resets, no caching)
+GA_CHECKPOINT_PATH = "results/ga_checkpoint.pkl" # population, fitness and RNG states of the last checkpoint, None disables it
+GA_CHECKPOINT_INTERVAL = 1     # generations between checkpoints
+GA_RESUME = False              # continue from GA_CHECKPOINT_PATH instead of starting a new run
+                               # (single-population GA only: island runs, ISLAND_COUNT != 1, are not checkpointed)
+
+# ISLAND MODEL PARAMS (K POPULATIONS IN SEPARATE PROCESSES, EACH EVALUATED WITH THE 'batched' BACKEND)
+ISLAND_COUNT = 1                        # 1 = single-population GA, None = one island per CPU
+MIGRATION_INTERVAL = 5                  # generations between migrations
+MIGRATION_SIZE = 2                      # best rules each island sends per migration, replacing the receiver's worst
+MIGRATION_TOPOLOGY = "ring"             # 'ring' (island i -> i + 1) or 'all_to_all'
+
+# SWEEP PARAMS (sweep.py: ONE GA RUN PER CONFIG x SEED ON A PROCESS POOL, ONE CONSOLIDATED RESULTS TABLE)
+SWEEP_GRID = {                          # values per CA parameter, every combination is one config
+    "bits_per_value":      [4, 6, 8],
+    "row_length":          [32, 48, 64],
+    "neighborhood_radius": [1, 2],
+    "number_of_ca_ticks":  [5, 10, 15],
+    "action_decoding":     ["center", "majority", "sum"],
+}
+SWEEP_SEEDS = [0, 1, 2]                 # RUN_SEED of the GA runs, every config runs once per seed
+SWEEP_WORKERS = None                    # parallel GA runs, None = one per CPU
+SWEEP_TEST_EPISODES = 20                # held-out seeded episodes the winning rule of every run is scored on
+SWEEP_TEST_SEED = 12345                 # seeds the held-out episodes, the same for every run so configs are compared fairly
+SWEEP_RESULTS_PATH = "results/sweeps/sweep_results.csv" # finished runs are skipped when the sweep is restarted
+
+# EXHAUSTIVE SEARCH PARAMS (USED INSTEAD OF THE GA WHEN THE WHOLE RULE SPACE IS SMALL)
+EXHAUSTIVE_MAX_RULES = 256              # enumerate every rule when 2 ** rule_size <= this (radius 1 only)
+EXHAUSTIVE_PROBE_SAMPLES = 2048         # sampled probe observations used to detect equivalent rules
+EXHAUSTIVE_PROBE_EXACT_BITS = 12        # probe every discrete observation when 4 * BITS_PER_VALUE <= this
+EXHAUSTIVE_SEED = 0                     # seed for probe sampling and evaluation episodes
+EXHAUSTIVE_EVALUATION_BACKEND = "process"
 
 
 # ENVIRONMENT
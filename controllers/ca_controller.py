@@ -1,20 +1,160 @@
-from ca_config import NEIGHBORHOOD_SIZE, NEIGHBORHOOD_RADIUS, NUMBER_OF_CA_TICKS
+from collections import OrderedDict
+
+import numpy as np
+
+import ca_config
+from ca_config import NEIGHBORHOOD_SIZE, NEIGHBORHOOD_RADIUS, NUMBER_OF_CA_TICKS, ROW_LENGTH, BITS_PER_VALUE, \
+    CA_CONTROLLER_CACHE_SIZE, CA_CONTROLLER_DENSE_BITS, NUMBER_OF_EPISODES, MAXIMUM_STEPS_PER_EPISODE
+from utils.artifacts.artifact_store import load_or_build
+from utils.ca.ca_params import resolve_ca_params
 from utils.ca.generate_rule      import generate_rule
 from utils.ca.observation_to_bitstring import observation_to_bitstring
-from utils.ca.step_eca           import step_eca
-from utils.ca.decode_action_from_row import decode_action_from_row
+from utils.ca.discretize_observation import discretize_observation
+from utils.ca.encode_into_row    import encode_into_row
+from utils.ca.encode_observations import encode_observations
+from utils.ca.packed_row           import compile_row_rule, step_row_ticks
+from utils.ca.step_eca_vectorized import step_eca_vectorized
+from utils.ca.decode_action_from_row import decode_action_from_row, decode_actions_from_rows
 
 RULE_INDEX = [0] * (2 ** NEIGHBORHOOD_SIZE)
+# RULE TABLE AND PACKED FORM OF RULE_INDEX (None WHEN THE RADIUS STEPS WITH step_eca_vectorized), REBUILT ONLY WHEN THE RULE CHANGES
+RULE_TABLE = generate_rule(RULE_INDEX)
+PACKED_RULE = compile_row_rule(RULE_TABLE, NEIGHBORHOOD_RADIUS)
+
+# COMPILED CONTROLLER STATE: LAZILY FILLED ACTION CACHE, OPTIONAL DENSE TABLE AND HIT COUNTERS
+ACTION_CACHE = OrderedDict()
+DENSE_ACTIONS = None
+CACHE_HITS = 0
+CACHE_MISSES = 0
 
 def set_rule_index(new_rule_index):
-    global RULE_INDEX
+    global RULE_INDEX, RULE_TABLE, PACKED_RULE
     RULE_INDEX = new_rule_index
+    RULE_TABLE = generate_rule(RULE_INDEX)
+    PACKED_RULE = compile_row_rule(RULE_TABLE, NEIGHBORHOOD_RADIUS)
+    reset_action_cache()
 
 def ca_action(observation):
-    rule_table = generate_rule(RULE_INDEX)
     bit_pre = observation_to_bitstring(observation)
-    bit_post = bit_pre.copy()
-    for _ in range(NUMBER_OF_CA_TICKS):
-        bit_post = step_eca(bit_post, rule_table, NEIGHBORHOOD_RADIUS)
+    bit_post = step_row_ticks(bit_pre, RULE_TABLE, PACKED_RULE, NEIGHBORHOOD_RADIUS, NUMBER_OF_CA_TICKS)
     action = decode_action_from_row(bit_post)
     return action, bit_pre, bit_post
+
+# NAME OF THE STORED BEST RULE IN THE ARTIFACT STORE
+CA_RULE_ARTIFACT = "ca_rule"
+
+# ca_config SETTINGS THAT CHANGE THE RULE EACH SEARCH FINDS, PART OF THE FINGERPRINT
+# (EVALUATION BACKENDS, WORKER COUNTS AND CACHES ONLY CHANGE HOW FAST THE SAME RULE IS FOUND)
+GA_SEARCH_SETTINGS = (
+    "POPULATION_SIZE", "NUMBER_OF_GENERATIONS", "ELITE_PERCENTAGE", "TOURNAMENT_SIZE", "MUTATION_RATE",
+    "POPULATION_BACKEND", "CROSSOVER_TYPE", "RACING_ENABLED", "RACING_INITIAL_EPISODES", "RACING_SURVIVOR_FRACTION",
+    "RACING_CONFIDENCE_Z", "RACING_MINIMUM_STD", "RUN_SEED", "SEED_SCHEDULE",
+)
+SEARCH_SETTINGS = {
+    "exhaustive": ("EXHAUSTIVE_MAX_RULES", "EXHAUSTIVE_PROBE_SAMPLES", "EXHAUSTIVE_PROBE_EXACT_BITS", "EXHAUSTIVE_SEED"),
+    "ga": GA_SEARCH_SETTINGS,
+    "island_ga": GA_SEARCH_SETTINGS + ("ISLAND_COUNT", "MIGRATION_INTERVAL", "MIGRATION_SIZE", "MIGRATION_TOPOLOGY"),
+}
+
+# THIS FUNCTION LOADS THE STORED BEST RULE AND INSTALLS IT, RUNNING search() ONLY WHEN NO RULE WAS STORED
+# FOR THE CURRENT CA PARAMETERS, EPISODE SETTINGS AND SEARCH HYPERPARAMETERS (ANY CHANGE MAKES THE RULE STALE)
+# search: CALLABLE RETURNING THE BEST RULE BIT LIST (GA, ISLAND GA OR EXHAUSTIVE SEARCH)
+# search_method: NAME OF THE SEARCH, PART OF THE FINGERPRINT
+# retrain: SEARCH AGAIN EVEN WHEN A FRESH RULE IS STORED
+def load_or_search_rule(search, search_method, retrain=False):
+    config = {
+        **resolve_ca_params(),
+        "number_of_episodes": NUMBER_OF_EPISODES,
+        "maximum_steps_per_episode": MAXIMUM_STEPS_PER_EPISODE,
+        "search_method": search_method,
+        **{name.lower(): getattr(ca_config, name) for name in SEARCH_SETTINGS.get(search_method, ())},
+    }
+    best_rule = load_or_build(
+        CA_RULE_ARTIFACT,
+        config,
+        build=lambda: list(map(int, search())),
+        load=lambda metadata: metadata["rule"],
+        save=lambda rule: {"rule": rule},
+        retrain=retrain,
+    )
+    set_rule_index(best_rule)
+    return best_rule
+
+# DROPS EVERY COMPILED ACTION, CALLED WHENEVER THE RULE CHANGES
+def reset_action_cache():
+    global DENSE_ACTIONS, CACHE_HITS, CACHE_MISSES
+    ACTION_CACHE.clear()
+    DENSE_ACTIONS = None
+    CACHE_HITS = 0
+    CACHE_MISSES = 0
+
+# PRECOMPUTES THE ACTION OF EVERY DISCRETE OBSERVATION WHEN THE INPUT SPACE IS SMALL ENOUGH
+# THE TABLE IS INDEXED BY THE PACKED ENCODED ROW, I.E. SUM OF value_i << (i * BITS_PER_VALUE)
+# RETURNS True WHEN A DENSE TABLE WAS BUILT
+def compile_dense_actions(dense_bits=CA_CONTROLLER_DENSE_BITS):
+    global DENSE_ACTIONS
+    input_bits = 4 * BITS_PER_VALUE
+    if input_bits > dense_bits:
+        return False
+    rule_table = RULE_TABLE
+    table_index = np.arange(1 << input_bits)
+    discrete_observations = (table_index[:, None] >> (np.arange(4) * BITS_PER_VALUE)) & ((1 << BITS_PER_VALUE) - 1)
+    ca_rows = encode_into_row(discrete_observations, row_length=ROW_LENGTH, bits_per_variable=BITS_PER_VALUE)
+    for _ in range(NUMBER_OF_CA_TICKS):
+        ca_rows = step_eca_vectorized(ca_rows, rule_table, NEIGHBORHOOD_RADIUS)
+    DENSE_ACTIONS = decode_actions_from_rows(ca_rows).astype(np.uint8)
+    return True
+
+# SAME ACTION AS ca_action, BUT LOOKED UP BY DISCRETE OBSERVATION INSTEAD OF RE-RUNNING THE CA
+# RETURNS (action, None, None), THE CA ROWS ARE NOT KEPT IN COMPILED MODE
+def compiled_ca_action(observation):
+    global CACHE_HITS, CACHE_MISSES
+    discrete_observation = discretize_observation(observation, bits=BITS_PER_VALUE)
+
+    if DENSE_ACTIONS is not None:
+        CACHE_HITS += 1
+        table_index = sum(int(value) << (variable_index * BITS_PER_VALUE)
+                          for variable_index, value in enumerate(discrete_observation))
+        return int(DENSE_ACTIONS[table_index]), None, None
+
+    key = tuple(int(value) for value in discrete_observation)
+    action = ACTION_CACHE.get(key)
+    if action is not None:
+        CACHE_HITS += 1
+        ACTION_CACHE.move_to_end(key)
+        return action, None, None
+
+    # MISS: RUN THE CA ONCE AND REMEMBER THE RESULT, EVICTING THE LEAST RECENTLY USED ENTRY WHEN FULL
+    CACHE_MISSES += 1
+    ca_row = encode_into_row(discrete_observation, row_length=ROW_LENGTH, bits_per_variable=BITS_PER_VALUE)
+    action = decode_action_from_row(step_row_ticks(ca_row, RULE_TABLE, PACKED_RULE, NEIGHBORHOOD_RADIUS, NUMBER_OF_CA_TICKS))
+    if CA_CONTROLLER_CACHE_SIZE > 0:
+        ACTION_CACHE[key] = action
+        if len(ACTION_CACHE) > CA_CONTROLLER_CACHE_SIZE:
+            ACTION_CACHE.popitem(last=False)
+    return action, None, None
+
+# SAME ACTIONS AS ca_action FOR A WHOLE N x 4 BATCH OF OBSERVATIONS, RETURNS N ACTIONS
+# WITH A DENSE TABLE (SEE compile_dense_actions) THE ACTIONS ARE ONE GATHER, OTHERWISE ALL N ROWS ARE
+# ENCODED, STEPPED AND DECODED AS ONE 2D ARRAY
+def ca_action_batch(observations):
+    observations = np.asarray(observations)
+    if DENSE_ACTIONS is not None:
+        discrete_observations = discretize_observation(observations, bits=BITS_PER_VALUE)
+        table_index = (discrete_observations << (np.arange(4) * BITS_PER_VALUE)).sum(axis=1)
+        return DENSE_ACTIONS[table_index].astype(np.int64)
+    rule_table = RULE_TABLE
+    ca_rows = encode_observations(observations)
+    for _ in range(NUMBER_OF_CA_TICKS):
+        ca_rows = step_eca_vectorized(ca_rows, rule_table, NEIGHBORHOOD_RADIUS)
+    return decode_actions_from_rows(ca_rows).astype(np.int64)
+
+# RETURNS CACHE STATISTICS OF THE COMPILED CONTROLLER
+def ca_cache_stats():
+    lookups = CACHE_HITS + CACHE_MISSES
+    return {
+        'hits': CACHE_HITS,
+        'misses': CACHE_MISSES,
+        'hit_rate': CACHE_HITS / lookups if lookups else 0.0,
+        'cached_observations': len(ACTION_CACHE) if DENSE_ACTIONS is None else len(DENSE_ACTIONS),
+    }
@@ -1,15 +1,13 @@
+import numpy as np
 import gymnasium as gym
-from stable_baselines3 import DQN
-from stable_baselines3.common.vec_env import DummyVecEnv
 
-def make_env():
-    return gym.make("CartPole-v1")
+from utils.artifacts.artifact_store import artifact_path, load_or_build
 
-VEC_ENV = DummyVecEnv([make_env])
+DQN_ARTIFACT = "dqn_policy"
+DQN_TRAIN_STEPS = 50_000
 
-model = DQN(
-    'MlpPolicy',
-    VEC_ENV,
+# HYPERPARAMETERS OF THE POLICY, PART OF THE ARTIFACT FINGERPRINT
+DQN_PARAMS = dict(
     learning_rate=1e-3,
     buffer_size=100_000,
     learning_starts=1_000,
@@ -18,12 +16,61 @@ model = DQN(
     exploration_fraction=0.1,
     exploration_initial_eps=1.0,
     exploration_final_eps=0.05,
-    verbose=1
 )
 
-def dqn_train(steps: int = 50_000):
+# THE MODEL IS BUILT OR LOADED ON FIRST USE, NOT AT IMPORT, AND stable_baselines3 (WITH TORCH) IS ONLY IMPORTED THEN
+model = None
+
+def make_env():
+    return gym.make("CartPole-v1")
+
+def create_model():
+    from stable_baselines3 import DQN
+    from stable_baselines3.common.vec_env import DummyVecEnv
+    return DQN('MlpPolicy', DummyVecEnv([make_env]), verbose=1, **DQN_PARAMS)
+
+def load_model(policy_path):
+    from stable_baselines3 import DQN
+    from stable_baselines3.common.vec_env import DummyVecEnv
+    return DQN.load(policy_path, env=DummyVecEnv([make_env]))
+
+def dqn_train(steps: int = DQN_TRAIN_STEPS):
+    global model
+    if model is None:
+        model = create_model()
     model.learn(steps)
+    return model
+
+# LOADS THE STORED POLICY, TRAINING (AND STORING) A NEW ONE ONLY WHEN IT IS MISSING OR WAS TRAINED WITH OTHER SETTINGS
+# A NEW POLICY ALWAYS STARTS FROM A FRESH MODEL, SO IT IS EXACTLY steps OF TRAINING EVEN WHEN ONE WAS ALREADY LOADED
+def load_or_train_dqn(steps: int = DQN_TRAIN_STEPS, retrain: bool = False):
+    global model
+    policy_path = artifact_path(DQN_ARTIFACT, ".zip")
+
+    def save(trained_model):
+        trained_model.save(policy_path)
+        return {}
+
+    model = load_or_build(
+        DQN_ARTIFACT,
+        {"policy": "MlpPolicy", "train_steps": steps, **DQN_PARAMS},
+        build=lambda: create_model().learn(steps),
+        load=lambda metadata: load_model(policy_path),
+        save=save,
+        payload_suffix=".zip",
+        retrain=retrain,
+    )
+    return model
 
 def dqn_action(observation_state):
+    if model is None:
+        load_or_train_dqn()
     action, _ = model.predict(observation_state, deterministic=True)
     return int(action)
+
+# ONE FORWARD PASS FOR A WHOLE N x 4 BATCH OF OBSERVATIONS, RETURNS N ACTIONS
+def dqn_action_batch(observations):
+    if model is None:
+        load_or_train_dqn()
+    actions, _ = model.predict(np.asarray(observations, dtype=np.float32), deterministic=True)
+    return np.asarray(actions, dtype=np.int64).reshape(-1)
@@ -1,4 +1,6 @@
 # lqr_controller.py
+import numpy as np
+
 from utils.lqr.lqr import get_system_matrices, get_lqr_gain, preprocess_obs
 
 # -------------------------
@@ -15,12 +17,25 @@ R = 0.001
 # -------------------------
 # Controller Initialization
 # -------------------------
+K = None                                                                            # LQR gain, solved on first use instead of at import
+
+
+def lqr_gain():
+    """
+    Returns the LQR gain matrix K, solving the Riccati equation on the first call.
+
+    Returns:
+        ndarray: 1x4 gain matrix such that u = -Kx
+    """
+    global K
+    if K is None:
+        # Generate A and B matrices using current system configuration
+        A, B = get_system_matrices(m=MASS_POLE, M=MASS_CART, l=POLE_LENGTH)
 
-# Generate A and B matrices using current system configuration
-A, B = get_system_matrices(m=MASS_POLE, M=MASS_CART, l=POLE_LENGTH)
+        # Calculate optimal LQR gain matrix K based on system and cost weights
+        K = get_lqr_gain(A, B, Q_vals=Q, R_val=R)
+    return K
 
-# Calculate optimal LQR gain matrix K based on system and cost weights
-K = get_lqr_gain(A, B, Q_vals=Q, R_val=R)
 
 # -------------------------
 # Controller Function
@@ -36,7 +51,20 @@ def lqr_action(obs):
         tuple: (int action, float control_signal, ndarray state_vector)
     """
     x = preprocess_obs(obs)                                                         # Convert observation to 4x1 column vector
-    u = -K @ x                                                                      # Compute continuous control signal u = -Kx
-    action = 1 if float(u) > 0 else 0                                               # Convert control to discrete action: 1 (right) or 0 (left)
+    u = -lqr_gain() @ x                                                             # Compute continuous control signal u = -Kx
+    action = 1 if u.item() > 0 else 0                                               # Convert control to discrete action: 1 (right) or 0 (left)
     return action, u, x                                                             # Return action, control signal, and processed state
 
+
+def lqr_action_batch(observations):
+    """
+    Computes the LQR actions of many observations with one matrix product.
+
+    Parameters:
+        observations (ndarray): N x 4 environment state observations
+
+    Returns:
+        ndarray: N discrete actions, the same as lqr_action for each row
+    """
+    u = np.asarray(observations) @ -lqr_gain().T                                    # N x 1 control signals, u = -Kx per row
+    return (u[:, 0] > 0).astype(np.int64)                                           # 1 (right) or 0 (left)
@@ -1,4 +1,6 @@
 # pid_controller.py
+import numpy as np
+
 from utils.pid.pid import preprocess_obs, get_pid_control
 
 # -------------------------
@@ -27,3 +29,47 @@ def pid_action(obs):
     u = get_pid_control(x, KP_X, KD_X, KP_TH, KD_TH, KI_TH)
     action = 0 if float(u) > 0 else 1
     return action, u, x
+
+
+# -------------------------
+# Batched Controller
+# -------------------------
+batch_theta_integral = None                                                         # One integral accumulator per row of the batch
+
+
+def reset_pid_batch(num_observations):
+    """
+    Resets the per-row integral accumulators of pid_action_batch.
+
+    Should be called at the beginning of each new batch of episodes.
+
+    Parameters:
+        num_observations (int): Number of rows (carts) in the batch
+    """
+    global batch_theta_integral
+    batch_theta_integral = np.zeros(num_observations, dtype=np.float32)             # float32, like the scalar accumulator
+
+
+def pid_action_batch(observations):
+    """
+    Computes the PID actions of many observations at once, row i being its own
+    cart with its own integral term.
+
+    Parameters:
+        observations (ndarray): N x 4 environment state observations
+
+    Returns:
+        ndarray: N discrete actions, the same as pid_action for each row
+    """
+    observations = np.asarray(observations)
+    if batch_theta_integral is None or len(batch_theta_integral) != len(observations):
+        reset_pid_batch(len(observations))                                          # A new batch size starts new episodes
+    batch_theta_integral[:] += observations[:, 2]
+    u = (
+        - KP_X  * observations[:, 0]
+        - KD_X  * observations[:, 1]
+        - KP_TH * observations[:, 2]
+        - KD_TH * observations[:, 3]
+        - KI_TH * batch_theta_integral
+    )
+    return np.where(u > 0, 0, 1)
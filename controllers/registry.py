@@ -0,0 +1,113 @@
+# registry.py
+# Lazy controller registry: a controller's module, its heavy dependencies and any solving,
+# searching or training are only paid for when that controller is first requested
+
+import importlib
+
+# -------------------------
+# Registry
+# -------------------------
+CONTROLLER_NAMES = ('ca', 'lqr', 'pid', 'dqn')
+BUILT_CONTROLLERS = {}                                                              # name -> action function, filled on first use
+
+
+def build_ca_controller(retrain=False):
+    """
+    Loads (or searches for) the best CA rule and returns the configured CA action function.
+    """
+    from ca_config import ISLAND_COUNT, CA_CONTROLLER_MODE
+    from controllers.ca_controller import ca_action, compiled_ca_action, compile_dense_actions, load_or_search_rule
+    from utils.genetic_algorithm.exhaustive_search import exhaustive_search_available, best_exhaustive_rule
+
+    if exhaustive_search_available():
+        search_method, search = 'exhaustive', best_exhaustive_rule
+    elif ISLAND_COUNT != 1:
+        from utils.genetic_algorithm.island_model import island_genetic_algorithm
+        search_method, search = 'island_ga', island_genetic_algorithm
+    else:
+        from utils.genetic_algorithm.genetic_algorithm import genetic_algorithm
+        search_method, search = 'ga', genetic_algorithm
+    best_rule = load_or_search_rule(search, search_method, retrain)
+    print(f"Best CA rule: {best_rule}")
+    if CA_CONTROLLER_MODE == 'compiled':
+        compile_dense_actions()
+        return compiled_ca_action
+    return ca_action
+
+
+def build_lqr_controller(retrain=False):
+    """
+    Solves the LQR gain and returns the LQR action function.
+    """
+    from controllers.lqr_controller import lqr_action, lqr_gain
+    lqr_gain()                                                                      # Solve before the first timed step
+    return lqr_action
+
+
+def build_pid_controller(retrain=False):
+    """
+    Returns the PID action function.
+    """
+    from controllers.pid_controller import pid_action
+    return pid_action
+
+
+def build_dqn_controller(retrain=False):
+    """
+    Loads (or trains) the DQN policy and returns the DQN action function.
+    """
+    from controllers.dqn_controller import load_or_train_dqn, dqn_action
+    load_or_train_dqn(retrain=retrain)
+    return dqn_action
+
+
+CONTROLLER_BUILDERS = {
+    'ca': build_ca_controller,
+    'lqr': build_lqr_controller,
+    'pid': build_pid_controller,
+    'dqn': build_dqn_controller,
+}
+
+
+def get_controller(name, retrain=False):
+    """
+    Returns the action function of a controller, building it on the first request.
+
+    Parameters:
+        name (str): One of CONTROLLER_NAMES
+        retrain (bool): Search / train the controller again even when a stored artifact is fresh
+
+    Returns:
+        callable: Observation -> action ('ca', 'lqr' and 'pid' return (action, ...) tuples)
+    """
+    if name not in CONTROLLER_BUILDERS:
+        raise ValueError(f"Unknown controller type {name!r}, expected one of {CONTROLLER_NAMES}")
+    if retrain or name not in BUILT_CONTROLLERS:
+        BUILT_CONTROLLERS[name] = CONTROLLER_BUILDERS[name](retrain)
+    return BUILT_CONTROLLERS[name]
+
+
+# Batched entry points: N x 4 observations -> N actions
+BATCH_ACTIONS = {
+    'ca': ('controllers.ca_controller', 'ca_action_batch'),
+    'lqr': ('controllers.lqr_controller', 'lqr_action_batch'),
+    'pid': ('controllers.pid_controller', 'pid_action_batch'),
+    'dqn': ('controllers.dqn_controller', 'dqn_action_batch'),
+}
+
+
+def get_batch_controller(name, retrain=False):
+    """
+    Returns the batched action function of a controller, building the controller on the first request.
+
+    Parameters:
+        name (str): One of CONTROLLER_NAMES
+        retrain (bool): Search / train the controller again even when a stored artifact is fresh
+
+    Returns:
+        callable: N x 4 observations -> ndarray of N actions
+    """
+    get_controller(name, retrain)                                                   # Rule, gain or policy in place
+    module_name, function_name = BATCH_ACTIONS[name]
+    return getattr(importlib.import_module(module_name), function_name)
+
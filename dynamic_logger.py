@@ -2,9 +2,14 @@
 # A simple logger for recording experiment parameters and timestep data
 
 import csv
+import json
 import os
+import queue
+import threading
 from datetime import datetime
 
+import numpy as np
+
 
 # Directory where CSV logs will be saved
 def ensure_dir(path):
@@ -12,34 +17,64 @@ def ensure_dir(path):
 
 
 LOG_DIRECTORY = os.path.join(os.path.dirname(__file__), "results", "csv_logs")
+LOG_CHUNK_ROWS = 65536                                                              # Rows buffered before each binary flush
+LOG_QUEUE_SIZE = 65536                                                              # Step records held by the async writer queue
+
+# Common fields for all controllers
+BASIC_LOG_FIELDS = [
+    'run_id', 'episode_index', 'step_count',
+    'time_start', 'time_end', 'time_delta_ms',
+    'observation_state', 'action_taken',
+    'reward_received', 'terminated'
+]
+# Additional fields for CA controller
+CA_LOG_FIELDS = [
+    'bits_per_value', 'row_length', 'neighborhood_radius',
+    'num_ca_ticks', 'boundary_condition', 'action_decoding', 'rule_index'
+]
+# Per-step columns of the binary formats (observation_state is a separate float32 Nx4 block)
+STEP_COLUMN_TYPES = {
+    'episode_index': np.int32,
+    'step_count': np.int32,
+    'time_start': np.float64,
+    'time_end': np.float64,
+    'time_delta_ms': np.float64,
+    'action_taken': np.int8,
+    'reward_received': np.float32,
+    'terminated': np.bool_,
+}
 
 
-def create_logger(controller_type, filename=None):
+def create_logger(controller_type, filename=None, log_format='csv',
+                  async_mode=False, queue_size=LOG_QUEUE_SIZE, backpressure='block'):
     """
-    Creates a CSV logger for the given controller_type ('basic' or 'ca').
-    Returns: (file_handle, csv_writer)
+    Creates a step logger for the given controller_type ('basic' or 'ca').
+    log_format is 'csv' (one DictWriter row per step), or 'npz' / 'parquet'
+    (buffered columnar writer, see ColumnarStepWriter).
+    async_mode moves all serialisation and disk I/O to a background thread
+    (see AsyncStepWriter), with backpressure 'block' or 'drop'.
+    Returns: (file_handle, writer), both closed through file_handle.close()
     """
+    if async_mode:
+        file_handle, writer = create_logger(controller_type, filename, log_format)
+        async_writer = AsyncStepWriter(file_handle, writer, queue_size, backpressure)
+        return async_writer, async_writer
+
     ensure_dir(LOG_DIRECTORY)
 
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"run_{controller_type}_{timestamp}.csv"
+        extension = {'csv': '.csv', 'npz': '', 'parquet': '.parquet'}[log_format]
+        filename = f"run_{controller_type}_{timestamp}{extension}"
 
     full_path = os.path.join(LOG_DIRECTORY, filename)
+    if log_format != 'csv':
+        step_writer = ColumnarStepWriter(full_path, controller_type, log_format)
+        print(f"Logging to {full_path}")
+        return step_writer, step_writer
+
     csv_file = open(full_path, mode='w', newline='')
 
-    # Common fields for all controllers
-    BASIC_LOG_FIELDS = [
-        'run_id', 'episode_index', 'step_count',
-        'time_start', 'time_end', 'time_delta_ms',
-        'observation_state', 'action_taken',
-        'reward_received', 'terminated'
-    ]
-    # Additional fields for CA controller
-    CA_LOG_FIELDS = [
-        'bits_per_value', 'row_length', 'neighborhood_radius',
-        'num_ca_ticks', 'boundary_condition', 'action_decoding', 'rule_index'
-    ]
     if controller_type == 'ca':
         fieldnames = BASIC_LOG_FIELDS + CA_LOG_FIELDS
     else:
@@ -76,6 +111,35 @@ def log_step(
     """
     Logs one timestep. Pass CA params when controller_type=='ca'.
     """
+    if isinstance(csv_writer, AsyncStepWriter):
+        # Only enqueue a compact record, the writer thread does the rest
+        csv_writer.submit((
+            run_id, controller_type, episode_index, step_count,
+            time_start, time_end, time_delta_ms,
+            observation_state, action_taken, reward_received, terminated,
+            bits_per_value, row_length, neighborhood_radius, num_ca_ticks,
+            boundary_condition, action_decoding, rule_index
+        ))
+        return
+
+    if isinstance(csv_writer, ColumnarStepWriter):
+        # Run-level values are stored once as metadata, no per-step console output
+        if csv_writer.metadata is None:
+            csv_writer.metadata = {'run_id': run_id, 'controller_type': controller_type}
+            if controller_type == 'ca':
+                csv_writer.metadata.update({
+                    'bits_per_value': bits_per_value,
+                    'row_length': row_length,
+                    'neighborhood_radius': neighborhood_radius,
+                    'num_ca_ticks': num_ca_ticks,
+                    'boundary_condition': boundary_condition,
+                    'action_decoding': action_decoding,
+                    'rule_index': rule_index
+                })
+        csv_writer.append(episode_index, step_count, time_start, time_end, time_delta_ms,
+                          observation_state, action_taken, reward_received, terminated)
+        return
+
     row = {
         'run_id': run_id,
         'episode_index': episode_index,
@@ -102,3 +166,197 @@ def log_step(
     # Console summary
     print(f"[Run {run_id} | Ep {episode_index:02} | Step {step_count:03}] "
           f"Action: {action_taken} | Reward: {reward_received} | Done: {terminated}")
+
+
+class ColumnarStepWriter:
+    """
+    Buffers steps in preallocated typed arrays and flushes them in large chunks.
+
+    'npz' writes a directory with one compressed chunk_NNNNN.npz per flush plus
+    metadata.json. 'parquet' appends one row group per flush to a single file
+    and needs the optional pyarrow package. Run-level values (run_id, CA params)
+    are kept once in metadata instead of on every row.
+    """
+
+    def __init__(self, path, controller_type, log_format='npz', chunk_rows=LOG_CHUNK_ROWS):
+        if log_format not in ('npz', 'parquet'):
+            raise ValueError(f"Unknown log_format = {log_format!r}")
+        self.path = path
+        self.controller_type = controller_type
+        self.log_format = log_format
+        self.chunk_rows = chunk_rows
+        self.columns = {name: np.empty(chunk_rows, dtype=dtype) for name, dtype in STEP_COLUMN_TYPES.items()}
+        self.observations = np.empty((chunk_rows, 4), dtype=np.float32)
+        self.size = 0
+        self.chunk_index = 0
+        self.metadata = None
+        self.parquet_writer = None
+        if log_format == 'npz':
+            ensure_dir(path)
+
+    def append(self, episode_index, step_count, time_start, time_end, time_delta_ms,
+               observation_state, action_taken, reward_received, terminated):
+        row_index = self.size
+        self.columns['episode_index'][row_index] = episode_index
+        self.columns['step_count'][row_index] = step_count
+        self.columns['time_start'][row_index] = time_start
+        self.columns['time_end'][row_index] = time_end
+        self.columns['time_delta_ms'][row_index] = time_delta_ms
+        self.observations[row_index] = observation_state
+        self.columns['action_taken'][row_index] = action_taken
+        self.columns['reward_received'][row_index] = reward_received
+        self.columns['terminated'][row_index] = terminated
+        self.size += 1
+        if self.size == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self.size == 0:
+            return
+        chunk = {name: column[:self.size] for name, column in self.columns.items()}
+        if self.log_format == 'npz':
+            chunk_path = os.path.join(self.path, f"chunk_{self.chunk_index:05d}.npz")
+            np.savez_compressed(chunk_path, observation_state=self.observations[:self.size], **chunk)
+        else:
+            self._write_parquet_chunk(chunk)
+        self.chunk_index += 1
+        self.size = 0
+
+    def close(self):
+        self.flush()
+        metadata = dict(self.metadata or {}, controller_type=self.controller_type)
+        if self.log_format == 'npz':
+            with open(os.path.join(self.path, "metadata.json"), "w") as metadata_file:
+                json.dump(metadata, metadata_file, default=_json_value)
+        elif self.parquet_writer is not None:
+            self.parquet_writer.close()
+            with open(self.path + ".metadata.json", "w") as metadata_file:
+                json.dump(metadata, metadata_file, default=_json_value)
+
+    def _write_parquet_chunk(self, chunk):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("log_format='parquet' needs pyarrow, use 'npz' otherwise") from error
+        arrays = dict(chunk)
+        for axis, name in enumerate(('x', 'x_dot', 'theta', 'theta_dot')):
+            arrays[f'observation_{name}'] = self.observations[:self.size, axis]
+        table = pa.table(arrays)
+        if self.parquet_writer is None:
+            self.parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        self.parquet_writer.write_table(table)
+
+
+def _json_value(value):
+    """Converts numpy scalars and arrays in metadata to plain JSON values."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def load_step_log(path):
+    """
+    Loads a binary step log written by ColumnarStepWriter.
+
+    Returns:
+        tuple: (columns, metadata), columns maps field name to a numpy array
+               and includes the Nx4 float32 'observation_state' block
+    """
+    if os.path.isdir(path):
+        chunk_names = sorted(name for name in os.listdir(path) if name.endswith('.npz'))
+        chunks = [np.load(os.path.join(path, name)) for name in chunk_names]
+        field_names = list(STEP_COLUMN_TYPES) + ['observation_state']
+        columns = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in field_names}
+        metadata_path = os.path.join(path, "metadata.json")
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        columns = {name: table.column(name).to_numpy() for name in STEP_COLUMN_TYPES}
+        columns['observation_state'] = np.stack([
+            table.column(f'observation_{name}').to_numpy() for name in ('x', 'x_dot', 'theta', 'theta_dot')
+        ], axis=1)
+        metadata_path = path + ".metadata.json"
+    with open(metadata_path) as metadata_file:
+        metadata = json.load(metadata_file)
+    return columns, metadata
+
+
+def export_log_to_csv(path, csv_path=None):
+    """
+    Converts a binary step log into the CSV layout written by create_logger.
+
+    Returns:
+        str: Path of the written CSV file
+    """
+    columns, metadata = load_step_log(path)
+    if csv_path is None:
+        csv_path = path.rstrip(os.sep).removesuffix('.parquet') + '.csv'
+    fieldnames = BASIC_LOG_FIELDS + (CA_LOG_FIELDS if metadata.get('controller_type') == 'ca' else [])
+    run_values = {name: metadata.get(name) for name in CA_LOG_FIELDS if name in fieldnames}
+    with open(csv_path, mode='w', newline='') as csv_file:
+        csv_writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+        csv_writer.writeheader()
+        for row_index in range(len(columns['step_count'])):
+            row = {name: columns[name][row_index].item() for name in STEP_COLUMN_TYPES}
+            row['run_id'] = metadata.get('run_id')
+            row['observation_state'] = columns['observation_state'][row_index]
+            row.update(run_values)
+            csv_writer.writerow(row)
+    return csv_path
+
+
+class AsyncStepWriter:
+    """
+    Hands step records to a background thread that writes them with log_step.
+
+    The control loop only pays for one queue put. With backpressure 'block'
+    a full queue makes the producer wait, so no step is lost. With 'drop' the
+    record is discarded and counted in dropped_records. close() drains the
+    queue, stops the thread and closes the wrapped logger.
+    """
+
+    def __init__(self, file_handle, writer, queue_size=LOG_QUEUE_SIZE, backpressure='block'):
+        if backpressure not in ('block', 'drop'):
+            raise ValueError(f"Unknown backpressure = {backpressure!r}")
+        self.file_handle = file_handle
+        self.writer = writer
+        self.backpressure = backpressure
+        self.records = queue.Queue(maxsize=queue_size)
+        self.dropped_records = 0
+        self.error = None
+        self.path = getattr(file_handle, 'path', getattr(file_handle, 'name', None))
+        self.thread = threading.Thread(target=self._drain, name="AsyncStepWriter", daemon=True)
+        self.thread.start()
+
+    def submit(self, record):
+        if self.backpressure == 'block':
+            self.records.put(record)
+            return
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+
+    def close(self):
+        self.records.put(None)                                                      # Sentinel: everything before it is written
+        self.thread.join()
+        self.file_handle.close()
+        if self.dropped_records:
+            print(f"Async logger dropped {self.dropped_records} step records (queue full)")
+        if self.error is not None:
+            raise self.error
+
+    def _drain(self):
+        while True:
+            record = self.records.get()
+            if record is None:
+                return
+            if self.error is not None:
+                continue                                                            # Keep consuming so producers never block forever
+            try:
+                log_step(self.writer, *record)
+            except Exception as error:
+                self.error = error
@@ -1,91 +1,163 @@
 import os
 import time
+import argparse
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import gymnasium as gym
 
 from ca_config import BITS_PER_VALUE, ROW_LENGTH, NEIGHBORHOOD_RADIUS, NUMBER_OF_CA_TICKS, ACTION_DECODING, \
-    NUMBER_OF_EPISODES
-from dynamic_logger import create_logger, log_step
+    NUMBER_OF_EPISODES, CA_CONTROLLER_MODE
+from controllers.registry import CONTROLLER_NAMES, get_controller
+from dynamic_logger import LOG_DIRECTORY, create_logger, log_step
 
-# Experiment settings
+# Experiment settings (defaults of the command line options)
 CONTROLLER = 'ca'  # 'ca', 'lqr', 'pid', 'dqn'
 EPISODES = NUMBER_OF_EPISODES
-RENDER_MODE = 'human'
+SEED = None  # Episode i resets with seed SEED + i, so every controller plays the same episodes; None = unseeded
+RENDER_MODE = 'human'  # 'human' or None (headless, no pygame window and no 50 FPS frame pacing)
+LOG_FORMAT = 'csv'  # 'csv' (one row per step, read by compare.py), opt-in 'npz' / 'parquet' (buffered columnar) or 'none'
+LOG_ASYNC = True  # Write the log from a background thread, outside the timed control loop
+LOG_BACKPRESSURE = 'block'  # 'block' (never lose steps) or 'drop' (never stall the loop, count drops)
+OUTPUT_DIRECTORY = LOG_DIRECTORY  # Where the step logs are written
 RUN_ID = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-# Controller selection
-if CONTROLLER == 'ca':
-    from utils.genetic_algorithm.genetic_algorithm import genetic_algorithm
-    from controllers.ca_controller import ca_action, set_rule_index
-    print("Finding best CA rule via GA...")
-    best_rule = genetic_algorithm()
-    print(f"Best CA rule: {best_rule}")
-    set_rule_index(best_rule)
-    controller_fn = ca_action
-elif CONTROLLER == 'lqr':
-    from controllers.lqr_controller import lqr_action as controller_fn
-    best_rule = None
-elif CONTROLLER == 'pid':
-    from controllers.pid_controller import pid_action as controller_fn
-    best_rule = None
-elif CONTROLLER == 'dqn':
-    from controllers.dqn_controller import dqn_train, dqn_action as controller_fn
-    dqn_train(steps=50_000)
+
+def run_controller(controller, episodes=EPISODES, seed=SEED, render=True, log_format=LOG_FORMAT,
+                   output_directory=OUTPUT_DIRECTORY, retrain=False, verbose=True):
+    """
+    Runs one controller for a number of CartPole episodes and logs every step.
+
+    Returns:
+        dict: controller, episode lengths, wall time of the episodes and step log path (None without a log)
+    """
+    # Built on first use by the registry, only the chosen controller's dependencies are imported
+    controller_fn = get_controller(controller, retrain)
     best_rule = None
-else:
-    raise ValueError("Unknown controller type")
-
-# Setup logging
-os.makedirs('results/csv_logs', exist_ok=True)
-csv_file, csv_writer = create_logger(CONTROLLER)
-
-env = gym.make('CartPole-v1', render_mode=RENDER_MODE)
-lengths = []
-
-for ep in range(EPISODES):
-    obs, _ = env.reset()
-    done = False
-    step = 0
-    while not done:
-        t0 = time.perf_counter()
-        if CONTROLLER == 'ca':
-            action, bit_pre, bit_post = controller_fn(obs)
-        else:
-            action = controller_fn(obs)
-            bit_pre = bit_post = None
-        t1 = time.perf_counter()
-        next_obs, reward, term, trunc, _ = env.step(action)
-        done = term or trunc
-
-        log_step(
-            csv_writer,
-            run_id=RUN_ID,
-            controller_type=CONTROLLER,
-            episode_index=ep,
-            step_count=step,
-            time_start=t0,
-            time_end=t1,
-            time_delta_ms=(t1-t0)*1000,
-            observation_state=obs,
-            action_taken=action,
-            reward_received=reward,
-            terminated=done,
-            # CA params
-            bits_per_value=BITS_PER_VALUE,
-            row_length=ROW_LENGTH,
-            neighborhood_radius=NEIGHBORHOOD_RADIUS,
-            num_ca_ticks=NUMBER_OF_CA_TICKS,
-            action_decoding=ACTION_DECODING,
-            rule_index=best_rule
-        )
-        obs = next_obs
-        step += 1
-    print(f"Episode {ep} ended at step {step}")
-    lengths.append(step)
-
-# Close
-csv_file.close()
-env.close()
-
-print(f"Run {RUN_ID} completed. CSV log saved to results/csv_logs/run_{CONTROLLER}_{RUN_ID}.csv")
-print("Use the separate plot_results.py script to generate all figures.")
+    if controller == 'ca':
+        from controllers.ca_controller import RULE_INDEX as best_rule
+
+    # Setup logging
+    csv_file = csv_writer = log_path = None
+    if log_format != 'none':
+        os.makedirs(output_directory, exist_ok=True)
+        extension = {'csv': '.csv', 'npz': '', 'parquet': '.parquet'}[log_format]
+        filename = os.path.join(os.path.abspath(output_directory), f"run_{controller}_{RUN_ID}{extension}")
+        csv_file, csv_writer = create_logger(controller, filename, log_format=log_format,
+                                             async_mode=LOG_ASYNC, backpressure=LOG_BACKPRESSURE)
+        log_path = csv_file.path if LOG_ASYNC or log_format != 'csv' else csv_file.name
+
+    env = gym.make('CartPole-v1', render_mode=RENDER_MODE if render else None)
+    lengths = []
+    start_time = time.perf_counter()
+
+    for ep in range(episodes):
+        obs, _ = env.reset(seed=None if seed is None else seed + ep)
+        if controller == 'pid':
+            from utils.pid.pid import reset_pid
+            reset_pid()  # The integral term must not carry over from the previous episode
+        done = False
+        step = 0
+        while not done:
+            t0 = time.perf_counter()
+            if controller == 'ca':
+                action, bit_pre, bit_post = controller_fn(obs)
+            elif controller in ('lqr', 'pid'):
+                action, _, _ = controller_fn(obs)  # Also returns the control signal and state vector
+            else:
+                action = controller_fn(obs)
+            t1 = time.perf_counter()
+            next_obs, reward, term, trunc, _ = env.step(action)
+            done = term or trunc
+
+            if csv_writer is not None:
+                log_step(
+                    csv_writer,
+                    run_id=RUN_ID,
+                    controller_type=controller,
+                    episode_index=ep,
+                    step_count=step,
+                    time_start=t0,
+                    time_end=t1,
+                    time_delta_ms=(t1-t0)*1000,
+                    observation_state=obs,
+                    action_taken=action,
+                    reward_received=reward,
+                    terminated=done,
+                    # CA params
+                    bits_per_value=BITS_PER_VALUE,
+                    row_length=ROW_LENGTH,
+                    neighborhood_radius=NEIGHBORHOOD_RADIUS,
+                    num_ca_ticks=NUMBER_OF_CA_TICKS,
+                    action_decoding=ACTION_DECODING,
+                    rule_index=best_rule
+                )
+            obs = next_obs
+            step += 1
+        if verbose:
+            print(f"Episode {ep} ended at step {step}")
+        lengths.append(step)
+
+    # Close
+    elapsed = time.perf_counter() - start_time
+    if csv_file is not None:
+        csv_file.close()
+    env.close()
+
+    if controller == 'ca' and CA_CONTROLLER_MODE == 'compiled':
+        from controllers.ca_controller import ca_cache_stats
+        stats = ca_cache_stats()
+        print(f"CA action cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.1%} hit rate, {stats['cached_observations']} cached observations)")
+
+    return {'controller': controller, 'lengths': lengths, 'elapsed_s': elapsed, 'log_path': log_path}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate CartPole controllers.")
+    parser.add_argument('--controller', '-c', nargs='+', choices=CONTROLLER_NAMES, default=[CONTROLLER],
+                        help="controller(s) to evaluate, e.g. -c lqr pid")
+    parser.add_argument('--episodes', '-n', type=int, default=EPISODES, help="episodes per controller")
+    parser.add_argument('--seed', type=int, default=SEED,
+                        help="episode i resets with seed SEED + i (default: unseeded)")
+    parser.add_argument('--render', action=argparse.BooleanOptionalAction, default=RENDER_MODE is not None,
+                        help="show the pygame window; --no-render runs headless at full speed")
+    parser.add_argument('--output', '-o', default=OUTPUT_DIRECTORY, help="directory for the step logs")
+    parser.add_argument('--log-format', choices=('npz', 'parquet', 'csv', 'none'), default=LOG_FORMAT,
+                        help="step log format (default csv, read by compare.py), 'none' skips logging")
+    parser.add_argument('--retrain', action='store_true',
+                        help="search the CA rule / train the DQN again even when a stored one is up to date")
+    parser.add_argument('--parallel', action='store_true',
+                        help="run the controllers in parallel worker processes (headless only)")
+    args = parser.parse_args(argv)
+    if args.parallel and args.render:
+        parser.error("--parallel requires --no-render")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_options = dict(episodes=args.episodes, seed=args.seed, render=args.render,
+                       log_format=args.log_format, output_directory=args.output, retrain=args.retrain)
+
+    if args.parallel and len(args.controller) > 1:
+        # One worker per controller, the per-episode lines would interleave so only the summary is printed
+        with ProcessPoolExecutor(max_workers=len(args.controller)) as executor:
+            futures = [executor.submit(run_controller, controller, verbose=False, **run_options)
+                       for controller in args.controller]
+            results = [future.result() for future in futures]
+    else:
+        results = [run_controller(controller, **run_options) for controller in args.controller]
+
+    for result in results:
+        lengths = result['lengths']
+        print(f"{result['controller']}: mean {sum(lengths) / len(lengths):.1f} steps over {len(lengths)} episodes "
+              f"({result['elapsed_s']:.2f} s)")
+        if result['log_path'] is not None:
+            print(f"Run {RUN_ID} completed. Step log saved to {result['log_path']}")
+    if args.log_format not in ('csv', 'none'):
+        print("Use dynamic_logger.export_log_to_csv() to convert it for the CSV-based scripts.")
+    print("Use the separate plot_results.py script to generate all figures.")
+
+
+if __name__ == '__main__':
+    main()
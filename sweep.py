@@ -0,0 +1,146 @@
+import io
+import os
+import csv
+import time
+import random
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from ca_config import SWEEP_GRID, SWEEP_SEEDS, SWEEP_WORKERS, SWEEP_TEST_EPISODES, SWEEP_TEST_SEED, SWEEP_RESULTS_PATH
+from utils.ca.ca_params import CA_PARAM_NAMES, resolve_ca_params
+from utils.genetic_algorithm.genetic_algorithm import genetic_algorithm
+from utils.genetic_algorithm.functions.batch_fitness_function import evaluate_population_batched
+from utils.genetic_algorithm.functions.evaluation_backend import resolve_worker_count
+
+# COLUMNS OF THE SWEEP RESULTS TABLE, ONE ROW PER GA RUN
+SWEEP_RESULT_FIELDS = [
+    *CA_PARAM_NAMES,
+    "seed",
+    "best_rule",
+    "last_generation_best_fitness",
+    "test_fitness",
+    "run_time_s",
+    "ga_log"
+]
+
+# THIS FUNCTION RETURNS EVERY CONFIG OF THE GRID AS A CA PARAMETER DICT, SKIPPING THOSE THAT CANNOT BE ENCODED
+# sweep_grid: DICT {CA PARAMETER NAME: LIST OF VALUES}, PARAMETERS NOT IN IT KEEP THEIR ca_config VALUE
+def sweep_configs(sweep_grid=SWEEP_GRID):
+    names = list(sweep_grid)
+    configs = []
+    for values in product(*(sweep_grid[name] for name in names)):
+        try:
+            configs.append(resolve_ca_params(dict(zip(names, values))))
+        except ValueError as error:
+            print(f"Skipping config: {error}")
+    return configs
+
+# THIS FUNCTION NAMES ONE RUN, E.G. b8_l48_r1_t10_center_s0
+def run_name(ca_params, seed):
+    return (
+        f"b{ca_params['bits_per_value']}_l{ca_params['row_length']}_r{ca_params['neighborhood_radius']}_"
+        f"t{ca_params['number_of_ca_ticks']}_{ca_params['action_decoding']}_s{seed}"
+    )
+
+# THIS FUNCTION KEYS A RESULTS ROW BY ITS CONFIG AND SEED, AS STRINGS SO ROWS READ BACK FROM THE CSV MATCH
+def run_key(ca_params, seed):
+    return tuple(str(ca_params[name]) for name in CA_PARAM_NAMES) + (str(seed),)
+
+# THIS FUNCTION RUNS ONE SWEEP JOB IN A WORKER PROCESS: A SEEDED GA RUN FOR ONE CONFIG, THEN SCORES ITS WINNER
+# ON THE HELD-OUT EPISODES. THE CONFIG IS PASSED EXPLICITLY, ca_config ONLY SUPPLIES THE GA SETTINGS
+# RETURNS ONE ROW OF THE SWEEP RESULTS TABLE AS A DICT
+def run_sweep_job(ca_params, seed, log_directory, test_seeds):
+    start_time = time.perf_counter()
+    log_path = os.path.join(log_directory, f"ga_log_{run_name(ca_params, seed)}.csv")
+    if os.path.isfile(log_path):
+        os.remove(log_path)                                                         # LOG OF AN INTERRUPTED RUN
+
+    # EVERY JOB ALREADY OWNS A CORE, SO THE GA EVALUATES IN-PROCESS AND KEEPS ITS PER-GENERATION OUTPUT TO ITSELF
+    with redirect_stdout(io.StringIO()):
+        winner_rule = genetic_algorithm(
+            evaluation_backend="batched",
+            fitness_cache_path=None,
+            run_seed=seed,
+            checkpoint_path=None,
+            resume=False,
+            ca_params=ca_params,
+            log_path=log_path,
+        )
+    with open(log_path, newline='') as log_file:
+        last_generation = list(csv.DictReader(log_file))[-1]
+    test_fitness = evaluate_population_batched([winner_rule], test_seeds, ca_params)[0]
+
+    return {
+        **{name: ca_params[name] for name in CA_PARAM_NAMES},
+        "seed": seed,
+        "best_rule": str(winner_rule),
+        "last_generation_best_fitness": last_generation["best_fitness"],
+        "test_fitness": f"{test_fitness:.2f}",
+        "run_time_s": f"{time.perf_counter() - start_time:.1f}",
+        "ga_log": log_path
+    }
+
+# THIS FUNCTION READS THE RUNS ALREADY IN THE RESULTS TABLE, SO A RESTARTED SWEEP ONLY RUNS WHAT IS MISSING
+def load_finished_runs(results_path=SWEEP_RESULTS_PATH):
+    if not os.path.isfile(results_path):
+        return set()
+    with open(results_path, newline='') as results_file:
+        return {
+            tuple(row[name] for name in CA_PARAM_NAMES) + (row["seed"],)
+            for row in csv.DictReader(results_file)
+        }
+
+# THIS FUNCTION RUNS THE WHOLE SWEEP: EVERY (CONFIG x SEED) JOB ON A PROCESS POOL, EACH FINISHED RUN
+# IS APPENDED TO THE RESULTS TABLE AS SOON AS IT COMPLETES
+def run_sweep(
+    sweep_grid=SWEEP_GRID,
+    seeds=SWEEP_SEEDS,
+    workers=SWEEP_WORKERS,
+    test_episodes=SWEEP_TEST_EPISODES,
+    test_seed=SWEEP_TEST_SEED,
+    results_path=SWEEP_RESULTS_PATH,
+):
+    results_directory = os.path.dirname(results_path) or "."
+    log_directory = os.path.join(results_directory, "ga_logs")
+    os.makedirs(log_directory, exist_ok=True)
+
+    # THE SAME HELD-OUT EPISODES FOR EVERY RUN
+    test_source = random.Random(test_seed)
+    test_seeds = [test_source.randrange(2 ** 32) for _ in range(test_episodes)]
+
+    finished_runs = load_finished_runs(results_path)
+    jobs = [
+        (ca_params, seed)
+        for ca_params in sweep_configs(sweep_grid)
+        for seed in seeds
+        if run_key(ca_params, seed) not in finished_runs
+    ]
+    print(f"Sweep: {len(jobs)} runs to go, {len(finished_runs)} already in {results_path}")
+
+    is_new_table = not os.path.isfile(results_path)
+    with open(results_path, mode='a', newline='') as results_file, \
+            ProcessPoolExecutor(max_workers=resolve_worker_count(workers)) as executor:
+        csv_writer = csv.DictWriter(results_file, fieldnames=SWEEP_RESULT_FIELDS)
+        if is_new_table:
+            csv_writer.writeheader()
+
+        futures = {
+            executor.submit(run_sweep_job, ca_params, seed, log_directory, test_seeds): run_name(ca_params, seed)
+            for ca_params, seed in jobs
+        }
+        for finished_count, future in enumerate(as_completed(futures), start=1):
+            row = future.result()
+            csv_writer.writerow(row)
+            results_file.flush()                                                    # A KILLED SWEEP KEEPS EVERY FINISHED RUN
+            print(
+                f"[{finished_count}/{len(jobs)}] {futures[future]} · Test fitness {row['test_fitness']} "
+                f"· {row['run_time_s']} s"
+            )
+
+    print(f"Sweep results saved to {results_path}")
+    return results_path
+
+
+if __name__ == "__main__":
+    run_sweep()
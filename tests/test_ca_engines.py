@@ -0,0 +1,91 @@
+# test_ca_engines.py
+# The vectorized and packed CA engines must be bit-identical to the per-cell reference step_eca
+
+import numpy as np
+import pytest
+
+from utils.ca.step_eca import step_eca
+from utils.ca.step_eca_vectorized import step_eca_vectorized
+from utils.ca.packed_row import (
+    PACKED_ENGINE_MAX_RADIUS, pack_row, unpack_row, compile_packed_rule, step_packed_row, compile_row_rule, step_row_ticks
+)
+
+NEIGHBORHOOD_RADII = (1, 2, 3)
+ROW_LENGTHS = (7, 16, 32, 48, 63, 64, 65)
+RULES_PER_CASE = 5
+TICKS = 10
+
+
+def random_cases(neighborhood_radius, row_length, seed=0):
+    """
+    Draws random (rule_table, row) pairs for one radius and row length.
+
+    Returns:
+        list: RULES_PER_CASE tuples of (rule_table list, row int array)
+    """
+    generator = np.random.default_rng([seed, neighborhood_radius, row_length])
+    rule_size = 2 ** (2 * neighborhood_radius + 1)
+    return [
+        (list(map(int, generator.integers(0, 2, size=rule_size))), generator.integers(0, 2, size=row_length))
+        for _ in range(RULES_PER_CASE)
+    ]
+
+
+@pytest.mark.parametrize('row_length', ROW_LENGTHS)
+@pytest.mark.parametrize('neighborhood_radius', NEIGHBORHOOD_RADII)
+def test_vectorized_matches_step_eca(neighborhood_radius, row_length):
+    for rule_table, current_row in random_cases(neighborhood_radius, row_length):
+        expected_row = actual_row = current_row
+        for _ in range(TICKS):
+            expected_row = step_eca(expected_row, rule_table, neighborhood_radius)
+            actual_row = step_eca_vectorized(actual_row, rule_table, neighborhood_radius)
+            assert actual_row.dtype == expected_row.dtype
+            np.testing.assert_array_equal(actual_row, expected_row)
+
+
+@pytest.mark.parametrize('neighborhood_radius', NEIGHBORHOOD_RADII)
+def test_vectorized_stack_matches_step_eca(neighborhood_radius):
+    # ONE RULE TABLE PER ROW, AS USED BY THE BATCHED POPULATION EVALUATION
+    cases = random_cases(neighborhood_radius, 48, seed=1)
+    rule_tables = np.array([rule_table for rule_table, _ in cases])
+    rows = np.array([row for _, row in cases])
+    expected_rows = np.array([step_eca(row, rule_table, neighborhood_radius) for rule_table, row in cases])
+    np.testing.assert_array_equal(step_eca_vectorized(rows, rule_tables, neighborhood_radius), expected_rows)
+
+
+@pytest.mark.parametrize('row_length', ROW_LENGTHS)
+@pytest.mark.parametrize('neighborhood_radius', NEIGHBORHOOD_RADII)
+def test_packed_matches_step_eca(neighborhood_radius, row_length):
+    for rule_table, current_row in random_cases(neighborhood_radius, row_length):
+        packed_rule = compile_packed_rule(rule_table, neighborhood_radius)
+        expected_row = current_row
+        packed_row = pack_row(current_row)
+        for _ in range(TICKS):
+            expected_row = step_eca(expected_row, rule_table, neighborhood_radius)
+            packed_row = step_packed_row(packed_row, packed_rule, neighborhood_radius, row_length)
+            np.testing.assert_array_equal(unpack_row(packed_row, row_length), expected_row)
+
+
+@pytest.mark.parametrize('constant_bit', (0, 1))
+@pytest.mark.parametrize('neighborhood_radius', NEIGHBORHOOD_RADII)
+def test_packed_constant_rules(neighborhood_radius, constant_bit):
+    # ALL-ZERO AND ALL-ONE TABLES COMPILE TO NO MINTERMS, ONE OF THEM THROUGH THE INVERTED OUTPUT
+    rule_table = [constant_bit] * 2 ** (2 * neighborhood_radius + 1)
+    current_row = np.random.default_rng(2).integers(0, 2, size=48)
+    packed_row = step_packed_row(pack_row(current_row), compile_packed_rule(rule_table, neighborhood_radius),
+                                 neighborhood_radius, 48)
+    np.testing.assert_array_equal(unpack_row(packed_row, 48), step_eca(current_row, rule_table, neighborhood_radius))
+
+
+@pytest.mark.parametrize('neighborhood_radius', NEIGHBORHOOD_RADII)
+def test_step_row_ticks_matches_step_eca(neighborhood_radius):
+    # PACKED ENGINE UP TO PACKED_ENGINE_MAX_RADIUS, step_eca_vectorized ABOVE IT
+    for rule_table, current_row in random_cases(neighborhood_radius, 48, seed=3):
+        packed_rule = compile_row_rule(rule_table, neighborhood_radius)
+        assert (packed_rule is None) == (neighborhood_radius > PACKED_ENGINE_MAX_RADIUS)
+        expected_row = current_row
+        for _ in range(TICKS):
+            expected_row = step_eca(expected_row, rule_table, neighborhood_radius)
+        np.testing.assert_array_equal(
+            step_row_ticks(current_row, rule_table, packed_rule, neighborhood_radius, TICKS), expected_row
+        )
@@ -0,0 +1,51 @@
+# test_cartpole.py
+# VectorCartPole must reproduce gymnasium CartPole-v1 exactly, lane by lane
+
+import numpy as np
+import pytest
+
+from utils.cartpole.cartpole import VectorCartPole
+
+gym = pytest.importorskip("gymnasium")
+
+NUM_ENVS = 8
+NUM_EPISODES = 3
+
+
+@pytest.mark.parametrize('random_action_rate', (0.0, 0.2, 0.5))
+def test_vector_cartpole_matches_gymnasium(random_action_rate):
+    # A BALANCING RULE WITH RANDOM FLIPS, SO BOTH FAILURES AND TIME-LIMIT TRUNCATIONS OCCUR
+    action_generator = np.random.default_rng(0)
+    environments = [gym.make("CartPole-v1") for _ in range(NUM_ENVS)]
+    vector_cartpole = VectorCartPole(NUM_ENVS)
+    seen_terminated = seen_truncated = False
+
+    for episode_index in range(NUM_EPISODES):
+        episode_seeds = [100 * episode_index + lane for lane in range(NUM_ENVS)]
+        observations = vector_cartpole.reset(seeds=episode_seeds)
+        for lane, environment in enumerate(environments):
+            expected, _ = environment.reset(seed=episode_seeds[lane])
+            np.testing.assert_array_equal(observations[lane], expected)
+
+        active = np.ones(NUM_ENVS, dtype=bool)
+        while active.any():
+            balancing_actions = (observations[:, 2] + observations[:, 3] > 0).astype(int)
+            flips = action_generator.random(NUM_ENVS) < random_action_rate
+            actions = np.where(flips, 1 - balancing_actions, balancing_actions)
+            observations, rewards, terminated, truncated = vector_cartpole.step(actions, mask=active)
+            for lane in np.flatnonzero(active):
+                expected, reward, term, trunc, _ = environments[lane].step(int(actions[lane]))
+                np.testing.assert_array_equal(observations[lane], expected, err_msg=f"lane {lane}")
+                assert rewards[lane] == reward
+                assert bool(terminated[lane]) == term
+                assert bool(truncated[lane]) == trunc
+            seen_terminated |= bool(terminated.any())
+            seen_truncated |= bool(truncated.any())
+            active &= ~(terminated | truncated)
+
+    for environment in environments:
+        environment.close()
+    if random_action_rate == 0.0:
+        assert seen_truncated
+    else:
+        assert seen_terminated
@@ -0,0 +1,55 @@
+# test_genetic_algorithm.py
+# GA run bookkeeping: one log per run, and a checkpointed run resumes into its own log, bit for bit
+
+import csv
+import glob
+
+import pytest
+
+from utils.genetic_algorithm.genetic_algorithm import genetic_algorithm
+
+GA_SETTINGS = dict(population_size=8, evaluation_backend="batched", fitness_cache_path=None, run_seed=3)
+
+
+def read_rows(path):
+    with open(path, newline='') as log_file:
+        return list(csv.reader(log_file))
+
+
+def test_runs_started_together_get_separate_logs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("time.strftime", lambda *args: "20250101_000000")          # BOTH RUNS IN THE SAME SECOND
+    for _ in range(2):
+        genetic_algorithm(generations=2, checkpoint_path=None, resume=False, **GA_SETTINGS)
+    log_paths = glob.glob(str(tmp_path / "results" / "ga_logs" / "ga_log_*.csv"))
+    assert len(log_paths) == 2
+    for log_path in log_paths:
+        rows = read_rows(log_path)
+        assert rows[0][0] == "generation"
+        assert [row[0] for row in rows[1:]] == ["0", "1"]
+
+
+def test_resume_continues_the_checkpointed_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    full_winner = genetic_algorithm(
+        generations=3, checkpoint_path=None, resume=False, log_path="full.csv", **GA_SETTINGS
+    )
+    genetic_algorithm(generations=2, checkpoint_path="checkpoint.pkl", resume=False, log_path="split.csv", **GA_SETTINGS)
+    resumed_winner = genetic_algorithm(
+        generations=3, checkpoint_path="checkpoint.pkl", resume=True, log_path="ignored.csv", **GA_SETTINGS
+    )
+
+    assert resumed_winner == full_winner
+    assert not (tmp_path / "ignored.csv").exists()
+    drop_timing = lambda rows: [row[:5] + row[6:] for row in rows]                  # generation_time_ms DIFFERS
+    assert drop_timing(read_rows("split.csv")) == drop_timing(read_rows("full.csv"))
+
+
+def test_resume_rejects_another_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    genetic_algorithm(generations=1, checkpoint_path="checkpoint.pkl", resume=False, **GA_SETTINGS)
+    with pytest.raises(ValueError, match="config"):
+        genetic_algorithm(
+            generations=2, checkpoint_path="checkpoint.pkl", resume=True,
+            ca_params={"bits_per_value": 4, "action_decoding": "sum"}, **GA_SETTINGS
+        )
@@ -0,0 +1,89 @@
+# test_import_time.py
+# Import-time budgets: modules imported by CLI start-up and pool workers must stay cheap to import
+# and must not pull in the heavy packages that only some controllers need. The heavy-package check
+# is the hard one; the time budgets are relative to numpy's import time on the same machine, so a
+# slow or loaded runner scales both sides of the comparison
+
+import os
+import re
+import sys
+import subprocess
+
+import pytest
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> (cumulative import budget in multiples of the baseline, packages it must not import)
+IMPORT_TIME_BUDGETS = {
+    'controllers.registry':        (0.4, ('gymnasium', 'scipy', 'torch', 'stable_baselines3')),
+    'controllers.lqr_controller':  (2,   ('scipy', 'torch', 'stable_baselines3')),
+    'controllers.pid_controller':  (2,   ('scipy', 'torch', 'stable_baselines3')),
+    'controllers.dqn_controller':  (4,   ('torch', 'stable_baselines3')),
+    'utils.pid.pid_optimize':      (4,   ('matplotlib', 'pandas', 'seaborn', 'torch')),
+    'main':                        (4,   ('scipy', 'torch', 'stable_baselines3', 'matplotlib', 'pandas')),
+}
+BASELINE_MODULE = 'numpy'                                                           # Imported by every start-up module but the registry
+IMPORT_TIME_REPEATS = 3                                                             # Fresh interpreters per measurement, the fastest one counts
+IMPORT_TIME_PATTERN = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module):
+    """
+    Imports a module in a fresh interpreter with `python -X importtime`.
+
+    Parameters:
+        module (str): Dotted module name, imported from the repository root
+
+    Returns:
+        tuple: (cumulative import time of module in ms, set of every module imported along the way)
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPOSITORY_ROOT, capture_output=True, text=True, check=True
+    )
+    cumulative_ms = None
+    imported = set()
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is None:
+            continue
+        imported.add(match.group(4))
+        if match.group(4) == module:
+            cumulative_ms = int(match.group(2)) / 1000
+    return cumulative_ms, imported
+
+
+def fastest_import(module):
+    """
+    Measures a module's import IMPORT_TIME_REPEATS times and keeps the fastest run,
+    which is the one least disturbed by other load on the machine.
+
+    Parameters:
+        module (str): Dotted module name, imported from the repository root
+
+    Returns:
+        tuple: (fastest cumulative import time in ms, set of every module imported along the way)
+    """
+    measurements = [measure_import(module) for _ in range(IMPORT_TIME_REPEATS)]
+    return min(cumulative_ms for cumulative_ms, _ in measurements), measurements[0][1]
+
+
+@pytest.fixture(scope='module')
+def baseline_ms():
+    cumulative_ms, _ = fastest_import(BASELINE_MODULE)
+    return cumulative_ms
+
+
+@pytest.mark.parametrize('module', IMPORT_TIME_BUDGETS)
+def test_import_time_budget(module, baseline_ms):
+    budget, forbidden_packages = IMPORT_TIME_BUDGETS[module]
+    cumulative_ms, imported = measure_import(module)
+    heavy = sorted(package for package in forbidden_packages if package in imported)
+    assert not heavy, f"{module} imports {', '.join(heavy)}"
+    assert cumulative_ms is not None, f"{module} not found in the -X importtime output"
+    if cumulative_ms > budget * baseline_ms:
+        cumulative_ms, _ = fastest_import(module)                                   # Re-measure before failing on a noisy run
+    assert cumulative_ms <= budget * baseline_ms, (
+        f"{module} took {cumulative_ms:.1f} ms to import, {cumulative_ms / baseline_ms:.2f}x "
+        f"{BASELINE_MODULE} ({baseline_ms:.1f} ms, budget {budget}x)"
+    )
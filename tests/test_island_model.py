@@ -0,0 +1,42 @@
+# test_island_model.py
+# A one-island run is the single-population GA on the island's seed, so both must evolve the same rules,
+# also when the CA parameters differ from ca_config
+
+import csv
+import glob
+import random
+
+import pytest
+
+from utils.genetic_algorithm.genetic_algorithm import genetic_algorithm
+from utils.genetic_algorithm.island_model import island_genetic_algorithm
+
+RUN_SEED = 7
+GA_SETTINGS = dict(population_size=10, generations=3, racing_enabled=True, seed_schedule="per_generation")
+
+
+def read_log(path, **filters):
+    with open(path, newline='') as log_file:
+        return [
+            (row["generation"], row["best_rule"], row["best_fitness"], row["avg_fitness"])
+            for row in csv.DictReader(log_file)
+            if all(row[name] == value for name, value in filters.items())
+        ]
+
+
+@pytest.mark.parametrize('neighborhood_radius', (1, 2))
+def test_single_island_matches_genetic_algorithm(tmp_path, monkeypatch, neighborhood_radius):
+    monkeypatch.chdir(tmp_path)
+    ca_params = {"neighborhood_radius": neighborhood_radius, "row_length": 40}
+
+    island_winner = island_genetic_algorithm(island_count=1, run_seed=RUN_SEED, ca_params=ca_params, **GA_SETTINGS)
+    island_seed = random.Random(RUN_SEED).randrange(2 ** 32)                        # SEED OF ISLAND 0
+    ga_winner = genetic_algorithm(
+        run_seed=island_seed, evaluation_backend="batched", fitness_cache_path=None, checkpoint_path=None,
+        resume=False, ca_params=ca_params, log_path=str(tmp_path / "ga_log.csv"), **GA_SETTINGS
+    )
+
+    assert len(island_winner) == 2 ** (2 * neighborhood_radius + 1)
+    assert island_winner == ga_winner
+    island_log, = glob.glob(str(tmp_path / "results" / "ga_logs" / "ga_islands_log_*.csv"))
+    assert read_log(island_log, island="0") == read_log(tmp_path / "ga_log.csv")
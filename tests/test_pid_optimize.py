@@ -0,0 +1,79 @@
+# test_pid_optimize.py
+# PID search bookkeeping and the stability early exit
+
+from itertools import product
+
+import numpy as np
+import pytest
+
+from utils.pid import pid_optimize
+from utils.pid.pid_optimize import is_better
+
+
+def test_ties_are_broken_by_combination_order():
+    first, second = (0.0, 1.25, 5.0, 0.0, 0.0), (0.0, 2.5, 1.0, 0.0, 0.0)
+    assert is_better(100.0, first, 100.0, second)
+    assert not is_better(100.0, second, 100.0, first)
+    assert is_better(101.0, second, 100.0, first)
+    assert is_better(1.0, second, 0.0, None)
+
+
+@pytest.fixture
+def short_episodes(monkeypatch):
+    # SHORT EPISODES AND WINDOW KEEP THE SCALAR REFERENCE FAST, BUT STILL EXERCISE FAILURE, STABILITY AND MAX_STEPS
+    monkeypatch.setattr(pid_optimize, "MAX_STEPS", 3000)
+    monkeypatch.setattr(pid_optimize, "STABILITY_WINDOW", 300)
+
+
+def grid_sample(num_combos, seed=0):
+    grid = list(product(pid_optimize.KP_X_VALUES, pid_optimize.KD_X_VALUES, pid_optimize.KP_TH_VALUES,
+                        pid_optimize.KD_TH_VALUES, pid_optimize.KI_TH_VALUES))
+    return [grid[index] for index in np.random.default_rng(seed).choice(len(grid), num_combos, replace=False)]
+
+
+@pytest.mark.parametrize('early_exit', (True, False))
+@pytest.mark.parametrize('scalar_tail_lanes', (0, 4, 64))
+def test_vectorized_matches_scalar(short_episodes, early_exit, scalar_tail_lanes):
+    combos = grid_sample(16)
+    episode_seeds = pid_optimize.draw_episode_seeds()
+    expected = np.array([pid_optimize.run_pid_episodes(combo, episode_seeds, early_exit) for combo in combos])
+    actual = np.column_stack(pid_optimize.evaluate_pid_combinations_vectorized(
+        combos, episode_seeds, early_exit, scalar_tail_lanes=scalar_tail_lanes
+    ))
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_stays_on_track_projects_the_drift_over_the_remaining_steps():
+    # 0.05 PER 1000 STEPS STAYS INSIDE STABILITY_DRIFT, BUT ADDS UP TO ABOUT 5 OVER 99000 STEPS
+    assert not pid_optimize.stays_on_track(0.1, 0.05, 1000, 99000)
+    assert pid_optimize.stays_on_track(0.1, 0.099, 1000, 99000)
+    np.testing.assert_array_equal(
+        pid_optimize.stays_on_track(np.array([0.1, -0.1], dtype=np.float32), np.float32(0.0), 1000, 1000),
+        [True, True]
+    )
+
+
+def test_early_exit_matches_full_horizon(monkeypatch):
+    # LONG ENOUGH FOR A SLOW DRIFT TO LEAVE THE TRACK AFTER STABILITY_WINDOW, SHORT ENOUGH TO RUN IN SECONDS
+    monkeypatch.setattr(pid_optimize, "MAX_STEPS", 20000)
+    combos = grid_sample(200, seed=1)
+    episode_seeds = pid_optimize.draw_episode_seeds()
+    early, stable, _ = pid_optimize.evaluate_pid_combinations_vectorized(combos, episode_seeds, early_exit=True)
+    full, _, _ = pid_optimize.evaluate_pid_combinations_vectorized(combos, episode_seeds, early_exit=False)
+    assert stable.sum() > 0
+    assert np.all(early >= full)                                                    # Early exit can only over-score
+    np.testing.assert_array_equal(early[stable == 0], full[stable == 0])
+    assert np.mean(early != full) <= 0.01, [combo for combo, e, f in zip(combos, early, full) if e != f]
+
+
+def test_verify_best_rescores_over_the_full_horizon(short_episodes):
+    # SETTLES FOR STABILITY_WINDOW STEPS IN ONE EPISODE BUT FALLS LATER: 1292.7 STEPS WITH EARLY EXIT, 816.7 WITHOUT
+    over_scored = (5.0, 0.0, 50.92307692307692, 1.0714285714285714, 1.3333333333333333)
+    verified_combo = (5.0, 5.0, 60.0, 15.0, 2.0)
+    episode_seeds = pid_optimize.draw_episode_seeds()
+    early_score, _ = pid_optimize.evaluate_pid_combination(over_scored, episode_seeds, early_exit=True)
+    scores, verified = {over_scored: early_score, verified_combo: 1000.0}, {verified_combo}
+    assert early_score > 1000.0
+    assert pid_optimize.verify_best(scores, verified, episode_seeds) == (verified_combo, 1000.0)
+    assert scores[over_scored] == pid_optimize.evaluate_pid_combination(over_scored, episode_seeds, early_exit=False)[0]
+    assert verified == {verified_combo, over_scored}
@@ -0,0 +1,129 @@
+# artifact_store.py
+# Keeps trained controllers on disk, so evaluation runs load them instead of retraining
+
+import os
+import json
+import hashlib
+from datetime import datetime
+
+# -------------------------
+# Store Configuration
+# -------------------------
+ARTIFACT_DIRECTORY = os.path.join("results", "artifacts")                           # One <name>.json (+ payload files) per artifact
+
+
+# -------------------------
+# Fingerprints
+# -------------------------
+def config_fingerprint(config):
+    """
+    Hashes the configuration an artifact was built with.
+
+    Parameters:
+        config (dict): JSON-serialisable settings that determine the artifact
+
+    Returns:
+        str: SHA-256 hex digest, identical for equal configs regardless of key order
+    """
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# -------------------------
+# Metadata
+# -------------------------
+def artifact_path(name, suffix="", directory=ARTIFACT_DIRECTORY):
+    """
+    Returns the path of an artifact file, e.g. artifact_path('dqn_policy', '.zip').
+    """
+    return os.path.join(directory, name + suffix)
+
+
+def read_artifact_metadata(name, directory=ARTIFACT_DIRECTORY):
+    """
+    Reads the metadata of an artifact.
+
+    Returns:
+        dict or None: {'fingerprint', 'config', 'created', ...}, None when the artifact was never stored
+    """
+    metadata_path = artifact_path(name, ".json", directory)
+    if not os.path.isfile(metadata_path):
+        return None
+    with open(metadata_path) as metadata_file:
+        return json.load(metadata_file)
+
+
+def write_artifact_metadata(name, config, directory=ARTIFACT_DIRECTORY, **extra):
+    """
+    Records that an artifact was built with config. Written last and atomically,
+    so an interrupted build never looks like a fresh artifact.
+
+    Parameters:
+        name (str): Artifact name
+        config (dict): Settings the artifact was built with
+        **extra: Additional JSON-serialisable fields stored alongside (e.g. the CA rule itself)
+    """
+    os.makedirs(directory, exist_ok=True)
+    metadata = {
+        "fingerprint": config_fingerprint(config),
+        "config": config,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        **extra,
+    }
+    metadata_path = artifact_path(name, ".json", directory)
+    with open(metadata_path + ".tmp", "w") as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+    os.replace(metadata_path + ".tmp", metadata_path)
+
+
+def is_artifact_fresh(name, config, payload_suffix=None, directory=ARTIFACT_DIRECTORY):
+    """
+    Checks whether a stored artifact was built with exactly this config.
+
+    Parameters:
+        name (str): Artifact name
+        config (dict): Current settings
+        payload_suffix (str or None): Suffix of a payload file that must exist as well (e.g. '.zip')
+
+    Returns:
+        bool: False when the artifact is missing, its payload is gone or its config changed (stale)
+    """
+    metadata = read_artifact_metadata(name, directory)
+    if metadata is None or metadata.get("fingerprint") != config_fingerprint(config):
+        return False
+    return payload_suffix is None or os.path.isfile(artifact_path(name, payload_suffix, directory))
+
+
+# -------------------------
+# Load or Build
+# -------------------------
+def load_or_build(name, config, build, load, save=None, payload_suffix=None, retrain=False,
+                  directory=ARTIFACT_DIRECTORY):
+    """
+    Returns an artifact from the store, building and storing it only when it is missing or stale.
+
+    Parameters:
+        name (str): Artifact name
+        config (dict): Settings the artifact depends on, compared by fingerprint
+        build (callable): build() -> artifact, the expensive step (training, search)
+        load (callable): load(metadata) -> artifact, for a fresh stored artifact
+        save (callable or None): save(artifact) -> dict of extra metadata fields, writes any payload file
+        payload_suffix (str or None): Suffix of the payload file written by save
+        retrain (bool): Build even when a fresh artifact exists
+
+    Returns:
+        artifact: Loaded or newly built
+    """
+    if not retrain and is_artifact_fresh(name, config, payload_suffix, directory):
+        print(f"Loading {name} from {artifact_path(name, payload_suffix or '.json', directory)}")
+        return load(read_artifact_metadata(name, directory))
+
+    reason = "retrain requested" if retrain else (
+        "stale" if read_artifact_metadata(name, directory) is not None else "missing"
+    )
+    print(f"Building {name} ({reason})...")
+    artifact = build()
+    os.makedirs(directory, exist_ok=True)
+    extra = save(artifact) if save is not None else {}
+    write_artifact_metadata(name, config, directory, **(extra or {}))
+    return artifact
@@ -0,0 +1,27 @@
+from ca_config import BITS_PER_VALUE, ROW_LENGTH, NEIGHBORHOOD_RADIUS, NUMBER_OF_CA_TICKS, ACTION_DECODING
+
+# NAMES OF THE CA PARAMETERS THAT CAN BE PASSED EXPLICITLY INSTEAD OF READ FROM ca_config
+CA_PARAM_NAMES = ("bits_per_value", "row_length", "neighborhood_radius", "number_of_ca_ticks", "action_decoding")
+
+# THIS FUNCTION RETURNS A COMPLETE CA PARAMETER DICT: THE ca_config VALUES, OVERRIDDEN BY ca_params
+# ca_params: None OR A DICT WITH ANY OF CA_PARAM_NAMES, E.G. {"bits_per_value": 6, "action_decoding": "sum"}
+def resolve_ca_params(ca_params=None):
+    resolved = {
+        "bits_per_value": BITS_PER_VALUE,
+        "row_length": ROW_LENGTH,
+        "neighborhood_radius": NEIGHBORHOOD_RADIUS,
+        "number_of_ca_ticks": NUMBER_OF_CA_TICKS,
+        "action_decoding": ACTION_DECODING,
+    }
+    if ca_params is None:
+        return resolved
+    unknown_names = set(ca_params) - set(CA_PARAM_NAMES)
+    if unknown_names:
+        raise ValueError(f"Unknown CA parameters: {sorted(unknown_names)}")
+    resolved.update(ca_params)
+    # ALL FOUR ENCODED OBSERVATION VALUES MUST FIT INTO THE ROW
+    if 4 * resolved["bits_per_value"] > resolved["row_length"]:
+        raise ValueError(
+            f"ROW_LENGTH = {resolved['row_length']} cannot hold 4 values of BITS_PER_VALUE = {resolved['bits_per_value']}"
+        )
+    return resolved
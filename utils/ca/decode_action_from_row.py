@@ -3,21 +3,45 @@ from ca_config import ACTION_DECODING
 
 # THIS FUNCTION DECODES ACTION FROM THE CENTER CELL OF THE ROW
 # row: THE CA ROW AFTER EVOLUTION
-def decode_action_from_row(ca_row):
+# action_decoding: 'center', 'majority' OR 'sum' (DEFAULT FROM CONFIG)
+def decode_action_from_row(ca_row, action_decoding=ACTION_DECODING):
     length = len(ca_row)
     ones   = int(np.sum(ca_row))
 
-    if ACTION_DECODING == "center":
+    if action_decoding == "center":
         center_index = length // 2
         return int(ca_row[center_index])
 
-    if ACTION_DECODING == "majority":
+    if action_decoding == "majority":
         # strictly more than half
         return 1 if ones > (length / 2) else 0
 
-    if ACTION_DECODING == "sum":
+    if action_decoding == "sum":
         # greater-or-equal threshold
         return 1 if (ones / length) >= 0.5 else 0
 
     # If we get here, config has an invalid value
-    raise ValueError(f"Unknown ACTION_DECODING = {ACTION_DECODING!r}")
\ No newline at end of file
+    raise ValueError(f"Unknown ACTION_DECODING = {action_decoding!r}")
+
+
+# THIS FUNCTION DECODES ONE ACTION PER ROW FROM A STACK OF ROWS
+# ca_rows: 2D ARRAY, ONE CA ROW AFTER EVOLUTION PER LINE
+# action_decoding: 'center', 'majority' OR 'sum' (DEFAULT FROM CONFIG)
+def decode_actions_from_rows(ca_rows, action_decoding=ACTION_DECODING):
+    length = ca_rows.shape[-1]
+    ones   = np.sum(ca_rows, axis=-1)
+
+    if action_decoding == "center":
+        center_index = length // 2
+        return ca_rows[..., center_index].astype(int)
+
+    if action_decoding == "majority":
+        # strictly more than half
+        return (ones > (length / 2)).astype(int)
+
+    if action_decoding == "sum":
+        # greater-or-equal threshold
+        return ((ones / length) >= 0.5).astype(int)
+
+    # If we get here, config has an invalid value
+    raise ValueError(f"Unknown ACTION_DECODING = {action_decoding!r}")
@@ -1,14 +1,18 @@
 import numpy as np
 from ca_config import BITS_PER_VALUE
 
+# OBSERVATION BOUNDS AND SCALE, COMPUTED ONCE AT MODULE LOAD
+MINIMUM_VALUES = np.array([-2.4, -3.0, -0.20944, -5.0])
+MAXIMUM_VALUES = np.array([2.4, 3.0, 0.20944, 5.0])
+VALUE_RANGES = MAXIMUM_VALUES - MINIMUM_VALUES
+MAXIMUM_INTEGER = (1 << BITS_PER_VALUE) - 1
+
 # THIS FUNCTION TURNS CONTINUOUS OBSERVATION INTO DISCRETE VALUES
-# observation: THE OBSERVATION ARRAY FROM CARTPOLE ENVIRONMENT
+# observation: THE OBSERVATION ARRAY FROM CARTPOLE ENVIRONMENT, OR A BATCH OF THEM (N x 4)
 # bits: NUMBER OF BITS TO REPRESENT EACH VARIABLE
 def discretize_observation(observation, bits=BITS_PER_VALUE):
-    minimum_values = np.array([-2.4, -3.0, -0.20944, -5.0])
-    maximum_values = np.array([2.4, 3.0, 0.20944, 5.0])
-    clamped_observation = np.minimum(np.maximum(observation, minimum_values), maximum_values)
-    normalized_observation = (clamped_observation - minimum_values) / (maximum_values - minimum_values)
-    maximum_integer = (1 << bits) - 1
+    clamped_observation = np.minimum(np.maximum(observation, MINIMUM_VALUES), MAXIMUM_VALUES)
+    normalized_observation = (clamped_observation - MINIMUM_VALUES) / VALUE_RANGES
+    maximum_integer = MAXIMUM_INTEGER if bits == BITS_PER_VALUE else (1 << bits) - 1
     discrete_observation = np.round(normalized_observation * maximum_integer).astype(int)
-    return discrete_observation
\ No newline at end of file
+    return discrete_observation
@@ -1,17 +1,21 @@
 import numpy as np
 from ca_config import ROW_LENGTH, BITS_PER_VALUE
 
+# BIT SHIFTS FOR THE CONFIGURED BITS_PER_VALUE, COMPUTED ONCE AT MODULE LOAD
+BIT_SHIFTS = np.arange(BITS_PER_VALUE)
+
 # ENCODES A DISCRETE OBSERVATION INTO A 1D CELLULAR AUTOMATON ROW
-# discrete_observation: ARRAY OF INTEGER VALUES REPRESENTING DISCRETIZED OBSERVATIONS
+# discrete_observation: ARRAY OF INTEGER VALUES REPRESENTING DISCRETIZED OBSERVATIONS, OR A BATCH OF THEM (N x 4)
 # row_length: TOTAL LENGTH OF THE OUTPUT CA ROW (DEFAULT FROM CONFIG)
 # bits_per_variable: NUMBER OF BITS TO REPRESENT EACH OBSERVATION VALUE
+# BIT b OF VARIABLE v GOES TO CELL v * bits_per_variable + b, REMAINING CELLS STAY 0
 def encode_into_row(discrete_observation, row_length=ROW_LENGTH, bits_per_variable=BITS_PER_VALUE):
-    ca_row = np.zeros(row_length, dtype=int)
-    # ITERATE OVER EACH VALUE IN THE DISCRETE OBSERVATION
-    for variable_index, variable_value in enumerate(discrete_observation):
-        # CONVERT EACH VALUE TO BINARY AND PLACE BITS IN THE ROW
-        for bit_index in range(bits_per_variable):
-            bit_value = (variable_value >> bit_index) & 1
-            position_in_row = variable_index * bits_per_variable + bit_index
-            ca_row[position_in_row] = bit_value
+    discrete_observation = np.asarray(discrete_observation)
+    batch_shape = discrete_observation.shape[:-1]
+    # EXPAND EVERY VALUE INTO ITS BITS WITH ONE BROADCASTED SHIFT-AND-MASK
+    bit_shifts = BIT_SHIFTS if bits_per_variable == BITS_PER_VALUE else np.arange(bits_per_variable)
+    variable_bits = (discrete_observation[..., :, None] >> bit_shifts) & 1
+    encoded_length = discrete_observation.shape[-1] * bits_per_variable
+    ca_row = np.zeros(batch_shape + (row_length,), dtype=int)
+    ca_row[..., :encoded_length] = variable_bits.reshape(batch_shape + (encoded_length,))
     return ca_row
@@ -0,0 +1,12 @@
+from ca_config import ROW_LENGTH, BITS_PER_VALUE
+from utils.ca.discretize_observation import discretize_observation
+from utils.ca.encode_into_row import encode_into_row
+
+# THIS FUNCTION DISCRETIZES AND ENCODES OBSERVATIONS INTO CA ROWS
+# observations: ONE OBSERVATION (4,) OR A BATCH (N x 4)
+# row_length, bits_per_value: ROW GEOMETRY (DEFAULT FROM CONFIG)
+# RETURNS ROWS OF LENGTH row_length (row_length,) OR (N x row_length)
+def encode_observations(observations, row_length=ROW_LENGTH, bits_per_value=BITS_PER_VALUE):
+    return encode_into_row(
+        discretize_observation(observations, bits=bits_per_value), row_length=row_length, bits_per_variable=bits_per_value
+    )
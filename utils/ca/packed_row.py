@@ -0,0 +1,147 @@
+import operator
+import time
+from functools import reduce
+
+import numpy as np
+
+from utils.ca.step_eca_vectorized import step_eca_vectorized
+
+# PACKED ROWS STORE A WHOLE CA ROW IN ONE PYTHON INT: CELL i OF THE ARRAY FORM IS BIT i OF THE INT
+# THE STEP COST GROWS WITH THE NUMBER OF MINTERMS (UP TO 2**(2*radius)), SO THE ENGINE ONLY PAYS OFF AT RADIUS 1
+# (ABOUT 2-3x OVER step_eca_vectorized FOR ONE ROW); AT RADIUS 2 IT IS NOT FASTER (0.9-1.2x, SEE benchmark_packed_row),
+# SO compile_row_rule / step_row_ticks ONLY SELECT IT UP TO PACKED_ENGINE_MAX_RADIUS
+
+
+# PACKS A CA ROW ARRAY INTO A SINGLE INTEGER
+# ca_row: 1D NUMPY ARRAY OF CELL STATES (0 OR 1)
+def pack_row(ca_row):
+    packed_bytes = np.packbits(np.asarray(ca_row, dtype=np.uint8), bitorder="little")
+    return int.from_bytes(packed_bytes.tobytes(), "little")
+
+
+# UNPACKS AN INTEGER BACK INTO THE ARRAY FORM USED BY decode_action_from_row AND THE LOGGERS
+# packed_row: INTEGER HOLDING ONE CELL PER BIT
+# row_length: NUMBER OF CELLS IN THE ROW
+def unpack_row(packed_row, row_length):
+    packed_bytes = np.frombuffer(packed_row.to_bytes((row_length + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(packed_bytes, count=row_length, bitorder="little").astype(int)
+
+
+# TURNS A RULE TABLE INTO A SUM-OF-MINTERMS FORM FOR step_packed_row
+# rule_table: ARRAY OR LIST MAPPING NEIGHBORHOOD PATTERNS TO NEXT STATE (LENGTH = 2**(2*radius+1))
+# neighborhood_radius: NUMBER OF CELLS TO EACH SIDE TO FORM NEIGHBORHOOD
+# RETURNS (invert_output, minterms), EACH MINTERM LISTS WHICH NEIGHBOR WORD TO AND IN FOR EVERY POSITION:
+# INDEX 2*position + bit, SO EVEN INDICES ARE THE INVERTED WORDS AND ODD INDICES THE PLAIN WORDS
+def compile_packed_rule(rule_table, neighborhood_radius):
+    neighborhood_size = 2 * neighborhood_radius + 1
+    rule_bits = [int(bit) for bit in rule_table]
+    ones = [pattern for pattern, bit in enumerate(rule_bits) if bit]
+    zeros = [pattern for pattern, bit in enumerate(rule_bits) if not bit]
+
+    # USE WHICHEVER SIDE OF THE TABLE HAS FEWER PATTERNS, INVERTING THE RESULT FOR THE ZERO SIDE
+    invert_output = len(zeros) < len(ones)
+    patterns = zeros if invert_output else ones
+
+    minterms = tuple(
+        tuple(
+            2 * position + ((pattern >> (neighborhood_size - 1 - position)) & 1)
+            for position in range(neighborhood_size)
+        )
+        for pattern in patterns
+    )
+    return invert_output, minterms
+
+
+# ADVANCES A PACKED CA ROW BY ONE TIME STEP WITH SHIFTS, ROTATIONS AND BOOLEAN OPS
+# packed_row: INTEGER HOLDING ONE CELL PER BIT
+# packed_rule: OUTPUT OF compile_packed_rule FOR THE SAME RADIUS
+# neighborhood_radius: NUMBER OF CELLS TO EACH SIDE TO FORM NEIGHBORHOOD
+# row_length: NUMBER OF CELLS IN THE ROW
+def step_packed_row(packed_row, packed_rule, neighborhood_radius, row_length):
+    invert_output, minterms = packed_rule
+    row_mask = (1 << row_length) - 1
+
+    # ROTATE THE ROW SO BIT i OF EACH WORD HOLDS THE NEIGHBOR OF CELL i AT THAT OFFSET
+    neighbor_words = []
+    for offset in range(-neighborhood_radius, neighborhood_radius + 1):
+        shift = offset % row_length
+        rotated = ((packed_row >> shift) | (packed_row << (row_length - shift))) & row_mask
+        neighbor_words.append(rotated ^ row_mask)
+        neighbor_words.append(rotated)
+
+    # OR TOGETHER ONE AND-TERM PER MINTERM OF THE RULE
+    next_row = 0
+    for minterm in minterms:
+        next_row |= reduce(operator.and_, map(neighbor_words.__getitem__, minterm))
+
+    if invert_output:
+        next_row ^= row_mask
+    return next_row
+
+
+# THE PACKED ENGINE IS ONLY USED UP TO THIS RADIUS, WIDER NEIGHBORHOODS STEP WITH step_eca_vectorized
+PACKED_ENGINE_MAX_RADIUS = 1
+
+
+# COMPILES THE RULE FOR THE PACKED ENGINE WHERE IT IS FASTER, RETURNS None WHERE step_eca_vectorized IS USED
+# rule_table: ARRAY OR LIST MAPPING NEIGHBORHOOD PATTERNS TO NEXT STATE (LENGTH = 2**(2*radius+1))
+# neighborhood_radius: NUMBER OF CELLS TO EACH SIDE TO FORM NEIGHBORHOOD
+def compile_row_rule(rule_table, neighborhood_radius):
+    if neighborhood_radius > PACKED_ENGINE_MAX_RADIUS:
+        return None
+    return compile_packed_rule(rule_table, neighborhood_radius)
+
+
+# ADVANCES ONE CA ROW BY number_of_ticks STEPS WITH THE ENGINE CHOSEN BY compile_row_rule
+# ca_row: 1D NUMPY ARRAY OF CELL STATES (0 OR 1)
+# rule_table: RULE TABLE, USED BY step_eca_vectorized WHEN packed_rule IS None
+# packed_rule: OUTPUT OF compile_row_rule FOR THE SAME RULE AND RADIUS
+# RETURNS THE ROW IN ARRAY FORM
+def step_row_ticks(ca_row, rule_table, packed_rule, neighborhood_radius, number_of_ticks):
+    if packed_rule is None:
+        for _ in range(number_of_ticks):
+            ca_row = step_eca_vectorized(ca_row, rule_table, neighborhood_radius)
+        return ca_row
+    row_length = len(ca_row)
+    packed_row = pack_row(ca_row)
+    for _ in range(number_of_ticks):
+        packed_row = step_packed_row(packed_row, packed_rule, neighborhood_radius, row_length)
+    return unpack_row(packed_row, row_length)
+
+
+# TIMES THE VECTORIZED ARRAY ENGINE AGAINST THE PACKED ENGINE FOR SEVERAL ROW LENGTHS (EQUIVALENCE: tests/test_ca_engines.py)
+# row_lengths: ROW LENGTHS TO BENCHMARK
+# neighborhood_radii: NEIGHBORHOOD RADII TO BENCHMARK
+# repeats: NUMBER OF STEPS TIMED PER COMBINATION
+def benchmark_packed_row(row_lengths=(32, 48, 64), neighborhood_radii=(1, 2), repeats=5000, seed=0):
+    generator = np.random.default_rng(seed)
+    results = []
+    for neighborhood_radius in neighborhood_radii:
+        rule_size = 2 ** (2 * neighborhood_radius + 1)
+        for row_length in row_lengths:
+            rule_table = list(generator.integers(0, 2, size=rule_size))
+            current_row = generator.integers(0, 2, size=row_length).astype(int)
+            packed_rule = compile_packed_rule(rule_table, neighborhood_radius)
+            packed_row = pack_row(current_row)
+
+            start_time = time.perf_counter()
+            for _ in range(repeats):
+                step_eca_vectorized(current_row, rule_table, neighborhood_radius)
+            vectorized_us = (time.perf_counter() - start_time) / repeats * 1e6
+
+            start_time = time.perf_counter()
+            for _ in range(repeats):
+                step_packed_row(packed_row, packed_rule, neighborhood_radius, row_length)
+            packed_us = (time.perf_counter() - start_time) / repeats * 1e6
+
+            results.append((row_length, neighborhood_radius, vectorized_us, packed_us))
+            print(
+                f"ROW_LENGTH {row_length:3d} · radius {neighborhood_radius} · "
+                f"vectorized {vectorized_us:8.2f} µs · packed {packed_us:8.2f} µs · "
+                f"speedup {vectorized_us / packed_us:5.1f}x"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_packed_row()
@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+
+from utils.ca.step_eca import step_eca
+
+# ADVANCES A CELLULAR AUTOMATON ROW BY ONE TIME STEP USING WHOLE-ROW NUMPY OPERATIONS
+# current_row: NUMPY ARRAY OF CURRENT CELL STATES (0 OR 1), CELLS ALONG THE LAST AXIS
+# rule_table: ARRAY OR LIST MAPPING NEIGHBORHOOD PATTERNS TO NEXT STATE (LENGTH = 2**(2*radius+1)),
+#             OR A 2D ARRAY WITH ONE RULE TABLE PER ROW WHEN current_row HOLDS A STACK OF ROWS
+# neighborhood_radius: NUMBER OF CELLS TO EACH SIDE TO FORM NEIGHBORHOOD
+# PRODUCES THE SAME OUTPUT AS step_eca, BUT BUILDS EVERY PATTERN INDEX AT ONCE FROM SHIFTED VIEWS
+def step_eca_vectorized(current_row, rule_table, neighborhood_radius):
+    rule_table = np.asarray(rule_table)
+    row_length = current_row.shape[-1]
+
+    # WRAP THE ROW ONCE SO EVERY NEIGHBOR OFFSET IS A PLAIN SLICE OF THE PADDED ROW
+    padded_row = np.concatenate(
+        (current_row[..., row_length - neighborhood_radius:], current_row, current_row[..., :neighborhood_radius]),
+        axis=-1,
+    ).astype(np.intp, copy=False)
+
+    # BUILD PATTERN VALUES FOR ALL CELLS, LEFTMOST NEIGHBOR IS THE MOST SIGNIFICANT BIT
+    pattern_index = padded_row[..., :row_length].copy()
+    for start in range(1, 2 * neighborhood_radius + 1):
+        pattern_index <<= 1
+        pattern_index |= padded_row[..., start:start + row_length]
+
+    # LOOK UP NEXT STATE OF EVERY CELL WITH ONE FANCY-INDEX
+    if rule_table.ndim > 1:
+        next_row = np.take_along_axis(rule_table, pattern_index, axis=-1)
+    else:
+        next_row = rule_table[pattern_index]
+    return next_row.astype(current_row.dtype, copy=False)
+
+
+# TIMES THE PER-CELL LOOP AGAINST THE VECTORIZED ENGINE FOR SEVERAL ROW LENGTHS (EQUIVALENCE: tests/test_ca_engines.py)
+# row_lengths: ROW LENGTHS TO BENCHMARK
+# neighborhood_radii: NEIGHBORHOOD RADII TO BENCHMARK
+# repeats: NUMBER OF STEPS TIMED PER COMBINATION
+def benchmark_step_eca(row_lengths=(32, 48, 64), neighborhood_radii=(1, 2), repeats=2000, seed=0):
+    generator = np.random.default_rng(seed)
+    results = []
+    for neighborhood_radius in neighborhood_radii:
+        rule_size = 2 ** (2 * neighborhood_radius + 1)
+        for row_length in row_lengths:
+            rule_table = list(generator.integers(0, 2, size=rule_size))
+            current_row = generator.integers(0, 2, size=row_length).astype(int)
+
+            start_time = time.perf_counter()
+            for _ in range(repeats):
+                step_eca(current_row, rule_table, neighborhood_radius)
+            loop_us = (time.perf_counter() - start_time) / repeats * 1e6
+
+            start_time = time.perf_counter()
+            for _ in range(repeats):
+                step_eca_vectorized(current_row, rule_table, neighborhood_radius)
+            vectorized_us = (time.perf_counter() - start_time) / repeats * 1e6
+
+            results.append((row_length, neighborhood_radius, loop_us, vectorized_us))
+            print(
+                f"ROW_LENGTH {row_length:3d} · radius {neighborhood_radius} · "
+                f"loop {loop_us:8.2f} µs · vectorized {vectorized_us:8.2f} µs · "
+                f"speedup {loop_us / vectorized_us:5.1f}x"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_step_eca()
@@ -0,0 +1,229 @@
+# cartpole.py
+
+import math
+
+import numpy as np
+
+# -------------------------
+# Static Constants (identical to gymnasium CartPole-v1)
+# -------------------------
+GRAVITY = 9.8                                                                       # m/s^2
+MASS_CART = 1.0                                                                     # kg
+MASS_POLE = 0.1                                                                     # kg
+TOTAL_MASS = MASS_POLE + MASS_CART
+POLE_LENGTH = 0.5                                                                   # m, half the pole's length
+POLEMASS_LENGTH = MASS_POLE * POLE_LENGTH
+FORCE_MAG = 10.0                                                                    # N
+TAU = 0.02                                                                          # Seconds between state updates
+
+THETA_THRESHOLD_RADIANS = 12 * 2 * math.pi / 360                                    # Pole angle at which the episode fails
+X_THRESHOLD = 2.4                                                                   # Cart position at which the episode fails
+MAX_EPISODE_STEPS = 500                                                             # TimeLimit used by CartPole-v1
+
+RESET_LOW = -0.05                                                                   # Initial state sampled uniformly in [low, high)
+RESET_HIGH = 0.05
+
+
+# -------------------------
+# Vectorized CartPole
+# -------------------------
+class VectorCartPole:
+    """
+    Simulates N independent CartPole-v1 carts with array math.
+
+    Each lane follows the same Euler update, thresholds and time limit as
+    gymnasium's CartPole-v1. The internal state is float64 and observations
+    are float32, like gymnasium. A lane reset with a seed draws its initial
+    state exactly as env.reset(seed=seed) would, and later unseeded resets of
+    that lane continue its own generator. Lanes that were never seeded draw
+    from one shared generator.
+
+    Parameters:
+        num_envs (int): Number of independent carts (lanes)
+        seed (int or None): Seed for the shared generator of unseeded lanes
+        max_episode_steps (int or None): Truncation limit, None disables truncation
+    """
+
+    def __init__(self, num_envs, seed=None, max_episode_steps=MAX_EPISODE_STEPS):
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+        self.states = np.zeros((num_envs, 4), dtype=np.float64)
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+        self.shared_generator = np.random.default_rng(seed)
+        self.lane_generators = [None] * num_envs
+
+    def reset(self, seeds=None, mask=None):
+        """
+        Samples new initial states for the selected lanes.
+
+        Parameters:
+            seeds (list[int or None] or None): Optional reset seed per lane
+            mask (ndarray[bool] or None): Lanes to reset, None resets all lanes
+
+        Returns:
+            ndarray: (N, 4) float32 observations of all lanes
+        """
+        lane_indices = np.arange(self.num_envs) if mask is None else np.flatnonzero(mask)
+
+        shared_lanes = []
+        for lane in lane_indices:
+            lane_seed = None if seeds is None else seeds[lane]
+            if lane_seed is not None:
+                self.lane_generators[lane] = np.random.default_rng(lane_seed)      # Same generator as env.reset(seed=...)
+            if self.lane_generators[lane] is None:
+                shared_lanes.append(lane)
+            else:
+                self.states[lane] = self.lane_generators[lane].uniform(RESET_LOW, RESET_HIGH, size=(4,))
+
+        if shared_lanes:
+            self.states[shared_lanes] = self.shared_generator.uniform(
+                RESET_LOW, RESET_HIGH, size=(len(shared_lanes), 4)
+            )
+
+        self.elapsed_steps[lane_indices] = 0
+        return self.states.astype(np.float32)
+
+    def step(self, actions, mask=None):
+        """
+        Advances the selected lanes by one time step.
+
+        Parameters:
+            actions (ndarray[int]): Action per lane, 1 pushes right and 0 pushes left
+            mask (ndarray[bool] or None): Lanes to advance, None advances all lanes
+
+        Returns:
+            tuple: (observations, rewards, terminated, truncated), each indexed by lane.
+                   Lanes outside the mask keep their state and get zero reward.
+        """
+        x, x_dot, theta, theta_dot = self.states.T
+        force = np.where(np.asarray(actions) == 1, FORCE_MAG, -FORCE_MAG)
+        costheta = np.cos(theta)
+        sintheta = np.sin(theta)
+
+        # Same equations of motion as gymnasium's CartPoleEnv.step
+        temp = (force + POLEMASS_LENGTH * np.square(theta_dot) * sintheta) / TOTAL_MASS
+        thetaacc = (GRAVITY * sintheta - costheta * temp) / (
+            POLE_LENGTH * (4.0 / 3.0 - MASS_POLE * np.square(costheta) / TOTAL_MASS)
+        )
+        xacc = temp - POLEMASS_LENGTH * thetaacc * costheta / TOTAL_MASS
+
+        # Euler integration
+        next_states = np.stack((
+            x + TAU * x_dot,
+            x_dot + TAU * xacc,
+            theta + TAU * theta_dot,
+            theta_dot + TAU * thetaacc,
+        ), axis=1)
+
+        if mask is None:
+            self.states = next_states
+            stepped = np.ones(self.num_envs, dtype=bool)
+        else:
+            stepped = np.asarray(mask, dtype=bool)
+            self.states[stepped] = next_states[stepped]
+        self.elapsed_steps[stepped] += 1
+
+        x, theta = self.states[:, 0], self.states[:, 2]
+        terminated = (
+            (x < -X_THRESHOLD)
+            | (x > X_THRESHOLD)
+            | (theta < -THETA_THRESHOLD_RADIANS)
+            | (theta > THETA_THRESHOLD_RADIANS)
+        )
+        if self.max_episode_steps is None:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+        else:
+            truncated = self.elapsed_steps >= self.max_episode_steps
+        rewards = stepped.astype(np.float64)
+
+        return self.states.astype(np.float32), rewards, terminated & stepped, truncated & stepped
+
+    def subset(self, lanes):
+        """
+        Returns a new VectorCartPole that holds only the selected lanes.
+
+        State, step counts and per-lane generators are carried over, so the
+        selected lanes continue exactly as they would have here. Use it to
+        drop finished lanes instead of masking them on every step.
+
+        Parameters:
+            lanes (ndarray[bool] or ndarray[int]): Lane mask or lane indices to keep
+
+        Returns:
+            VectorCartPole: Carts of the selected lanes, in lane order
+        """
+        lanes = np.asarray(lanes)
+        lane_indices = np.flatnonzero(lanes) if lanes.dtype == bool else lanes
+        selected = VectorCartPole.__new__(VectorCartPole)                           # No fresh generator, the shared one is carried over
+        selected.num_envs = len(lane_indices)
+        selected.max_episode_steps = self.max_episode_steps
+        selected.states = self.states[lane_indices]
+        selected.elapsed_steps = self.elapsed_steps[lane_indices]
+        selected.shared_generator = self.shared_generator
+        selected.lane_generators = [self.lane_generators[lane] for lane in lane_indices]
+        return selected
+
+
+# -------------------------
+# Validation Against Gymnasium
+# -------------------------
+def validate_against_gymnasium(num_envs=16, seeds=None, num_episodes=3, action_seed=0, random_action_rate=0.2):
+    """
+    Runs gymnasium CartPole-v1 and VectorCartPole side by side with identical
+    reset seeds and actions, and checks that every observation and
+    termination/truncation flag matches exactly. Actions come from a simple
+    balancing rule with random flips, so both failures and time-limit
+    truncations are exercised.
+
+    Parameters:
+        num_envs (int): Number of lanes compared
+        seeds (list[int] or None): Reset seed per lane (default 0..num_envs-1)
+        num_episodes (int): Episodes per lane, only the first reset is seeded
+        action_seed (int): Seed for the random action flips
+        random_action_rate (float): Probability of flipping the balancing action
+
+    Returns:
+        int: Number of compared steps
+    """
+    import gymnasium as gym
+
+    if seeds is None:
+        seeds = list(range(num_envs))
+    action_generator = np.random.default_rng(action_seed)
+    environments = [gym.make("CartPole-v1") for _ in range(num_envs)]
+    vector_cartpole = VectorCartPole(num_envs)
+    compared_steps = 0
+
+    for episode_index in range(num_episodes):
+        episode_seeds = seeds if episode_index == 0 else None
+        observations = vector_cartpole.reset(seeds=episode_seeds)
+        for lane, environment in enumerate(environments):
+            expected, _ = environment.reset(seed=None if episode_seeds is None else episode_seeds[lane])
+            if not np.array_equal(expected, observations[lane]):
+                raise AssertionError(f"Reset mismatch in lane {lane}, episode {episode_index}")
+
+        active = np.ones(num_envs, dtype=bool)
+        while active.any():
+            balancing_actions = (observations[:, 2] + observations[:, 3] > 0).astype(int)
+            flips = action_generator.random(num_envs) < random_action_rate
+            actions = np.where(flips, 1 - balancing_actions, balancing_actions)
+            observations, rewards, terminated, truncated = vector_cartpole.step(actions, mask=active)
+            for lane in np.flatnonzero(active):
+                expected, reward, term, trunc, _ = environments[lane].step(int(actions[lane]))
+                if (not np.array_equal(expected, observations[lane]) or reward != rewards[lane]
+                        or term != terminated[lane] or trunc != truncated[lane]):
+                    raise AssertionError(f"Step mismatch in lane {lane}, episode {episode_index}")
+                compared_steps += 1
+            active &= ~(terminated | truncated)
+
+    for environment in environments:
+        environment.close()
+    return compared_steps
+
+
+# -------------------------
+# Main Entry Point
+# -------------------------
+if __name__ == "__main__":
+    steps = validate_against_gymnasium()
+    print(f"VectorCartPole matches gymnasium CartPole-v1 on {steps} steps")
@@ -0,0 +1,137 @@
+import os
+import csv
+import time
+from itertools import product
+
+import numpy as np
+
+from ca_config import (
+    BITS_PER_VALUE, ROW_LENGTH, NEIGHBORHOOD_RADIUS, NUMBER_OF_CA_TICKS, ACTION_DECODING,
+    NUMBER_OF_EPISODES, EXHAUSTIVE_MAX_RULES, EXHAUSTIVE_PROBE_SAMPLES, EXHAUSTIVE_PROBE_EXACT_BITS,
+    EXHAUSTIVE_SEED, EXHAUSTIVE_EVALUATION_BACKEND
+)
+from utils.ca.decode_action_from_row import decode_actions_from_rows
+from utils.ca.encode_into_row import encode_into_row
+from utils.ca.encode_observations import encode_observations
+from utils.ca.step_eca_vectorized import step_eca_vectorized
+from .functions.evaluation_backend import create_evaluation_executor, evaluate_population
+
+# DIRECTORY FOR RANKED RULE TABLES
+EXHAUSTIVE_DIRECTORY = os.path.join("results", "exhaustive")
+
+# THIS FUNCTION TELLS WHETHER THE FULL RULE SPACE FOR A RADIUS IS SMALL ENOUGH TO ENUMERATE
+def exhaustive_search_available(neighborhood_radius=NEIGHBORHOOD_RADIUS, max_rules=EXHAUSTIVE_MAX_RULES):
+    rule_size = 2 ** (2 * neighborhood_radius + 1)
+    return 2 ** rule_size <= max_rules
+
+# THIS FUNCTION EXPANDS A RULE NUMBER INTO ITS RULE BIT LIST, BIT p IS THE NEXT STATE FOR PATTERN p
+def rule_from_index(rule_index, rule_size):
+    return [(rule_index >> pattern) & 1 for pattern in range(rule_size)]
+
+# THIS FUNCTION RETURNS THE PATH OF THE RANKED TABLE FOR THE CURRENT CA AND EVALUATION CONFIG
+def rule_table_path(number_of_episodes=NUMBER_OF_EPISODES, seed=EXHAUSTIVE_SEED):
+    fingerprint = (
+        f"b{BITS_PER_VALUE}_l{ROW_LENGTH}_r{NEIGHBORHOOD_RADIUS}_t{NUMBER_OF_CA_TICKS}_"
+        f"{ACTION_DECODING}_e{number_of_episodes}_s{seed}"
+    )
+    return os.path.join(EXHAUSTIVE_DIRECTORY, f"rule_table_{fingerprint}.csv")
+
+# THIS FUNCTION BUILDS THE CA ROWS USED TO TELL RULES APART
+# EVERY DISCRETE OBSERVATION IS USED WHEN THERE ARE FEW ENOUGH OF THEM, OTHERWISE A SEEDED SAMPLE
+# MIXING THE WHOLE OBSERVATION BOX WITH THE NEAR-UPRIGHT REGION THE CONTROLLER ACTUALLY VISITS
+def build_probe_rows(probe_samples=EXHAUSTIVE_PROBE_SAMPLES, exact_bits=EXHAUSTIVE_PROBE_EXACT_BITS, seed=EXHAUSTIVE_SEED):
+    if 4 * BITS_PER_VALUE <= exact_bits:
+        discrete_observations = np.array(list(product(range(1 << BITS_PER_VALUE), repeat=4)))
+        probe_rows = encode_into_row(discrete_observations, row_length=ROW_LENGTH, bits_per_variable=BITS_PER_VALUE)
+        is_exact = True
+    else:
+        generator = np.random.default_rng(seed)
+        observation_bounds = np.array([2.4, 3.0, 0.20944, 5.0])
+        wide_observations = generator.uniform(-1.0, 1.0, size=(probe_samples // 2, 4)) * observation_bounds
+        narrow_observations = generator.normal(0.0, 0.1, size=(probe_samples - probe_samples // 2, 4)) * observation_bounds
+        observations = np.concatenate((wide_observations, narrow_observations))
+        probe_rows = encode_observations(observations)
+        is_exact = False
+    return probe_rows.astype(np.uint8), is_exact
+
+# THIS FUNCTION GROUPS RULES THAT DECODE TO THE SAME ACTION ON EVERY PROBE ROW
+# rules: LIST OF RULE BIT LISTS
+# RETURNS A LIST OF GROUPS, EACH A LIST OF POSITIONS IN rules, IN ORDER OF FIRST APPEARANCE
+def group_equivalent_rules(rules, probe_rows):
+    groups = {}
+    for rule_position, rule in enumerate(rules):
+        ca_rows = probe_rows
+        for tick_index in range(NUMBER_OF_CA_TICKS):
+            ca_rows = step_eca_vectorized(ca_rows, rule, NEIGHBORHOOD_RADIUS)
+        signature = np.packbits(decode_actions_from_rows(ca_rows).astype(np.uint8)).tobytes()
+        groups.setdefault(signature, []).append(rule_position)
+    return list(groups.values())
+
+# THIS FUNCTION EVALUATES EVERY RULE OF THE RULE SPACE AND WRITES A RANKED TABLE
+# ONE REPRESENTATIVE PER EQUIVALENCE GROUP IS EVALUATED, ALL ON THE SAME SEEDED EPISODES
+def exhaustive_search(
+    neighborhood_radius=NEIGHBORHOOD_RADIUS,
+    number_of_episodes=NUMBER_OF_EPISODES,
+    seed=EXHAUSTIVE_SEED,
+    evaluation_backend=EXHAUSTIVE_EVALUATION_BACKEND,
+):
+    if not exhaustive_search_available(neighborhood_radius):
+        raise ValueError(f"Rule space for NEIGHBORHOOD_RADIUS = {neighborhood_radius} is too large to enumerate")
+    start_time = time.perf_counter()
+    rule_size = 2 ** (2 * neighborhood_radius + 1)
+    rules = [rule_from_index(rule_index, rule_size) for rule_index in range(2 ** rule_size)]
+
+    # DEDUPE RULES THAT ARE EQUIVALENT UNDER THE DECODING SCHEME
+    probe_rows, is_exact = build_probe_rows(seed=seed)
+    groups = group_equivalent_rules(rules, probe_rows)
+    representatives = [rules[group[0]] for group in groups]
+    print(
+        f"Evaluating {len(representatives)} of {len(rules)} rules "
+        f"({'exact' if is_exact else 'sampled'} equivalence on {len(probe_rows)} probe rows)..."
+    )
+
+    # EVALUATE ONE REPRESENTATIVE PER GROUP IN PARALLEL
+    episode_seeds = np.random.default_rng(seed).integers(0, 2 ** 32, size=number_of_episodes).tolist()
+    with create_evaluation_executor(evaluation_backend) as executor:
+        fitness_scores = evaluate_population(representatives, episode_seeds, executor, evaluation_backend)
+
+    # WRITE TABLE RANKED BY FITNESS, BEST FIRST
+    ranking = sorted(zip(groups, fitness_scores), key=lambda entry: (-entry[1], entry[0][0]))
+    table_path = rule_table_path(number_of_episodes, seed)
+    os.makedirs(EXHAUSTIVE_DIRECTORY, exist_ok=True)
+    with open(table_path, mode='w', newline='') as table_file:
+        csv_writer = csv.writer(table_file)
+        csv_writer.writerow(["rank", "rule_index", "rule", "fitness", "equivalent_rules", "exact_equivalence"])
+        for rank, (group, fitness) in enumerate(ranking):
+            csv_writer.writerow([
+                rank,
+                group[0],
+                str(rules[group[0]]),
+                f"{fitness:.2f}",
+                ";".join(str(rule_index) for rule_index in group),
+                is_exact
+            ])
+
+    time_ms = (time.perf_counter() - start_time) * 1000
+    print(f"Best rule {rules[ranking[0][0][0]]} · Fitness {ranking[0][1]:.1f} · {time_ms:.0f} ms")
+    print(f"Ranked rule table saved to {table_path}")
+    return rules[ranking[0][0][0]]
+
+# THIS FUNCTION READS THE BEST RULE FROM A RANKED TABLE
+def load_best_rule(table_path):
+    with open(table_path, newline='') as table_file:
+        best_row = next(csv.DictReader(table_file))
+    rule_size = 2 ** (2 * NEIGHBORHOOD_RADIUS + 1)
+    return rule_from_index(int(best_row["rule_index"]), rule_size)
+
+# THIS FUNCTION RETURNS THE BEST RULE FROM THE CACHED TABLE FOR THIS CONFIG, RUNNING THE SWEEP ONLY IF NEEDED
+def best_exhaustive_rule():
+    table_path = rule_table_path()
+    if os.path.isfile(table_path):
+        print(f"Using ranked rule table {table_path}")
+        return load_best_rule(table_path)
+    return exhaustive_search()
+
+
+if __name__ == "__main__":
+    exhaustive_search()
@@ -0,0 +1,49 @@
+import numpy as np
+
+from ca_config import NUMBER_OF_EPISODES, MAXIMUM_STEPS_PER_EPISODE
+from utils.ca.ca_params import resolve_ca_params
+from utils.ca.decode_action_from_row import decode_actions_from_rows
+from utils.ca.encode_observations import encode_observations
+from utils.ca.step_eca_vectorized import step_eca_vectorized
+from utils.ca.generate_rule import generate_rule
+from utils.cartpole.cartpole import VectorCartPole
+
+# THIS FUNCTION EVALUATES THE AVERAGE REWARD OF EVERY CA RULE IN A POPULATION AT ONCE
+# population: LIST OF RULE BIT LISTS, ONE PER INDIVIDUAL
+# episode_seeds: OPTIONAL LIST OF RESET SEEDS, ONE PER EPISODE, SHARED BY ALL INDIVIDUALS
+# ca_params: OPTIONAL CA PARAMETER OVERRIDES (SEE resolve_ca_params), None USES ca_config
+# EACH INDIVIDUAL DRIVES ITS OWN CART OF ONE VectorCartPole, AND ALL CA ROWS ARE STEPPED AND DECODED AS ONE 2D ARRAY
+def evaluate_population_batched(population, episode_seeds=None, ca_params=None):
+    ca_params = resolve_ca_params(ca_params)
+    if episode_seeds is None:
+        episode_seeds = [None] * NUMBER_OF_EPISODES
+    population_size = len(population)
+    rule_tables = np.array([generate_rule(rule) for rule in population], dtype=np.uint8)
+    cartpoles = VectorCartPole(population_size)
+    sum_of_rewards = np.zeros(population_size)
+
+    for episode_seed in episode_seeds:
+        observations = cartpoles.reset(seeds=[episode_seed] * population_size)
+        active = np.ones(population_size, dtype=bool)
+        step_count = 0
+
+        while active.any() and step_count < MAXIMUM_STEPS_PER_EPISODE:
+            # ONLY INDIVIDUALS WHOSE EPISODE IS STILL RUNNING TAKE PART IN THIS STEP
+            active_indices = np.flatnonzero(active)
+            ca_rows = encode_observations(
+                observations[active_indices], ca_params["row_length"], ca_params["bits_per_value"]
+            )
+            active_rule_tables = rule_tables[active_indices]
+            for tick_index in range(ca_params["number_of_ca_ticks"]):
+                ca_rows = step_eca_vectorized(ca_rows, active_rule_tables, ca_params["neighborhood_radius"])
+            action_values = np.zeros(population_size, dtype=int)
+            action_values[active_indices] = decode_actions_from_rows(ca_rows, ca_params["action_decoding"])
+
+            # ADVANCE EVERY RUNNING CART IN ONE CALL
+            observations, rewards_received, terminated, truncated = cartpoles.step(action_values, mask=active)
+            sum_of_rewards += rewards_received
+            active &= ~(terminated | truncated)
+            step_count += 1
+
+    average_rewards = sum_of_rewards / len(episode_seeds)
+    return average_rewards.tolist()
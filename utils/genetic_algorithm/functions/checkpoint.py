@@ -0,0 +1,20 @@
+import os
+import pickle
+
+# THIS FUNCTION WRITES A RUN CHECKPOINT ATOMICALLY, SO AN INTERRUPTION NEVER LEAVES A HALF-WRITTEN FILE
+# state: PICKLABLE DICT (POPULATION, FITNESS, RNG STATES, NEXT GENERATION NUMBER, ...)
+def save_checkpoint(checkpoint_path, state):
+    directory = os.path.dirname(checkpoint_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = checkpoint_path + ".tmp"
+    with open(temporary_path, "wb") as checkpoint_file:
+        pickle.dump(state, checkpoint_file)
+    os.replace(temporary_path, checkpoint_path)
+
+# THIS FUNCTION READS A RUN CHECKPOINT, RETURNS None WHEN THERE IS NONE
+def load_checkpoint(checkpoint_path):
+    if checkpoint_path is None or not os.path.isfile(checkpoint_path):
+        return None
+    with open(checkpoint_path, "rb") as checkpoint_file:
+        return pickle.load(checkpoint_file)
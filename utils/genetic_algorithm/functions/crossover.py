@@ -1,12 +1,37 @@
 import random
 
-def crossover(parent1_bits, parent2_bits):
+import numpy as np
+
+from ca_config import CROSSOVER_TYPE
+
+# crossover_type: 'one_point' (PREFIX OF parent1, SUFFIX OF parent2) OR 'uniform' (EACH BIT FROM EITHER PARENT)
+def crossover(parent1_bits, parent2_bits, crossover_type=CROSSOVER_TYPE):
     rule_size = len(parent1_bits)
-    if rule_size == 1:
+    if crossover_type == "uniform":
+        child = [bit1 if random.random() < 0.5 else bit2 for bit1, bit2 in zip(parent1_bits, parent2_bits)]
+    elif crossover_type != "one_point":
+        raise ValueError(f"Unknown CROSSOVER_TYPE = {crossover_type!r}")
+    elif rule_size == 1:
         child = parent1_bits[:]
     else:
         crossover_point = random.randint(1, rule_size - 1)
         left = parent1_bits[:crossover_point]
         right = parent2_bits[crossover_point:]
         child = left + right
-    return child
\ No newline at end of file
+    return child
+
+# THIS FUNCTION CROSSES EVERY ROW OF parents_one WITH THE SAME ROW OF parents_two IN ONE MASKED SELECT
+# parents_one, parents_two: uint8 ARRAYS OF SHAPE (number_of_children, rule_size)
+# generator: NUMPY Generator USED FOR EVERY RANDOM DRAW
+def crossover_matrix(parents_one, parents_two, generator, crossover_type=CROSSOVER_TYPE):
+    number_of_children, rule_size = parents_one.shape
+    if crossover_type == "uniform":
+        take_first = generator.random((number_of_children, rule_size)) < 0.5
+    elif crossover_type == "one_point":
+        if rule_size == 1:
+            return parents_one.copy()
+        crossover_points = generator.integers(1, rule_size, size=number_of_children)
+        take_first = np.arange(rule_size) < crossover_points[:, None]
+    else:
+        raise ValueError(f"Unknown CROSSOVER_TYPE = {crossover_type!r}")
+    return np.where(take_first, parents_one, parents_two)
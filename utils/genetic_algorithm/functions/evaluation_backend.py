@@ -0,0 +1,95 @@
+import os
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
+from ca_config import EVALUATION_BACKEND, EVALUATION_WORKERS, EVALUATION_CHUNK_SIZE
+from .fitness_function import evaluate_rule
+from .batch_fitness_function import evaluate_population_batched
+from .fitness_cache import fitness_cache_key
+from utils.ca.ca_params import resolve_ca_params
+
+# THIS FUNCTION RESOLVES THE CONFIGURED WORKER COUNT (None MEANS ONE WORKER PER CPU)
+def resolve_worker_count(workers=EVALUATION_WORKERS):
+    if workers is None:
+        return os.cpu_count() or 1
+    return workers
+
+# THIS FUNCTION CREATES THE WORKER POOL FOR A BACKEND, TO BE KEPT OPEN FOR THE WHOLE GA RUN
+# evaluation_backend: 'serial', 'batched', 'thread' OR 'process'
+# workers: NUMBER OF WORKERS (DEFAULT: ONE PER CPU)
+# RETURNS A CONTEXT MANAGER THAT YIELDS THE EXECUTOR, OR None FOR THE IN-PROCESS BACKENDS
+def create_evaluation_executor(evaluation_backend=EVALUATION_BACKEND, workers=EVALUATION_WORKERS):
+    workers = resolve_worker_count(workers)
+    if evaluation_backend == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    if evaluation_backend == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if evaluation_backend in ("serial", "batched"):
+        return nullcontext()
+    raise ValueError(f"Unknown EVALUATION_BACKEND = {evaluation_backend!r}")
+
+# THIS FUNCTION SPLITS THE POPULATION INTO CONTIGUOUS CHUNKS, ONE TASK EACH
+# chunk_size: RULES PER TASK (DEFAULT: ONE CHUNK PER WORKER)
+def split_into_chunks(population, chunk_size, workers):
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(population) // workers))
+    return [population[start:start + chunk_size] for start in range(0, len(population), chunk_size)]
+
+# THIS FUNCTION RETURNS THE FITNESS OF EVERY RULE IN THE POPULATION, IN POPULATION ORDER
+# population: LIST OF RULE BIT LISTS
+# episode_seeds: OPTIONAL LIST OF RESET SEEDS, ONE PER EPISODE, SHARED BY ALL RULES
+# executor: EXECUTOR FROM create_evaluation_executor (REQUIRED FOR 'thread' AND 'process')
+# workers: WORKER COUNT OF THE EXECUTOR, USED TO SIZE CHUNKS WHEN chunk_size IS None
+# fitness_cache: OPTIONAL FitnessCache, ONLY RULES NOT IN IT ARE EVALUATED (DUPLICATES ONLY ONCE)
+# ca_params: OPTIONAL CA PARAMETER OVERRIDES (SEE resolve_ca_params), None USES ca_config
+# WORKERS EVALUATE WHOLE CHUNKS WITH THE BATCHED EVALUATOR. EVERY RULE'S FITNESS ONLY DEPENDS ON
+# THE RULE AND episode_seeds, SO SEEDED RESULTS ARE THE SAME FOR ANY WORKER COUNT OR CHUNK SIZE
+def evaluate_population(
+    population,
+    episode_seeds=None,
+    executor=None,
+    evaluation_backend=EVALUATION_BACKEND,
+    workers=EVALUATION_WORKERS,
+    chunk_size=EVALUATION_CHUNK_SIZE,
+    fitness_cache=None,
+    ca_params=None,
+):
+    ca_params = resolve_ca_params(ca_params)
+    keys = [fitness_cache_key(rule, episode_seeds, ca_params) for rule in population]
+    if fitness_cache is None or None in keys:
+        return evaluate_uncached(population, episode_seeds, executor, evaluation_backend, workers, chunk_size, ca_params)
+
+    # LOOK EVERY RULE UP, COLLECTING EACH DISTINCT MISSING RULE ONCE
+    fitness_scores = [fitness_cache.get(key) for key in keys]
+    missing_rules = {}
+    for rule, key, fitness in zip(population, keys, fitness_scores):
+        if fitness is None and key not in missing_rules:
+            missing_rules[key] = rule
+
+    missing_scores = evaluate_uncached(
+        list(missing_rules.values()), episode_seeds, executor, evaluation_backend, workers, chunk_size, ca_params
+    )
+    for key, fitness in zip(missing_rules, missing_scores):
+        fitness_cache.put(key, fitness)
+    fitness_cache.hits += len(population) - len(missing_rules)
+    fitness_cache.misses += len(missing_rules)
+
+    computed_scores = dict(zip(missing_rules, missing_scores))
+    return [computed_scores[key] if fitness is None else fitness for key, fitness in zip(keys, fitness_scores)]
+
+# THIS FUNCTION RUNS THE SELECTED BACKEND ON EVERY RULE, WITHOUT LOOKING AT ANY CACHE
+def evaluate_uncached(population, episode_seeds, executor, evaluation_backend, workers, chunk_size, ca_params=None):
+    if not population:
+        return []
+    if evaluation_backend == "serial":
+        return [evaluate_rule(rule, episode_seeds, ca_params=ca_params) for rule in population]
+    if evaluation_backend == "batched":
+        return evaluate_population_batched(population, episode_seeds, ca_params)
+    if evaluation_backend in ("thread", "process"):
+        chunks = split_into_chunks(list(population), chunk_size, resolve_worker_count(workers))
+        fitness_scores = []
+        for chunk_scores in executor.map(evaluate_population_batched, chunks, repeat(episode_seeds), repeat(ca_params)):
+            fitness_scores.extend(chunk_scores)
+        return fitness_scores
+    raise ValueError(f"Unknown EVALUATION_BACKEND = {evaluation_backend!r}")
@@ -0,0 +1,84 @@
+import os
+import pickle
+from collections import OrderedDict
+
+from ca_config import MAXIMUM_STEPS_PER_EPISODE, FITNESS_CACHE_SIZE, FITNESS_CACHE_PATH
+from utils.ca.ca_params import CA_PARAM_NAMES, resolve_ca_params
+
+# THIS FUNCTION BUILDS THE CACHE KEY FOR ONE RULE UNDER THE CURRENT EVALUATION CONFIG
+# rule: RULE BIT LIST
+# episode_seeds: LIST OF RESET SEEDS, ONE PER EPISODE
+# ca_params: OPTIONAL CA PARAMETER OVERRIDES (SEE resolve_ca_params), None USES ca_config
+# RETURNS None WHEN ANY EPISODE IS UNSEEDED, SINCE SUCH A FITNESS IS A RANDOM SAMPLE AND NOT REPEATABLE
+# THE SEEDS ARE PART OF THE KEY, SO ENTRIES ONLY REPEAT ACROSS GENERATIONS WITH SEED_SCHEDULE = 'fixed'
+# (AND RACING'S ONE-EPISODE ENTRIES ONLY SERVE LATER ONE-EPISODE LOOKUPS, NOT FULL-BUDGET ONES)
+def fitness_cache_key(rule, episode_seeds, ca_params=None):
+    if episode_seeds is None or any(seed is None for seed in episode_seeds):
+        return None
+    ca_params = resolve_ca_params(ca_params)
+    return (
+        tuple(int(bit) for bit in rule),
+        *(ca_params[name] for name in CA_PARAM_NAMES),
+        MAXIMUM_STEPS_PER_EPISODE,
+        len(episode_seeds),
+        tuple(episode_seeds),
+    )
+
+
+class FitnessCache:
+    """
+    Two-tier fitness cache: a bounded in-memory LRU in front of an optional
+    pickle file that persists every entry across runs and sweeps.
+
+    Parameters:
+        max_size (int): Number of entries kept in the in-memory LRU tier
+        persistent_path (str or None): Pickle file for the on-disk tier, None keeps the cache in memory only
+    """
+
+    def __init__(self, max_size=FITNESS_CACHE_SIZE, persistent_path=FITNESS_CACHE_PATH):
+        self.max_size = max_size
+        self.persistent_path = persistent_path
+        self.memory_entries = OrderedDict()
+        self.persistent_entries = {}
+        self.hits = 0
+        self.misses = 0
+        if persistent_path is not None and os.path.isfile(persistent_path):
+            with open(persistent_path, "rb") as cache_file:
+                self.persistent_entries = pickle.load(cache_file)
+
+    def get(self, key):
+        """Returns the cached fitness for key, or None when it is not cached."""
+        if key in self.memory_entries:
+            self.memory_entries.move_to_end(key)
+            return self.memory_entries[key]
+        if key in self.persistent_entries:
+            value = self.persistent_entries[key]
+            self._remember(key, value)                                              # Promote to the LRU tier
+            return value
+        return None
+
+    def put(self, key, value):
+        """Stores a fitness in both tiers."""
+        self._remember(key, value)
+        if self.persistent_path is not None:
+            self.persistent_entries[key] = value
+
+    def save(self):
+        """Writes the on-disk tier, if one is configured."""
+        if self.persistent_path is None:
+            return
+        directory = os.path.dirname(self.persistent_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = self.persistent_path + ".tmp"
+        with open(temporary_path, "wb") as cache_file:
+            pickle.dump(self.persistent_entries, cache_file)
+        os.replace(temporary_path, self.persistent_path)                          # Never leave a half-written cache
+
+    def _remember(self, key, value):
+        if self.max_size <= 0:
+            return
+        self.memory_entries[key] = value
+        self.memory_entries.move_to_end(key)
+        while len(self.memory_entries) > self.max_size:
+            self.memory_entries.popitem(last=False)
@@ -1,30 +1,36 @@
 import gymnasium as gym
 
-from ca_config import BITS_PER_VALUE, ROW_LENGTH, NEIGHBORHOOD_RADIUS, NEIGHBORHOOD_SIZE, NUMBER_OF_CA_TICKS, \
-    NUMBER_OF_EPISODES, MAXIMUM_STEPS_PER_EPISODE
+from ca_config import NUMBER_OF_EPISODES, MAXIMUM_STEPS_PER_EPISODE
+from utils.ca.ca_params import resolve_ca_params
 from utils.ca.decode_action_from_row import decode_action_from_row
-from utils.ca.discretize_observation import discretize_observation
-from utils.ca.encode_into_row import encode_into_row
-from utils.ca.step_eca import step_eca
+from utils.ca.encode_observations import encode_observations
+from utils.ca.packed_row import compile_row_rule, step_row_ticks
 from utils.ca.generate_rule import generate_rule
 
 # THIS FUNCTION EVALUATES THE AVERAGE REWARD OF A CA RULE FOR CARTPOLE CONTROL
-def evaluate_rule(rule_number, env_name="CartPole-v1"):
+# rule_number: RULE BIT LIST
+# episode_seeds: OPTIONAL LIST OF RESET SEEDS, ONE PER EPISODE (DEFAULT: NUMBER_OF_EPISODES UNSEEDED EPISODES)
+# ca_params: OPTIONAL CA PARAMETER OVERRIDES (SEE resolve_ca_params), None USES ca_config
+def evaluate_rule(rule_number, episode_seeds=None, env_name="CartPole-v1", ca_params=None):
+    ca_params = resolve_ca_params(ca_params)
+    row_length = ca_params["row_length"]
+    neighborhood_radius = ca_params["neighborhood_radius"]
+    if episode_seeds is None:
+        episode_seeds = [None] * NUMBER_OF_EPISODES
     environment = gym.make(env_name)
     sum_of_rewards = 0.0
     rule_table = generate_rule(rule_number)
+    packed_rule = compile_row_rule(rule_table, neighborhood_radius)
 
-    for episode_index in range(NUMBER_OF_EPISODES):
-        observation, info = environment.reset()
+    for episode_seed in episode_seeds:
+        observation, info = environment.reset(seed=episode_seed)
         episode_done = False
         step_count = 0
 
         while not episode_done and step_count < MAXIMUM_STEPS_PER_EPISODE:
-            discrete_observation = discretize_observation(observation, bits=BITS_PER_VALUE)
-            ca_row = encode_into_row(discrete_observation, row_length=ROW_LENGTH, bits_per_variable=BITS_PER_VALUE)
-            for tick_index in range(NUMBER_OF_CA_TICKS):
-                ca_row = step_eca(ca_row, rule_table, NEIGHBORHOOD_RADIUS)
-            action_value = decode_action_from_row(ca_row)
+            ca_row = encode_observations(observation, row_length, ca_params["bits_per_value"])
+            ca_row = step_row_ticks(ca_row, rule_table, packed_rule, neighborhood_radius, ca_params["number_of_ca_ticks"])
+            action_value = decode_action_from_row(ca_row, ca_params["action_decoding"])
             next_observation, reward_received, terminated, truncated, info = environment.step(action_value)
             episode_done = terminated or truncated
             sum_of_rewards += reward_received
@@ -32,5 +38,5 @@ def evaluate_rule(rule_number, env_name="CartPole-v1"):
             step_count += 1
 
     environment.close()
-    average_reward = sum_of_rewards / NUMBER_OF_EPISODES
+    average_reward = sum_of_rewards / len(episode_seeds)
     return average_reward
@@ -1,5 +1,7 @@
 import random
 
+import numpy as np
+
 def initialize_population(population_size, rule_size):
     population = []
     for _ in range(population_size):
@@ -8,4 +10,9 @@ def initialize_population(population_size, rule_size):
             bit = random.randint(0, 1)
             rule.append(bit)
         population.append(rule)
-    return population
\ No newline at end of file
+    return population
+
+# THIS FUNCTION INITIALIZES AN ARRAY-BACKED POPULATION, ONE uint8 RULE PER ROW
+# generator: NUMPY Generator USED FOR EVERY RANDOM DRAW
+def initialize_population_matrix(population_size, rule_size, generator):
+    return generator.integers(0, 2, size=(population_size, rule_size), dtype=np.uint8)
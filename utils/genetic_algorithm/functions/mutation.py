@@ -8,4 +8,10 @@ def mutate(rule_bits, mutation_rate):
         else:
             new_bit = bit
         mutated.append(new_bit)
-    return mutated
\ No newline at end of file
+    return mutated
+
+# THIS FUNCTION FLIPS EVERY BIT OF A uint8 POPULATION MATRIX WITH PROBABILITY mutation_rate
+# generator: NUMPY Generator USED FOR EVERY RANDOM DRAW
+def mutate_matrix(population, mutation_rate, generator):
+    flips = generator.random(population.shape) < mutation_rate
+    return population ^ flips.view(population.dtype)
@@ -0,0 +1,81 @@
+import math
+
+import numpy as np
+
+from ca_config import EVALUATION_BACKEND, EVALUATION_WORKERS, EVALUATION_CHUNK_SIZE, \
+    RACING_INITIAL_EPISODES, RACING_CONFIDENCE_Z, RACING_MINIMUM_STD
+from .evaluation_backend import evaluate_population
+
+# THIS FUNCTION RETURNS THE CUMULATIVE EPISODE COUNTS AFTER WHICH CANDIDATES ARE RACED
+# THE BUDGET DOUBLES EVERY ROUND, E.G. 2, 4, 8, 10 FOR 10 EPISODES
+def racing_schedule(number_of_episodes, initial_episodes=RACING_INITIAL_EPISODES):
+    schedule = []
+    played = min(max(initial_episodes, 2), number_of_episodes)
+    while played < number_of_episodes:
+        schedule.append(played)
+        played *= 2
+    schedule.append(number_of_episodes)
+    return schedule
+
+# THIS FUNCTION EVALUATES A POPULATION BY SUCCESSIVE HALVING / RACING
+# EVERY INDIVIDUAL PLAYS THE FIRST FEW EPISODES, AFTER EACH ROUND AN INDIVIDUAL IS DROPPED WHEN THE UPPER
+# CONFIDENCE BOUND OF ITS MEAN IS BELOW THE survivor_count-TH BEST LOWER BOUND, I.E. WHEN IT CAN NO LONGER
+# REACH THE SELECTION CUTOFF. THE REST PLAY THE NEXT BLOCK OF episode_seeds, UP TO THE FULL BUDGET
+# population: LIST OF RULE BIT LISTS
+# episode_seeds: LIST OF RESET SEEDS, ONE PER EPISODE, SHARED BY ALL RULES (None ENTRIES ARE UNSEEDED)
+# survivor_count: NUMBER OF INDIVIDUALS THAT MUST BE RANKED ON THE FULL BUDGET (ELITES / LIKELY TOURNAMENT WINNERS)
+# ca_params: OPTIONAL CA PARAMETER OVERRIDES (SEE resolve_ca_params), None USES ca_config
+# RETURNS (fitness_scores, saved_episodes, saved_steps), DROPPED INDIVIDUALS KEEP THEIR PARTIAL MEAN
+# saved_steps IS ESTIMATED FROM THE PARTIAL MEAN, SINCE CARTPOLE PAYS ONE REWARD PER STEP
+def race_population(
+    population,
+    episode_seeds,
+    survivor_count,
+    executor=None,
+    evaluation_backend=EVALUATION_BACKEND,
+    workers=EVALUATION_WORKERS,
+    chunk_size=EVALUATION_CHUNK_SIZE,
+    fitness_cache=None,
+    initial_episodes=RACING_INITIAL_EPISODES,
+    confidence_z=RACING_CONFIDENCE_Z,
+    minimum_std=RACING_MINIMUM_STD,
+    ca_params=None,
+):
+    population_size = len(population)
+    number_of_episodes = len(episode_seeds)
+    survivor_count = min(max(survivor_count, 1), population_size)
+    sum_of_rewards = np.zeros(population_size)
+    sum_of_squares = np.zeros(population_size)
+    episodes_played = np.zeros(population_size, dtype=int)
+    racing = np.ones(population_size, dtype=bool)
+    played = 0
+
+    for round_end in racing_schedule(number_of_episodes, initial_episodes):
+        # PLAY THE NEXT BLOCK OF EPISODES, ONE SEED AT A TIME SO EVERY EPISODE REWARD IS KNOWN (AND CACHED)
+        racing_indices = np.flatnonzero(racing)
+        racing_rules = [population[index] for index in racing_indices]
+        for episode_index in range(played, round_end):
+            episode_rewards = np.asarray(evaluate_population(
+                racing_rules, [episode_seeds[episode_index]], executor, evaluation_backend,
+                workers, chunk_size, fitness_cache, ca_params
+            ))
+            sum_of_rewards[racing_indices] += episode_rewards
+            sum_of_squares[racing_indices] += episode_rewards ** 2
+            episodes_played[racing_indices] += 1
+        played = round_end
+        if played == number_of_episodes:
+            break
+
+        # CONFIDENCE INTERVAL OF EVERY MEAN, WITH A FLOOR ON THE SPREAD SO TWO EQUAL EPISODES ARE NOT TAKEN AS CERTAIN
+        means = sum_of_rewards / episodes_played
+        variances = (sum_of_squares - episodes_played * means ** 2) / (episodes_played - 1)
+        standard_deviations = np.maximum(np.sqrt(np.maximum(variances, 0.0)), minimum_std)
+        half_widths = confidence_z * standard_deviations / np.sqrt(episodes_played)
+        cutoff = np.sort(means - half_widths)[-survivor_count]
+        racing &= means + half_widths >= cutoff
+
+    fitness_scores = sum_of_rewards / episodes_played
+    remaining_episodes = number_of_episodes - episodes_played
+    saved_episodes = int(remaining_episodes.sum())
+    saved_steps = int(math.fsum(fitness_scores * remaining_episodes))
+    return fitness_scores.tolist(), saved_episodes, saved_steps
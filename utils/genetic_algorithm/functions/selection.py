@@ -1,5 +1,7 @@
 import random
 
+import numpy as np
+
 from ca_config import TOURNAMENT_SIZE
 
 
@@ -19,8 +21,8 @@ def select_elites(population, fitness_values, elite_fraction):
 # THIS FUNCTION SELECTS ONE INDIVIDUAL FROM THE POPULATION USING TOURNAMENT SELECTION
 # population: LIST OF RULE INDICES
 # fitness_values: LIST OF FITNESS VALUES
-# tournament_size: NUMBER OF INDIVIDUALS IN THE TOURNAMENT (DEFAULT 3)
-def tournament_selection(population, fitness_values, tournament_size):
+# tournament_size: NUMBER OF INDIVIDUALS IN THE TOURNAMENT (DEFAULT FROM CONFIG)
+def tournament_selection(population, fitness_values, tournament_size=TOURNAMENT_SIZE):
     combined = list(zip(population, fitness_values))
     competitors = random.sample(combined, tournament_size)
     winner = competitors[0]
@@ -28,4 +30,21 @@ def tournament_selection(population, fitness_values, tournament_size):
         if candidate[1] > winner[1]:
             winner = candidate
     selected_rule = winner[0]
-    return selected_rule
\ No newline at end of file
+    return selected_rule
+
+# THIS FUNCTION RETURNS THE INDICES OF THE TOP FRACTION OF INDIVIDUALS, BEST FIRST
+# fitness_values: NUMPY ARRAY OF FITNESS VALUES FOR THE POPULATION
+# USES argpartition, SO ONLY THE ELITES ARE SORTED
+def select_elite_indices(fitness_values, elite_fraction):
+    n_elites = max(int(len(fitness_values) * elite_fraction), 1)
+    elite_indices = np.argpartition(-fitness_values, n_elites - 1)[:n_elites]
+    return elite_indices[np.argsort(-fitness_values[elite_indices], kind="stable")]
+
+# THIS FUNCTION RUNS number_of_tournaments TOURNAMENTS AT ONCE AND RETURNS THE WINNER INDICES
+# fitness_values: NUMPY ARRAY OF FITNESS VALUES FOR THE POPULATION
+# generator: NUMPY Generator USED FOR EVERY RANDOM DRAW
+# COMPETITORS ARE DRAWN WITH REPLACEMENT, WHICH ONLY DIFFERS FROM random.sample WHEN tournament_size IS CLOSE TO THE POPULATION SIZE
+def tournament_selection_indices(fitness_values, number_of_tournaments, tournament_size, generator):
+    competitors = generator.integers(0, len(fitness_values), size=(number_of_tournaments, tournament_size))
+    winners = fitness_values[competitors].argmax(axis=1)
+    return competitors[np.arange(number_of_tournaments), winners]
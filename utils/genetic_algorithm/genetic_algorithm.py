@@ -1,15 +1,172 @@
 import os
 import csv
 import time
+import uuid
+import random
+
+import numpy as np
+
 from ca_config import (
-    POPULATION_SIZE, NUMBER_OF_GENERATIONS, ELITE_PERCENTAGE, MUTATION_RATE,
-    NEIGHBORHOOD_RADIUS
+    POPULATION_SIZE, NUMBER_OF_GENERATIONS, ELITE_PERCENTAGE, TOURNAMENT_SIZE, MUTATION_RATE, POPULATION_BACKEND, CROSSOVER_TYPE,
+    NEIGHBORHOOD_RADIUS, NUMBER_OF_EPISODES, MAXIMUM_STEPS_PER_EPISODE, EVALUATION_BACKEND, FITNESS_CACHE_SIZE, FITNESS_CACHE_PATH,
+    RACING_ENABLED, RACING_SURVIVOR_FRACTION, RUN_SEED, SEED_SCHEDULE,
+    GA_CHECKPOINT_PATH, GA_CHECKPOINT_INTERVAL, GA_RESUME
 )
-from .functions.initialization import initialize_population
-from .functions.fitness_function import evaluate_rule
-from .functions.selection import select_elites, tournament_selection
-from .functions.crossover import crossover
-from .functions.mutation import mutate
+from utils.ca.ca_params import resolve_ca_params
+from .functions.initialization import initialize_population, initialize_population_matrix
+from .functions.evaluation_backend import create_evaluation_executor, evaluate_population
+from .functions.fitness_cache import FitnessCache
+from .functions.checkpoint import save_checkpoint, load_checkpoint
+from .functions.racing import race_population
+from .functions.selection import select_elites, tournament_selection, select_elite_indices, tournament_selection_indices
+from .functions.crossover import crossover, crossover_matrix
+from .functions.mutation import mutate, mutate_matrix
+
+# COLUMNS OF THE GA LOG, ONE ROW PER GENERATION
+GA_LOG_FIELDS = [
+    "generation",
+    "best_rule",
+    "best_fitness",
+    "avg_fitness",
+    "worst_fitness",
+    "generation_time_ms",
+    "cache_hits",
+    "cache_misses",
+    "cache_hit_rate",
+    "saved_episodes",
+    "saved_steps"
+]
+
+# THIS FUNCTION RETURNS A NEW LOG PATH IN THE GA LOG DIRECTORY, E.G. results/ga_logs/ga_log_20250519_083521_1a2b3c4d.csv
+# THE RANDOM SUFFIX KEEPS RUNS STARTED IN THE SAME SECOND FROM SHARING ONE FILE
+def new_log_path(prefix="ga_log"):
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    return os.path.join("results", "ga_logs", f"{prefix}_{timestamp}_{uuid.uuid4().hex[:8]}.csv")
+
+# THIS FUNCTION DRAWS THE RESET SEEDS SHARED BY EVERY INDIVIDUAL OF ONE GENERATION
+# seed_schedule: 'per_generation' OR 'fixed' DRAW FROM random, 'none' RETURNS UNSEEDED EPISODES
+def draw_episode_seeds(number_of_episodes=NUMBER_OF_EPISODES, seed_schedule=SEED_SCHEDULE):
+    if seed_schedule == "none":
+        return [None] * number_of_episodes
+    if seed_schedule in ("per_generation", "fixed"):
+        return [random.randrange(2 ** 32) for _ in range(number_of_episodes)]
+    raise ValueError(f"Unknown SEED_SCHEDULE = {seed_schedule!r}")
+
+# THIS FUNCTION CREATES THE FIRST GENERATION
+# RETURNS (population, generator), generator IS THE NUMPY Generator OF THE MATRIX BACKEND (SEEDED BY random) OR None
+def create_initial_population(population_size, rule_size, population_backend=POPULATION_BACKEND):
+    if population_backend == "matrix":
+        generator = np.random.default_rng(random.randrange(2 ** 32))
+        return initialize_population_matrix(population_size, rule_size, generator), generator
+    if population_backend == "list":
+        return initialize_population(population_size, rule_size), None
+    raise ValueError(f"Unknown POPULATION_BACKEND = {population_backend!r}")
+
+# THIS FUNCTION EVALUATES ONE GENERATION, RACING IT WHEN racing_survivor_count IS SET
+# ca_params: OPTIONAL CA PARAMETER OVERRIDES (SEE resolve_ca_params), None USES ca_config
+# RETURNS (fitness_scores, statistics) WITH THE CACHE AND RACING COLUMNS OF THE GA LOG
+def evaluate_generation(
+    population, episode_seeds, executor, evaluation_backend, fitness_cache, racing_survivor_count=None, ca_params=None
+):
+    hits_before, misses_before = fitness_cache.hits, fitness_cache.misses
+    if racing_survivor_count is not None:
+        fitness_scores, saved_episodes, saved_steps = race_population(
+            population, episode_seeds, racing_survivor_count, executor, evaluation_backend,
+            fitness_cache=fitness_cache, ca_params=ca_params
+        )
+    else:
+        fitness_scores = evaluate_population(
+            population, episode_seeds, executor, evaluation_backend, fitness_cache=fitness_cache, ca_params=ca_params
+        )
+        saved_episodes, saved_steps = 0, 0
+    statistics = {
+        "cache_hits": fitness_cache.hits - hits_before,
+        "cache_misses": fitness_cache.misses - misses_before,
+        "saved_episodes": saved_episodes,
+        "saved_steps": saved_steps,
+    }
+    return fitness_scores, statistics
+
+# THIS FUNCTION RETURNS THE BEST RULE AND THE FITNESS COLUMNS OF THE GA LOG FOR ONE EVALUATED POPULATION
+def fitness_statistics(population, fitness_scores):
+    best_fitness = max(fitness_scores)
+    index_of_best = fitness_scores.index(best_fitness)
+    return {
+        "best_rule": list(map(int, population[index_of_best])),
+        "best_fitness": best_fitness,
+        "avg_fitness": sum(fitness_scores) / len(fitness_scores),
+        "worst_fitness": min(fitness_scores),
+    }
+
+# THIS FUNCTION RETURNS THE FRACTION OF CACHE LOOKUPS THAT HIT, 0 WHEN NOTHING WAS LOOKED UP
+def cache_hit_rate(hits, misses):
+    lookups = hits + misses
+    return hits / lookups if lookups else 0.0
+
+# THIS FUNCTION FORMATS ONE GA LOG ROW, extra_fields ARE WRITTEN AFTER THE GENERATION NUMBER
+def format_log_row(generation_number, statistics, extra_fields=()):
+    return [
+        generation_number,
+        *extra_fields,
+        str(statistics["best_rule"]),
+        f"{statistics['best_fitness']:.2f}",
+        f"{statistics['avg_fitness']:.2f}",
+        f"{statistics['worst_fitness']:.2f}",
+        f"{statistics['generation_time_ms']:.1f}",
+        statistics["cache_hits"],
+        statistics["cache_misses"],
+        f"{cache_hit_rate(statistics['cache_hits'], statistics['cache_misses']):.3f}",
+        statistics["saved_episodes"],
+        statistics["saved_steps"]
+    ]
+
+# THIS FUNCTION BUILDS THE NEXT GENERATION: ELITES FIRST, THEN MUTATED CROSSOVERS OF TOURNAMENT WINNERS
+# generator: NUMPY Generator OF THE MATRIX BACKEND, None FOR THE LIST BACKEND
+def breed_next_generation(
+    population,
+    fitness_scores,
+    elite_fraction=ELITE_PERCENTAGE,
+    mutation_rate=MUTATION_RATE,
+    crossover_type=CROSSOVER_TYPE,
+    generator=None,
+):
+    population_size = len(population)
+    if generator is not None:
+        # ALL OFFSPRING FROM ONE BATCH OF TOURNAMENTS, CROSSOVERS AND MUTATIONS
+        fitness_values = np.asarray(fitness_scores)
+        elites = population[select_elite_indices(fitness_values, elite_fraction)]
+        number_of_children = population_size - len(elites)
+        parent_indices = tournament_selection_indices(
+            fitness_values, 2 * number_of_children, TOURNAMENT_SIZE, generator
+        ).reshape(2, number_of_children)
+        children = crossover_matrix(population[parent_indices[0]], population[parent_indices[1]], generator, crossover_type)
+        return np.concatenate((elites, mutate_matrix(children, mutation_rate, generator)))
+
+    # SELECT ELITE INDIVIDUALS TO CARRY FORWARD
+    elites = select_elites(population, fitness_scores, elite_fraction)
+    # BUILD NEXT GENERATION POPULATION STARTING WITH ELITES
+    next_population = list(elites)
+    # FILL REMAINING POPULATION WITH OFFSPRING
+    while len(next_population) < population_size:
+        # SELECT TWO PARENTS USING TOURNAMENT SELECTION
+        parent_one = tournament_selection(population, fitness_scores, TOURNAMENT_SIZE)
+        parent_two = tournament_selection(population, fitness_scores, TOURNAMENT_SIZE)
+        # PRODUCE CHILD VIA CROSSOVER
+        child = crossover(parent_one, parent_two, crossover_type)
+        # MUTATE CHILD BASED ON MUTATION RATE
+        mutated_child = mutate(child, mutation_rate)
+        next_population.append(mutated_child)
+    return next_population
+
+# THIS FUNCTION EVALUATES THE FINAL POPULATION AND RETURNS (winner_rule, winner_fitness)
+def select_winner(population, episode_seeds, executor, evaluation_backend, fitness_cache, ca_params=None):
+    final_fitness_scores = evaluate_population(
+        population, episode_seeds, executor, evaluation_backend, fitness_cache=fitness_cache, ca_params=ca_params
+    )
+    # IDENTIFY WINNING RULE FROM FINAL POPULATION
+    best_final_fitness = max(final_fitness_scores)
+    index_of_best = final_fitness_scores.index(best_final_fitness)
+    return list(map(int, population[index_of_best])), best_final_fitness
 
 def genetic_algorithm(
     population_size=POPULATION_SIZE,
@@ -17,99 +174,147 @@ def genetic_algorithm(
     elite_fraction=ELITE_PERCENTAGE,
     mutation_rate=MUTATION_RATE,
     neighborhood_radius=NEIGHBORHOOD_RADIUS,
+    evaluation_backend=EVALUATION_BACKEND,
+    fitness_cache_size=FITNESS_CACHE_SIZE,
+    fitness_cache_path=FITNESS_CACHE_PATH,
+    racing_enabled=RACING_ENABLED,
+    racing_survivor_fraction=RACING_SURVIVOR_FRACTION,
+    run_seed=RUN_SEED,
+    seed_schedule=SEED_SCHEDULE,
+    population_backend=POPULATION_BACKEND,
+    crossover_type=CROSSOVER_TYPE,
+    checkpoint_path=GA_CHECKPOINT_PATH,
+    checkpoint_interval=GA_CHECKPOINT_INTERVAL,
+    resume=GA_RESUME,
+    ca_params=None,
+    log_path=None,
 ):
+    # CA PARAMETERS OF THIS RUN: ca_config, OVERRIDDEN BY neighborhood_radius AND THEN BY ca_params
+    ca_params = resolve_ca_params({"neighborhood_radius": neighborhood_radius, **(ca_params or {})})
+    neighborhood_radius = ca_params["neighborhood_radius"]
+
+    # SEED THE GA'S RANDOM MODULE SO POPULATION, OPERATORS AND EPISODE SEEDS ARE REPRODUCIBLE
+    if run_seed is not None:
+        random.seed(run_seed)
+
     # CALCULATE NEIGHBORHOOD SIZE AND CORRESPONDING RULE SIZE
     neighborhood_size = 2 * neighborhood_radius + 1
     rule_size = 2 ** neighborhood_size
 
-    # DIRECTORY FOR GA LOGS
-    log_directory = os.path.join("results", "ga_logs")
-    os.makedirs(log_directory, exist_ok=True)
-    # TIMESTAMPED LOG FILE PATH
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    log_path = os.path.join(log_directory, f"ga_log_{timestamp}.csv")
+    # LAST CHECKPOINT OF AN INTERRUPTED RUN, ONLY USED WHEN RESUMING A RUN OF THE SAME SHAPE AND EVALUATION CONFIG
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    run_shape = (population_size, rule_size, population_backend)
+    run_config = {
+        "ca_params": ca_params,
+        "number_of_episodes": NUMBER_OF_EPISODES,
+        "maximum_steps_per_episode": MAXIMUM_STEPS_PER_EPISODE,
+        "seed_schedule": seed_schedule,
+        "run_seed": run_seed,
+    }
+    if checkpoint is not None and checkpoint["run_shape"] != run_shape:
+        raise ValueError(f"Checkpoint {checkpoint_path} is for a run of shape {checkpoint['run_shape']}, not {run_shape}")
+    if checkpoint is not None and checkpoint.get("run_config") != run_config:
+        raise ValueError(
+            f"Checkpoint {checkpoint_path} is for a run with config {checkpoint.get('run_config')}, not {run_config}"
+        )
+
+    # A RESUMED RUN KEEPS APPENDING TO THE LOG STORED IN ITS CHECKPOINT, A NEW RUN STARTS A FRESH LOG
+    # (A NEW UNIQUE PATH IN THE GA LOG DIRECTORY UNLESS GIVEN)
+    if checkpoint is not None:
+        log_path = checkpoint["log_path"]
+    elif log_path is None:
+        log_path = new_log_path()
+    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+    is_new_log = checkpoint is None or not os.path.isfile(log_path)
+
+    # FITNESS CACHE SHARED BY ALL GENERATIONS (AND BY LATER RUNS WHEN A PERSISTENT PATH IS SET)
+    fitness_cache = FitnessCache(fitness_cache_size, fitness_cache_path)
 
-    # CSV LOG FILE FOR WRITING GENERATION STATISTICS
-    with open(log_path, mode='w', newline='') as log_file:
+    # NUMBER OF INDIVIDUALS RACING MUST RANK ON THE FULL EPISODE BUDGET: EVERY ELITE AND THE LIKELY TOURNAMENT WINNERS
+    survivor_count = None
+    if racing_enabled:
+        survivor_count = max(int(population_size * elite_fraction), int(population_size * racing_survivor_fraction), 1)
+
+    # CSV LOG FILE FOR WRITING GENERATION STATISTICS, WORKER POOL STAYS WARM ACROSS GENERATIONS
+    with open(log_path, mode='w' if is_new_log else 'a', newline='') as log_file, \
+            create_evaluation_executor(evaluation_backend) as executor:
         csv_writer = csv.writer(log_file)
         # WRITE HEADER ROW FOR CSV LOG
-        csv_writer.writerow([
-            "generation",
-            "best_rule",
-            "best_fitness",
-            "avg_fitness",
-            "worst_fitness",
-            "generation_time_ms"
-        ])
-
-        # INITIALIZE FIRST GENERATION POPULATION
-        population = initialize_population(population_size, rule_size)
+        if is_new_log:
+            csv_writer.writerow(GA_LOG_FIELDS)
+
+        if checkpoint is None:
+            # INITIALIZE FIRST GENERATION POPULATION
+            population, generator = create_initial_population(population_size, rule_size, population_backend)
+            # RESET SEEDS FOR THE WHOLE RUN, REDRAWN EVERY GENERATION WITH THE 'per_generation' SCHEDULE
+            episode_seeds = draw_episode_seeds(seed_schedule=seed_schedule)
+            first_generation = 0
+        else:
+            # CONTINUE EXACTLY WHERE THE CHECKPOINTED RUN STOPPED
+            population = checkpoint["population"]
+            generator = checkpoint["generator"]
+            episode_seeds = checkpoint["episode_seeds"]
+            random.setstate(checkpoint["random_state"])
+            first_generation = checkpoint["generation"]
+            print(f"Resuming GA from generation {first_generation} ({checkpoint_path})")
 
         # MAIN EVOLUTIONARY LOOP OVER SPECIFIED GENERATIONS
-        for generation_number in range(generations):
+        for generation_number in range(first_generation, generations):
             # START TIMER FOR THIS GENERATION
             start_time = time.perf_counter()
-            fitness_scores = []  # STORE FITNESS SCORES FOR EACH INDIVIDUAL
 
             # EVALUATE FITNESS FOR ENTIRE POPULATION
-            for rule in population:
-                rule_fitness = evaluate_rule(rule)
-                fitness_scores.append(rule_fitness)
-
-            # SELECT ELITE INDIVIDUALS TO CARRY FORWARD
-            elites = select_elites(population, fitness_scores, elite_fraction)
+            if seed_schedule == "per_generation" and generation_number > 0:
+                episode_seeds = draw_episode_seeds(seed_schedule=seed_schedule)
+            fitness_scores, statistics = evaluate_generation(
+                population, episode_seeds, executor, evaluation_backend, fitness_cache, survivor_count, ca_params
+            )
 
             # COMPUTE GENERATION STATISTICS
-            best_fitness = max(fitness_scores)
-            worst_fitness = min(fitness_scores)
-            average_fitness = sum(fitness_scores) / len(fitness_scores)
-            index_of_best = fitness_scores.index(best_fitness)
-            best_rule = population[index_of_best]
+            statistics.update(fitness_statistics(population, fitness_scores))
             # STOP TIMER AND CALCULATE DURATION IN MILLISECONDS
-            end_time = time.perf_counter()
-            time_ms = (end_time - start_time) * 1000
+            statistics["generation_time_ms"] = (time.perf_counter() - start_time) * 1000
 
             # OUTPUT PROGRESS TO CONSOLE
             print(
-                f"Gen {generation_number} · Best rule {best_rule} · Fitness {round(best_fitness, 1)}"
+                f"Gen {generation_number} · Best rule {statistics['best_rule']} · Fitness {round(statistics['best_fitness'], 1)}"
             )
 
             # WRITE GENERATION DATA TO CSV LOG
-            csv_writer.writerow([
-                generation_number,
-                str(best_rule),
-                f"{best_fitness:.2f}",
-                f"{average_fitness:.2f}",
-                f"{worst_fitness:.2f}",
-                f"{time_ms:.1f}"
-            ])
-
-            # BUILD NEXT GENERATION POPULATION STARTING WITH ELITES
-            next_population = list(elites)
-            # FILL REMAINING POPULATION WITH OFFSPRING
-            while len(next_population) < population_size:
-                # SELECT TWO PARENTS USING TOURNAMENT SELECTION
-                parent_one = tournament_selection(population, fitness_scores, tournament_size=3)
-                parent_two = tournament_selection(population, fitness_scores, tournament_size=3)
-                # PRODUCE CHILD VIA CROSSOVER
-                child = crossover(parent_one, parent_two)
-                # MUTATE CHILD BASED ON MUTATION RATE
-                mutated_child = mutate(child, mutation_rate)
-                next_population.append(mutated_child)
+            csv_writer.writerow(format_log_row(generation_number, statistics))
 
             # UPDATE POPULATION FOR NEXT GENERATION
-            population = next_population
+            population = breed_next_generation(
+                population, fitness_scores, elite_fraction, mutation_rate, crossover_type, generator
+            )
+
+            # CHECKPOINT THE NEXT GENERATION, WITH EVERY RNG STATE NEEDED TO CONTINUE IT BIT FOR BIT
+            is_last_generation = generation_number == generations - 1
+            if checkpoint_path is not None and ((generation_number + 1) % checkpoint_interval == 0 or is_last_generation):
+                log_file.flush()
+                fitness_cache.save()
+                save_checkpoint(checkpoint_path, {
+                    "run_shape": run_shape,
+                    "run_config": run_config,
+                    "generation": generation_number + 1,
+                    "population": population,
+                    "fitness_scores": fitness_scores,
+                    "episode_seeds": episode_seeds,
+                    "random_state": random.getstate(),
+                    "generator": generator,
+                    "log_path": log_path,
+                })
 
         # AFTER EVOLUTION, EVALUATE FINAL POPULATION FITNESS
-        final_fitness_scores = []
-        for rule in population:
-            rule_fitness = evaluate_rule(rule)
-            final_fitness_scores.append(rule_fitness)
-        # IDENTIFY WINNING RULE FROM FINAL POPULATION
-        best_final_fitness = max(final_fitness_scores)
-        index_of_best = final_fitness_scores.index(best_final_fitness)
-        winner_rule = population[index_of_best]
-
-        # NOTIFY USER AND RETURN BEST RULE
+        if seed_schedule == "per_generation":
+            episode_seeds = draw_episode_seeds(seed_schedule=seed_schedule)
+        winner_rule, _ = select_winner(population, episode_seeds, executor, evaluation_backend, fitness_cache, ca_params)
+
+        # PERSIST CACHE AND NOTIFY USER AND RETURN BEST RULE
+        fitness_cache.save()
+        print(
+            f"Fitness cache: {fitness_cache.hits} hits, {fitness_cache.misses} misses "
+            f"({cache_hit_rate(fitness_cache.hits, fitness_cache.misses):.1%} hit rate)"
+        )
         print(f"GA log saved to {log_path}")
         return winner_rule
@@ -0,0 +1,227 @@
+import os
+import csv
+import time
+import queue
+import random
+import multiprocessing
+
+import numpy as np
+
+from ca_config import (
+    POPULATION_SIZE, NUMBER_OF_GENERATIONS, ELITE_PERCENTAGE, MUTATION_RATE, POPULATION_BACKEND, CROSSOVER_TYPE,
+    NEIGHBORHOOD_RADIUS, FITNESS_CACHE_SIZE, RACING_ENABLED, RACING_SURVIVOR_FRACTION, RUN_SEED, SEED_SCHEDULE,
+    NUMBER_OF_EPISODES, ISLAND_COUNT, MIGRATION_INTERVAL, MIGRATION_SIZE, MIGRATION_TOPOLOGY
+)
+from utils.ca.ca_params import resolve_ca_params
+from .functions.evaluation_backend import resolve_worker_count
+from .functions.batch_fitness_function import evaluate_population_batched
+from .functions.fitness_cache import FitnessCache
+from .genetic_algorithm import (
+    GA_LOG_FIELDS, draw_episode_seeds, create_initial_population, evaluate_generation, fitness_statistics,
+    format_log_row, breed_next_generation, select_winner, new_log_path
+)
+
+# EVERY ISLAND EVALUATES IN ITS OWN PROCESS, SO ONE CORE PER ISLAND IS ALREADY IN USE
+ISLAND_EVALUATION_BACKEND = "batched"
+
+# THIS FUNCTION RETURNS THE ISLANDS THAT island_index SENDS ITS MIGRANTS TO
+# topology: 'ring' (ONLY THE NEXT ISLAND) OR 'all_to_all' (EVERY OTHER ISLAND)
+def migration_targets(island_index, island_count, topology=MIGRATION_TOPOLOGY):
+    if topology == "ring":
+        return [(island_index + 1) % island_count]
+    if topology == "all_to_all":
+        return [target for target in range(island_count) if target != island_index]
+    raise ValueError(f"Unknown MIGRATION_TOPOLOGY = {topology!r}")
+
+# THIS FUNCTION REPLACES THE WORST INDIVIDUALS OF AN EVALUATED POPULATION WITH MIGRANTS, IN PLACE
+# migrants: LIST OF (rule, fitness), THE FITNESS IS KEPT UNTIL THE MIGRANT IS RE-EVALUATED NEXT GENERATION
+def insert_migrants(population, fitness_scores, migrants):
+    worst_indices = np.argsort(fitness_scores, kind="stable")[:len(migrants)]
+    for index, (rule, fitness) in zip(worst_indices, migrants):
+        population[index] = rule
+        fitness_scores[index] = fitness
+
+# THIS FUNCTION RUNS ONE ISLAND: THE REGULAR GENERATION LOOP, EXCHANGING ITS BEST RULES EVERY migration_interval GENERATIONS
+# inboxes: ONE QUEUE PER ISLAND, MIGRANTS FOR ISLAND i ARE PUT ON inboxes[i]
+# result_queue: RECEIVES ('generation', island, generation, statistics) PER GENERATION AND ('final', island, rule, fitness) AT THE END
+def run_island(island_index, island_count, island_seed, settings, inboxes, result_queue):
+    random.seed(island_seed)
+    ca_params = settings["ca_params"]
+    rule_size = 2 ** (2 * ca_params["neighborhood_radius"] + 1)
+    population_size = settings["population_size"]
+    fitness_cache = FitnessCache(settings["fitness_cache_size"], None)
+    survivor_count = None
+    if settings["racing_enabled"]:
+        survivor_count = max(
+            int(population_size * settings["elite_fraction"]),
+            int(population_size * settings["racing_survivor_fraction"]),
+            1
+        )
+    targets = migration_targets(island_index, island_count, settings["migration_topology"])
+    number_of_sources = 1 if settings["migration_topology"] == "ring" else island_count - 1
+
+    population, generator = create_initial_population(population_size, rule_size, settings["population_backend"])
+    episode_seeds = draw_episode_seeds(seed_schedule=settings["seed_schedule"])
+
+    for generation_number in range(settings["generations"]):
+        start_time = time.perf_counter()
+        if settings["seed_schedule"] == "per_generation" and generation_number > 0:
+            episode_seeds = draw_episode_seeds(seed_schedule=settings["seed_schedule"])
+        fitness_scores, statistics = evaluate_generation(
+            population, episode_seeds, None, ISLAND_EVALUATION_BACKEND, fitness_cache, survivor_count, ca_params
+        )
+        statistics.update(fitness_statistics(population, fitness_scores))
+        statistics["generation_time_ms"] = (time.perf_counter() - start_time) * 1000
+        result_queue.put(("generation", island_index, generation_number, statistics))
+
+        # MIGRATION: SEND THE BEST RULES, THEN WAIT FOR EVERY SOURCE ISLAND SO ALL ISLANDS STAY IN STEP
+        is_last_generation = generation_number == settings["generations"] - 1
+        if island_count > 1 and (generation_number + 1) % settings["migration_interval"] == 0 and not is_last_generation:
+            best_indices = np.argsort(fitness_scores, kind="stable")[::-1][:settings["migration_size"]]
+            migrants = [(list(map(int, population[index])), fitness_scores[index]) for index in best_indices]
+            for target in targets:
+                inboxes[target].put(migrants)
+            for _ in range(number_of_sources):
+                insert_migrants(population, fitness_scores, inboxes[island_index].get())
+
+        population = breed_next_generation(
+            population, fitness_scores, settings["elite_fraction"], settings["mutation_rate"],
+            settings["crossover_type"], generator
+        )
+
+    if settings["seed_schedule"] == "per_generation":
+        episode_seeds = draw_episode_seeds(seed_schedule=settings["seed_schedule"])
+    winner_rule, winner_fitness = select_winner(
+        population, episode_seeds, None, ISLAND_EVALUATION_BACKEND, fitness_cache, ca_params
+    )
+    result_queue.put(("final", island_index, winner_rule, winner_fitness))
+
+# THIS FUNCTION COMBINES THE STATISTICS OF EVERY ISLAND FOR ONE GENERATION INTO THE GLOBAL LOG ROW
+def global_statistics(island_statistics):
+    best = max(island_statistics, key=lambda statistics: statistics["best_fitness"])
+    return {
+        "best_rule": best["best_rule"],
+        "best_fitness": best["best_fitness"],
+        "avg_fitness": sum(statistics["avg_fitness"] for statistics in island_statistics) / len(island_statistics),
+        "worst_fitness": min(statistics["worst_fitness"] for statistics in island_statistics),
+        "generation_time_ms": max(statistics["generation_time_ms"] for statistics in island_statistics),
+        "cache_hits": sum(statistics["cache_hits"] for statistics in island_statistics),
+        "cache_misses": sum(statistics["cache_misses"] for statistics in island_statistics),
+        "saved_episodes": sum(statistics["saved_episodes"] for statistics in island_statistics),
+        "saved_steps": sum(statistics["saved_steps"] for statistics in island_statistics),
+    }
+
+# THIS FUNCTION WAITS FOR THE NEXT ISLAND RESULT, FAILING INSTEAD OF HANGING WHEN AN ISLAND PROCESS DIED
+def next_island_result(result_queue, processes):
+    while True:
+        try:
+            return result_queue.get(timeout=1.0)
+        except queue.Empty:
+            failed = [process.name for process in processes if process.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(f"Island process failed: {', '.join(failed)}")
+
+# THIS FUNCTION RUNS K GA POPULATIONS IN PARALLEL PROCESSES WITH PERIODIC MIGRATION AND RETURNS THE BEST FINAL RULE
+# EACH ISLAND SCORES ITS FINAL POPULATION ON ITS OWN EPISODES, SO THE K ISLAND WINNERS ARE RE-SCORED HERE
+# ON ONE SHARED SEED LIST BEFORE THE GLOBAL WINNER IS PICKED
+# THE GA LOG HAS ONE ROW PER ISLAND AND GENERATION PLUS ONE 'all' ROW WITH THE GLOBAL STATISTICS
+def island_genetic_algorithm(
+    island_count=ISLAND_COUNT,
+    population_size=POPULATION_SIZE,
+    generations=NUMBER_OF_GENERATIONS,
+    elite_fraction=ELITE_PERCENTAGE,
+    mutation_rate=MUTATION_RATE,
+    neighborhood_radius=NEIGHBORHOOD_RADIUS,
+    fitness_cache_size=FITNESS_CACHE_SIZE,
+    racing_enabled=RACING_ENABLED,
+    racing_survivor_fraction=RACING_SURVIVOR_FRACTION,
+    run_seed=RUN_SEED,
+    seed_schedule=SEED_SCHEDULE,
+    population_backend=POPULATION_BACKEND,
+    crossover_type=CROSSOVER_TYPE,
+    migration_interval=MIGRATION_INTERVAL,
+    migration_size=MIGRATION_SIZE,
+    migration_topology=MIGRATION_TOPOLOGY,
+    ca_params=None,
+):
+    # CA PARAMETERS OF THIS RUN: ca_config, OVERRIDDEN BY neighborhood_radius AND THEN BY ca_params
+    ca_params = resolve_ca_params({"neighborhood_radius": neighborhood_radius, **(ca_params or {})})
+    island_count = resolve_worker_count(island_count)
+    # EVERY ISLAND GETS ITS OWN SEED, DRAWN FROM THE RUN SEED
+    seed_source = random.Random(run_seed)
+    island_seeds = [seed_source.randrange(2 ** 32) for _ in range(island_count)]
+    if seed_schedule == "none":
+        final_episode_seeds = [None] * NUMBER_OF_EPISODES
+    else:
+        final_episode_seeds = [seed_source.randrange(2 ** 32) for _ in range(NUMBER_OF_EPISODES)]
+    settings = {
+        "population_size": population_size,
+        "generations": generations,
+        "elite_fraction": elite_fraction,
+        "mutation_rate": mutation_rate,
+        "ca_params": ca_params,
+        "fitness_cache_size": fitness_cache_size,
+        "racing_enabled": racing_enabled,
+        "racing_survivor_fraction": racing_survivor_fraction,
+        "seed_schedule": seed_schedule,
+        "population_backend": population_backend,
+        "crossover_type": crossover_type,
+        "migration_interval": migration_interval,
+        "migration_size": migration_size,
+        "migration_topology": migration_topology,
+    }
+
+    # NEW UNIQUE FILE FOR THE GA LOG
+    log_path = new_log_path("ga_islands_log")
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+
+    inboxes = [multiprocessing.Queue() for _ in range(island_count)]
+    result_queue = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=run_island,
+            args=(island_index, island_count, island_seeds[island_index], settings, inboxes, result_queue),
+            name=f"island-{island_index}",
+            daemon=True
+        )
+        for island_index in range(island_count)
+    ]
+    for process in processes:
+        process.start()
+
+    finals = []
+    try:
+        with open(log_path, mode='w', newline='') as log_file:
+            csv_writer = csv.writer(log_file)
+            csv_writer.writerow(GA_LOG_FIELDS[:1] + ["island"] + GA_LOG_FIELDS[1:])
+
+            # WRITE ISLAND ROWS AS THEY ARRIVE, AND THE GLOBAL ROW ONCE EVERY ISLAND FINISHED THAT GENERATION
+            pending_generations = {}
+            while len(finals) < island_count:
+                result = next_island_result(result_queue, processes)
+                if result[0] == "final":
+                    finals.append(result[1:])
+                    continue
+                _, island_index, generation_number, statistics = result
+                csv_writer.writerow(format_log_row(generation_number, statistics, (island_index,)))
+                pending_generations.setdefault(generation_number, []).append(statistics)
+                if len(pending_generations[generation_number]) == island_count:
+                    combined = global_statistics(pending_generations.pop(generation_number))
+                    csv_writer.writerow(format_log_row(generation_number, combined, ("all",)))
+                    print(
+                        f"Gen {generation_number} · {island_count} islands · Best rule {combined['best_rule']} "
+                        f"· Fitness {round(combined['best_fitness'], 1)}"
+                    )
+    finally:
+        # ON FAILURE THE REMAINING ISLANDS WOULD WAIT FOREVER FOR MIGRANTS, SO STOP THEM
+        for process in processes:
+            if len(finals) < island_count:
+                process.terminate()
+            process.join()
+
+    # RE-SCORE THE ISLAND WINNERS ON THE SAME EPISODES (COMMON RANDOM NUMBERS), IN ISLAND ORDER FOR A STABLE TIE-BREAK
+    island_winners = [rule for _, rule, _ in sorted(finals)]
+    final_fitness_scores = evaluate_population_batched(island_winners, final_episode_seeds, ca_params)
+    winner_rule = island_winners[final_fitness_scores.index(max(final_fitness_scores))]
+    print(f"GA log saved to {log_path}")
+    return winner_rule
@@ -1,7 +1,6 @@
 # lqr.py
 
 import numpy as np
-from scipy.linalg import solve_continuous_are
 
 # -------------------------
 # Static Constants
@@ -60,6 +59,8 @@ def get_lqr_gain(A, B, Q_vals, R_val):
     Returns:
         K (ndarray): Gain matrix such that u = -Kx
     """
+    from scipy.linalg import solve_continuous_are                                   # scipy is only needed here, not at import
+
     Q = np.diag(Q_vals)                                                             # Create diagonal Q matrix from weights
     R = np.array([[R_val]])                                                         # Create scalar R matrix
     P = solve_continuous_are(A, B, Q, R)                                            # Solve the Riccati equation for cost-to-go matrix P
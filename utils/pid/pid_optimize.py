@@ -4,13 +4,12 @@ import numpy as np
 import gymnasium as gym
 import csv
 import os
-from itertools import product
-from concurrent.futures import ProcessPoolExecutor, as_completed
-import matplotlib.pyplot as plt
-import pandas as pd
-import seaborn as sns
+from itertools import product, islice
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from multiprocessing import freeze_support
 
+from utils.cartpole.cartpole import VectorCartPole, X_THRESHOLD
+
 # -------------------------
 # Search Configuration
 # -------------------------
@@ -22,188 +21,700 @@ KD_TH_VALUES = np.linspace(0.0, 15.0, 15)
 KI_TH_VALUES = np.linspace(0.0, 2.0, 10)                                            # Integral gain for pole angle (theta)
 
 NUM_EPISODES_PER_COMBO = 3                                                          # How many episodes to run per PID combination
+RUN_SEED = 0                                                                        # Seed for the reset seeds shared by every combination, None = unseeded resets
 MAX_STEPS = 100000                                                                  # Max steps per episode (custom override)
 LOG_FILE = "results/pid_grid_log.csv"                                               # File to log results from all combinations
 
+STABILITY_EARLY_EXIT = True                                                         # End an episode early once the state has settled, False = always run to MAX_STEPS
+STABILITY_BOUNDS = np.array([1.2, 0.6, 0.02, 1.0], dtype=np.float32)               # |x|, |x_dot|, |theta|, |theta_dot| of the settled region (the velocities keep chattering under bang-bang control)
+STABILITY_DRIFT = 0.05                                                              # Max cart displacement within the window, catches slow drift off the track
+STABILITY_WINDOW = 1000                                                             # Consecutive settled steps that count as stable
+                                                                                    # (and whose mean cart velocity, projected over the
+                                                                                    # remaining steps, keeps the cart within X_THRESHOLD)
+RESUME = False                                                                      # Skip combinations already in LOG_FILE instead of clearing it
+LOG_HEADER = ['kp_x', 'kd_x', 'kp_th', 'kd_th', 'ki_th', 'avg_steps',              # CSV schema shared by every search mode,
+              'stable_episodes', 'simulated_steps', 'round']                        # avg_steps includes projected stable episodes,
+                                                                                    # round is the adaptive round (0 for the grid)
+LOG_BUFFER_SIZE = 1 << 20                                                           # Write buffer of the search log, flushed once per block
+VECTORIZED_EVALUATION = True                                                        # Simulate a whole block of combinations as one VectorCartPole
+SCALAR_TAIL_LANES = 4                                                               # Running carts below which the vectorized evaluator hands the rest to
+                                                                                    # the scalar loop (one array step costs about as much as 4 scalar steps)
+CHUNK_SIZE = 1024                                                                   # Combinations evaluated per pool task
+MAX_IN_FLIGHT = None                                                                # Pool tasks submitted at once, None = two per CPU
+
+SEARCH_MODE = "grid"                                                                # 'grid' (every combination) or 'adaptive' (coarse-to-fine refinement,
+                                                                                    # only validated on a synthetic objective so far)
+PARAMETER_RANGES = [                                                                # (low, high) per gain, the same box as the grid
+    (float(values.min()), float(values.max()))
+    for values in (KP_X_VALUES, KD_X_VALUES, KP_TH_VALUES, KD_TH_VALUES, KI_TH_VALUES)
+]
+ADAPTIVE_POINTS_PER_AXIS = 3                                                        # Grid points per gain in every refinement round
+ADAPTIVE_TOP_K = 2                                                                  # Best combinations refined per round
+ADAPTIVE_ROUNDS = 8                                                                 # Maximum number of refinement rounds
+ADAPTIVE_SHRINK = 0.5                                                               # Spacing factor between rounds
+
+# -------------------------
+# Episode Seeds
+# -------------------------
+def draw_episode_seeds(run_seed=RUN_SEED, num_episodes=NUM_EPISODES_PER_COMBO):
+    """
+    Draws the reset seeds shared by every PID combination (common random numbers).
+
+    Parameters:
+        run_seed (int or None): Seed of the generator, None gives unseeded episodes
+        num_episodes (int): Number of episodes per combination
+
+    Returns:
+        list: One reset seed (or None) per episode
+    """
+    if run_seed is None:
+        return [None] * num_episodes
+    return np.random.default_rng(run_seed).integers(0, 2 ** 32, size=num_episodes).tolist()
+
 # -------------------------
 # Evaluation Function (runs in subprocess)
 # -------------------------
-def evaluate_pid_combination(args):
+def evaluate_pid_combination(args, episode_seeds=None, early_exit=STABILITY_EARLY_EXIT):
     """
     Evaluates a given PID parameter combination on the CartPole-v1 environment.
 
     Parameters:
         args (tuple): A 5-tuple of PID values: (kp_x, kd_x, kp_th, kd_th, ki_th)
+        episode_seeds (list or None): Reset seed per episode, shared by all combinations
+                                      so they are compared on the same initial states
+                                      (default: draw_episode_seeds())
+        early_exit (bool): End episodes that are detected as stable, see run_pid_episodes
 
     Returns:
         tuple: (avg_score, args) where avg_score is the average steps balanced
-                over NUM_EPISODES_PER_COMBO episodes.
+                over the episodes.
+    """
+    avg_score, _, _ = run_pid_episodes(args, episode_seeds, early_exit)
+    return avg_score, args
+
+
+def run_pid_episodes(args, episode_seeds=None, early_exit=STABILITY_EARLY_EXIT):
+    """
+    Runs the episodes of one PID parameter combination on the CartPole-v1 environment.
+
+    With early_exit, an episode whose observation stayed inside STABILITY_BOUNDS,
+    with the cart moving less than STABILITY_DRIFT, for STABILITY_WINDOW
+    consecutive steps ends as 'stable' and is scored as if it had balanced for
+    all MAX_STEPS steps, unless the cart's mean velocity over that run would
+    carry it past X_THRESHOLD before MAX_STEPS (see stays_on_track).
+
+    Parameters:
+        args (tuple): A 5-tuple of PID values: (kp_x, kd_x, kp_th, kd_th, ki_th)
+        episode_seeds (list or None): Reset seed per episode (default: draw_episode_seeds())
+        early_exit (bool): End episodes that are detected as stable
+
+    Returns:
+        tuple: (avg_score, stable_episodes, avg_simulated_steps) where avg_score
+               counts stable episodes with their projected MAX_STEPS.
 
     Note:
         Uses a basic PID formula: u = -(Kp*x + Kd*x_dot + Kp_theta*theta + Kd_theta*theta_dot + Ki_theta*integral_theta)
         Converts continuous force u into discrete action (0 or 1).
     """
-    kp_x, kd_x, kp_th, kd_th, ki_th = args
+    if episode_seeds is None:
+        episode_seeds = draw_episode_seeds()
     total_steps = []
+    simulated_steps = []
+    stable_episodes = 0
 
-    for _ in range(NUM_EPISODES_PER_COMBO):
+    for episode_seed in episode_seeds:
         env = gym.make("CartPole-v1")                                               # Create a fresh environment
-        obs, _ = env.reset()
-        steps = 0
-        theta_integral = 0.0                                                        # Reset integral term
-
-        for _ in range(MAX_STEPS):
-            # Convert observation to column vector
-            x = np.array([[obs[0]], [obs[1]], [obs[2]], [obs[3]]])
-            theta = x[2, 0]
-            theta_dot = x[3, 0]
-            pos = x[0, 0]
-            vel = x[1, 0]
-
-            # Accumulate integral of the pole angle over time
-            theta_integral += theta
-
-            # PID control law for balancing the pole
+        obs, _ = env.reset(seed=episode_seed)
+        steps, stable = continue_pid_episode(env, obs, args, early_exit=early_exit)
+        stable_episodes += stable
+        simulated_steps.append(steps)
+        total_steps.append(MAX_STEPS if stable else steps)
+        env.close()
+
+    avg_score = np.mean(total_steps)                                                # Average number of steps survived
+    return avg_score, stable_episodes, np.mean(simulated_steps)
+
+
+def continue_pid_episode(env, obs, args, steps=0, theta_integral=0.0, calm_steps=0, calm_start_x=0.0,
+                         early_exit=STABILITY_EARLY_EXIT):
+    """
+    Runs one PID episode from its current state until the pole falls, the
+    state is detected as stable or MAX_STEPS steps have passed.
+
+    Parameters:
+        env (gym.Env): CartPole-v1 environment in the state that produced obs
+        obs (ndarray): Current observation
+        args (tuple): A 5-tuple of PID values: (kp_x, kd_x, kp_th, kd_th, ki_th)
+        steps (int): Steps already taken in this episode
+        theta_integral (float): Integral of the pole angle so far
+        calm_steps (int): Consecutive settled steps so far
+        calm_start_x (float): Cart position where the current settled run began
+        early_exit (bool): End the episode once it is detected as stable
+
+    Returns:
+        tuple: (steps, stable) with the total number of steps taken
+    """
+    kp_x, kd_x, kp_th, kd_th, ki_th = args
+    for _ in range(MAX_STEPS - steps):
+        # Convert observation to column vector
+        x = np.array([[obs[0]], [obs[1]], [obs[2]], [obs[3]]])
+        theta = x[2, 0]
+        theta_dot = x[3, 0]
+        pos = x[0, 0]
+        vel = x[1, 0]
+
+        # Accumulate integral of the pole angle over time
+        theta_integral += theta
+
+        # PID control law for balancing the pole
+        u = (
+            - kp_x * pos
+            - kd_x * vel
+            - kp_th * theta
+            - kd_th * theta_dot
+            - ki_th * theta_integral
+        )
+
+        # Convert control output to discrete action (left or right force)
+        action = 0 if float(u) > 0 else 1
+
+        # Step the environment
+        obs, _, terminated, truncated, _ = env.step(action)
+        steps += 1
+        if terminated:
+            break
+
+        # Stability detection: the state settled, so the episode would run to MAX_STEPS
+        if early_exit:
+            if calm_steps == 0:
+                calm_start_x = obs[0]
+            settled = np.all(np.abs(obs) <= STABILITY_BOUNDS) and abs(obs[0] - calm_start_x) <= STABILITY_DRIFT
+            calm_steps = calm_steps + 1 if settled else 0
+            if calm_steps >= STABILITY_WINDOW and stays_on_track(obs[0], calm_start_x, calm_steps, MAX_STEPS - steps):
+                return steps, True
+
+    return steps, False
+
+
+def stays_on_track(x, calm_start_x, calm_steps, remaining_steps):
+    """
+    Checks that a settled cart stays on the track for the rest of the episode.
+
+    The cart keeps its mean velocity over the settled run, so its position is
+    extrapolated linearly over the remaining steps. A slow drift of a few
+    hundredths per window stays inside STABILITY_DRIFT but adds up to several
+    units over MAX_STEPS, far past X_THRESHOLD.
+
+    Parameters:
+        x (float or ndarray): Current cart position
+        calm_start_x (float or ndarray): Cart position where the settled run began
+        calm_steps (int or ndarray): Length of the settled run
+        remaining_steps (int): Steps left until MAX_STEPS
+
+    Returns:
+        bool or ndarray: True where the projected cart position stays within X_THRESHOLD
+    """
+    x = np.asarray(x, dtype=np.float64)                                             # float64, so scalar and vectorized evaluators agree
+    drift = x - np.asarray(calm_start_x, dtype=np.float64)
+    return np.abs(x + drift * remaining_steps / np.maximum(calm_steps, 1)) <= X_THRESHOLD
+
+
+# -------------------------
+# Vectorized Evaluation (runs in subprocess)
+# -------------------------
+def evaluate_pid_combinations_vectorized(combos, episode_seeds=None, early_exit=STABILITY_EARLY_EXIT,
+                                         scalar_tail_lanes=SCALAR_TAIL_LANES):
+    """
+    Evaluates many PID parameter combinations at once, one cart per combination.
+
+    The gains are held as an (N, 5) matrix and the carts as one VectorCartPole,
+    so every step computes all control signals and actions with a few array
+    operations. Carts whose pole fell, or that were detected as stable, are
+    dropped from the simulation; like run_pid_episodes, episodes otherwise
+    run for MAX_STEPS steps. Once SCALAR_TAIL_LANES or fewer carts are left,
+    their episodes continue in continue_pid_episode, since the per-step cost of
+    the array operations no longer pays off for a handful of carts.
+
+    Parameters:
+        combos (sequence): 5-tuples of PID values (kp_x, kd_x, kp_th, kd_th, ki_th)
+        episode_seeds (list or None): Reset seed per episode, shared by all combinations
+                                      (default: draw_episode_seeds())
+        early_exit (bool): End episodes that are detected as stable, see run_pid_episodes
+        scalar_tail_lanes (int): Running carts at which the scalar loop takes over, 0 never hands over
+
+    Returns:
+        tuple: (avg_scores, stable_episodes, avg_simulated_steps) arrays, one entry per
+               combination, with the same values as run_pid_episodes
+    """
+    if episode_seeds is None:
+        episode_seeds = draw_episode_seeds()
+    gains = np.asarray(combos, dtype=np.float64).reshape(-1, 5)
+    num_combos = len(gains)
+    simulated_steps = np.zeros(num_combos)
+    projected_steps = np.zeros(num_combos)                                          # Steps stable episodes were spared
+    stable_episodes = np.zeros(num_combos, dtype=np.int64)
+
+    for episode_seed in episode_seeds:
+        carts = VectorCartPole(num_combos, max_episode_steps=None)
+        obs = carts.reset(seeds=[episode_seed] * num_combos)
+        lanes = np.arange(num_combos)                                               # Combination of every running cart
+        lane_gains = gains
+        theta_integral = np.zeros(num_combos, dtype=np.float32)                     # float32, like the scalar evaluator
+        calm_steps = np.zeros(num_combos, dtype=np.int64)                           # Consecutive settled steps
+        calm_start_x = np.zeros(num_combos, dtype=np.float32)                       # Cart position where the settled run began
+
+        for step_index in range(MAX_STEPS):
+            theta_integral += obs[:, 2]
+
+            # Same PID law and evaluation order as evaluate_pid_combination, for every cart at once
             u = (
-                - kp_x * pos
-                - kd_x * vel
-                - kp_th * theta
-                - kd_th * theta_dot
-                - ki_th * theta_integral
+                - lane_gains[:, 0] * obs[:, 0]
+                - lane_gains[:, 1] * obs[:, 1]
+                - lane_gains[:, 2] * obs[:, 2]
+                - lane_gains[:, 3] * obs[:, 3]
+                - lane_gains[:, 4] * theta_integral
             )
+            actions = np.where(u > 0, 0, 1)
+
+            obs, _, terminated, _ = carts.step(actions)
+            simulated_steps[lanes] += 1
+            finished = terminated
+
+            # Stability detection: carts whose state settled would run to MAX_STEPS
+            if early_exit:
+                calm_start_x = np.where(calm_steps == 0, obs[:, 0], calm_start_x)
+                settled = (
+                    np.all(np.abs(obs) <= STABILITY_BOUNDS, axis=1)
+                    & (np.abs(obs[:, 0] - calm_start_x) <= STABILITY_DRIFT)
+                    & ~terminated
+                )
+                calm_steps = np.where(settled, calm_steps + 1, 0)
+                stable = (calm_steps >= STABILITY_WINDOW) & stays_on_track(
+                    obs[:, 0], calm_start_x, calm_steps, MAX_STEPS - (step_index + 1)
+                )
+                if stable.any():
+                    stable_episodes[lanes[stable]] += 1
+                    projected_steps[lanes[stable]] += MAX_STEPS - (step_index + 1)
+                    finished = terminated | stable
+
+            if finished.any():
+                running = ~finished
+                if not running.any():
+                    break
+                carts = carts.subset(running)
+                obs, lanes, lane_gains = obs[running], lanes[running], lane_gains[running]
+                theta_integral, calm_steps, calm_start_x = theta_integral[running], calm_steps[running], calm_start_x[running]
+
+            # Long-running tail: finish the last few carts one by one from their current state
+            if len(lanes) <= scalar_tail_lanes:
+                steps_taken = step_index + 1
+                for index, lane in enumerate(lanes):
+                    env = gym.make("CartPole-v1")
+                    env.reset()
+                    env.unwrapped.state = carts.states[index].copy()
+                    steps, stable = continue_pid_episode(
+                        env, obs[index], tuple(lane_gains[index]), steps_taken, theta_integral[index],
+                        int(calm_steps[index]), calm_start_x[index], early_exit
+                    )
+                    env.close()
+                    simulated_steps[lane] += steps - steps_taken
+                    if stable:
+                        stable_episodes[lane] += 1
+                        projected_steps[lane] += MAX_STEPS - steps
+                break
 
-            # Convert control output to discrete action (left or right force)
-            action = 0 if float(u) > 0 else 1
+    num_episodes = len(episode_seeds)
+    return (simulated_steps + projected_steps) / num_episodes, stable_episodes, simulated_steps / num_episodes
 
-            # Step the environment
-            obs, _, terminated, truncated, _ = env.step(action)
-            steps += 1
-            if terminated:
-                break
 
-        total_steps.append(steps)
-        env.close()
+def benchmark_block_evaluation(num_combos=41, sample_seed=0, tail_lanes=(0, 1, 4, 16)):
+    """
+    Times one block of grid combinations with the scalar evaluator and with the
+    vectorized evaluator for several SCALAR_TAIL_LANES values, and checks that
+    every variant returns the same scores.
 
-    avg_score = np.mean(total_steps)                                                # Average number of steps survived
-    return avg_score, args
+    Parameters:
+        num_combos (int): Combinations in the block, sampled from the grid
+        sample_seed (int): Seed of the sample
+        tail_lanes (tuple): scalar_tail_lanes values to time
+
+    Returns:
+        dict: {'scalar' or tail lanes: seconds}
+    """
+    import time
+    grid = list(product(KP_X_VALUES, KD_X_VALUES, KP_TH_VALUES, KD_TH_VALUES, KI_TH_VALUES))
+    sample = np.random.default_rng(sample_seed).choice(len(grid), num_combos, replace=False)
+    combos = [grid[index] for index in sample]
+    episode_seeds = draw_episode_seeds()
+
+    start_time = time.perf_counter()
+    expected = np.array([run_pid_episodes(combo, episode_seeds) for combo in combos])
+    timings = {'scalar': time.perf_counter() - start_time}
+    print(f"scalar                 {timings['scalar']:6.2f} s")
+    for lanes in tail_lanes:
+        start_time = time.perf_counter()
+        results = np.column_stack(evaluate_pid_combinations_vectorized(combos, episode_seeds, scalar_tail_lanes=lanes))
+        timings[lanes] = time.perf_counter() - start_time
+        if not np.array_equal(results, expected):
+            raise AssertionError(f"Vectorized scores differ from the scalar scores (scalar_tail_lanes={lanes})")
+        print(f"vectorized, tail <= {lanes:2d} {timings[lanes]:6.2f} s")
+    return timings
+
+
+# -------------------------
+# Block Evaluation (runs in subprocess)
+# -------------------------
+def evaluate_pid_block(combos, episode_seeds):
+    """
+    Evaluates a block of PID combinations in one pool task.
+
+    Parameters:
+        combos (tuple): 5-tuples of PID values
+        episode_seeds (list): Reset seeds shared by every combination
+
+    Returns:
+        ndarray: (len(combos), 3) rows of (avg_steps, stable_episodes, simulated_steps), in block order
+    """
+    if VECTORIZED_EVALUATION:
+        return np.column_stack(evaluate_pid_combinations_vectorized(combos, episode_seeds))
+    return np.array([run_pid_episodes(combo, episode_seeds) for combo in combos])
 
 
 # -------------------------
 # CSV Logger
 # -------------------------
-def log_result_csv(filepath, header, row):
+def create_search_log(filepath=LOG_FILE):
     """
-    Logs a dictionary of values as a row to a CSV file.
+    Opens the search log once for the whole search, appending to it.
 
     Parameters:
         filepath (str): Path to the output CSV file
-        header (list): Column names for the CSV
-        row (dict): Dictionary of values to write as a row
+
+    Returns:
+        tuple: (file handle, csv writer), the header is written if the file is new
+
+    Raises:
+        ValueError: If the existing log was written with a different LOG_HEADER
     """
-    exists = os.path.isfile(filepath)
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=header)
-        if not exists:
-            writer.writeheader()
-        writer.writerow(row)
+    if os.path.isfile(filepath):
+        with open(filepath, newline="") as f:
+            header = next(csv.reader(f), LOG_HEADER)
+        if header != LOG_HEADER:
+            raise ValueError(f"{filepath} has columns {header}, expected {LOG_HEADER}; clear it or set RESUME = False")
+        with open(filepath, "r+b") as f:
+            tail_start = max(f.seek(0, os.SEEK_END) - 4096, 0)
+            f.seek(tail_start)
+            f.truncate(tail_start + f.read().rfind(b"\n") + 1)                       # Drop a row cut short by an interruption
+    log_file = open(filepath, "a", newline="", buffering=LOG_BUFFER_SIZE)
+    log_writer = csv.writer(log_file)
+    if log_file.tell() == 0:
+        log_writer.writerow(LOG_HEADER)
+    return log_file, log_writer
+
+
+def load_completed_combos(filepath=LOG_FILE):
+    """
+    Reads the combinations already evaluated by an interrupted search.
+
+    Every block of results is flushed to the log as soon as it completes, so
+    the log doubles as the checkpoint of the search. A row cut short by the
+    interruption is ignored and evaluated again.
+
+    Parameters:
+        filepath (str): Path to the CSV file written by create_search_log
+
+    Returns:
+        dict: {(kp_x, kd_x, kp_th, kd_th, ki_th): avg_steps} for every completed combination
+    """
+    completed = {}
+    if not os.path.isfile(filepath):
+        return completed
+    with open(filepath, newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                combo = tuple(float(row[name]) for name in ('kp_x', 'kd_x', 'kp_th', 'kd_th', 'ki_th'))
+                completed[combo] = float(row['avg_steps'])
+            except (TypeError, ValueError):
+                continue
+    return completed
 
 
 # -------------------------
 # Parallel Grid Search Optimizer
 # -------------------------
-def optimize_pid_gains():
+def is_better(score, combo, best_score, best_combo):
+    """
+    Compares two results, breaking score ties by combination order, so the best
+    combination does not depend on the order in which pool blocks complete.
+
+    Parameters:
+        score (float), combo (tuple): Candidate result
+        best_score (float), best_combo (tuple or None): Best result so far
+
+    Returns:
+        bool: True if the candidate should replace the best result
+    """
+    if best_combo is None or score != best_score:
+        return best_combo is None or score > best_score
+    return tuple(map(float, combo)) < tuple(map(float, best_combo))             # Grid order: every axis ascending
+
+
+def verify_best(scores, verified, episode_seeds):
+    """
+    Finds the best combination, re-scoring candidates over the full horizon.
+
+    Early exit can only over-score a combination: some settled carts still fall
+    long after STABILITY_WINDOW. The best-ranked combination is therefore run
+    again without early exit until the top of the ranking is a verified score,
+    which no early-exit score below it can beat.
+
+    Parameters:
+        scores (dict): {combo: avg_steps}, verified entries are updated in place
+        verified (set): Combinations whose score is already a full-horizon score, updated in place
+        episode_seeds (list): Reset seeds shared by every combination
+
+    Returns:
+        tuple: (best_combo, best_score), ties broken in combination order
+    """
+    while True:
+        best_combo, best_score = min(scores.items(), key=lambda entry: (-entry[1], entry[0]))
+        if not STABILITY_EARLY_EXIT or best_combo in verified:
+            return best_combo, best_score
+        scores[best_combo], _ = evaluate_pid_combination(best_combo, episode_seeds, early_exit=False)
+        verified.add(best_combo)
+
+
+def evaluate_combos(executor, param_combos, episode_seeds, log_file, log_writer,
+                    chunk_size=CHUNK_SIZE, max_in_flight=MAX_IN_FLIGHT, round_index=0):
+    """
+    Evaluates PID combinations on a process pool in blocks, logging each block as it completes.
+
+    Combinations are taken lazily from param_combos and at most max_in_flight
+    blocks are submitted at any time, so memory stays flat however large the
+    grid is. Each finished block is written through the long-lived log writer
+    and flushed once.
+
+    Parameters:
+        executor (ProcessPoolExecutor): Pool the blocks are submitted to
+        param_combos (iterable): 5-tuples of PID values
+        episode_seeds (list): Reset seeds shared by every combination
+        log_file, log_writer: Search log from create_search_log
+        chunk_size (int): Combinations per pool task
+        max_in_flight (int or None): Blocks submitted at once, None = two per CPU
+        round_index (int): Search round written to the log's round column
+
+    Yields:
+        tuple: (avg_score, args) per combination, in completion order
+    """
+    if max_in_flight is None:
+        max_in_flight = 2 * (os.cpu_count() or 1)
+    remaining_combos = iter(param_combos)
+    in_flight = {}
+    tested = 0
+
+    def submit_next_block():
+        block = tuple(islice(remaining_combos, chunk_size))
+        if block:
+            in_flight[executor.submit(evaluate_pid_block, block, episode_seeds)] = block
+
+    for _ in range(max_in_flight):
+        submit_next_block()
+
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            block = in_flight.pop(future)
+            results = future.result()
+            submit_next_block()                                                     # Keep the pool busy while logging
+
+            scores = results[:, 0]
+            log_writer.writerows(
+                [*combo, score, int(stable), simulated, round_index]
+                for combo, (score, stable, simulated) in zip(block, results)
+            )
+            log_file.flush()
+            tested += len(block)
+            print(f"Tested {tested} combinations · block best {scores.max():.1f} steps")
+
+            yield from zip(scores, block)
+
+
+def print_best_combo(best_combo, best_score):
+    """
+    Prints the best PID combination found by a search.
+
+    Parameters:
+        best_combo (tuple): 5-tuple of PID values
+        best_score (float): Its average number of steps
+    """
+    kp_x, kd_x, kp_th, kd_th, ki_th = best_combo
+    print("\nBest PID combo:")
+    print(f"  KP_X={kp_x:.2f}")
+    print(f"  KD_X={kd_x:.2f}")
+    print(f"  KP_TH={kp_th:.2f}")
+    print(f"  KD_TH={kd_th:.2f}")
+    print(f"  KI_TH={ki_th:.2f}")
+    print(f"  → Avg: {best_score:.1f} steps")
+
+
+def start_search_log(resume):
+    """
+    Prepares LOG_FILE for a search.
+
+    Parameters:
+        resume (bool): Keep the log of an interrupted search instead of clearing it
+
+    Returns:
+        dict: {combo: avg_steps} of the combinations already evaluated (empty unless resuming)
+    """
+    if resume:
+        completed = load_completed_combos(LOG_FILE)                                 # Results of the interrupted run
+        print(f"Resuming: {len(completed)} combinations already in {LOG_FILE}")
+        return completed
+    if os.path.exists(LOG_FILE):
+        os.remove(LOG_FILE)                                                         # Clear previous results
+    return {}
+
+
+def optimize_pid_gains(resume=RESUME):
     """
     Performs a parallel grid search across all PID combinations.
 
     Submits each combination to a process pool and collects the average score.
     Logs each result to CSV and prints the best combination at the end.
 
+    Parameters:
+        resume (bool): Continue an interrupted search, only evaluating the
+                       combinations that are not in LOG_FILE yet
+
     Returns:
         tuple: The best-performing PID parameter combination.
     """
-    param_combos = list(product(
+    param_combos = product(
         KP_X_VALUES,
         KD_X_VALUES,
         KP_TH_VALUES,
         KD_TH_VALUES,
         KI_TH_VALUES
-    ))
+    )
+    grid_size = len(KP_X_VALUES) * len(KD_X_VALUES) * len(KP_TH_VALUES) * len(KD_TH_VALUES) * len(KI_TH_VALUES)
 
     best_combo = None
     best_score = 0.0
+    episode_seeds = draw_episode_seeds()                                           # Same initial states for every combination
 
-    print(f"Evaluating {len(param_combos)} combinations in parallel...\n")
-
-    header = ['kp_x', 'kd_x', 'kp_th', 'kd_th', 'ki_th', 'avg_steps']
-    if os.path.exists(LOG_FILE):
-        os.remove(LOG_FILE)                                                         # Clear previous results
-
-    with ProcessPoolExecutor() as executor:
-        futures = [executor.submit(evaluate_pid_combination, combo) for combo in param_combos]
-
-        for future in as_completed(futures):
-            score, args = future.result()
-            kp_x, kd_x, kp_th, kd_th, ki_th = args
+    completed = start_search_log(resume)
+    if completed:
+        best_combo, best_score = verify_best(dict(completed), set(), episode_seeds)
+    param_combos = (combo for combo in param_combos if tuple(map(float, combo)) not in completed)
 
-            print(f"Tested KP_TH={kp_th:.2f}, KD_TH={kd_th:.2f}, KI_TH={ki_th:.2f}, "
-                  f"KP_X={kp_x:.2f}, KD_X={kd_x:.2f} → {score:.1f} steps")
+    print(f"Evaluating {grid_size} combinations in parallel ({len(completed)} already logged)...\n")
 
-            log_result_csv(LOG_FILE, header, {
-                'kp_x': kp_x,
-                'kd_x': kd_x,
-                'kp_th': kp_th,
-                'kd_th': kd_th,
-                'ki_th': ki_th,
-                'avg_steps': score
-            })
+    log_file, log_writer = create_search_log()
 
-            if score > best_score:
+    with log_file, ProcessPoolExecutor() as executor:
+        for score, args in evaluate_combos(executor, param_combos, episode_seeds, log_file, log_writer):
+            if is_better(score, args, best_score, best_combo) and STABILITY_EARLY_EXIT:
+                score, _ = evaluate_pid_combination(args, episode_seeds, early_exit=False) # Early exit can over-score, see verify_best
+            if is_better(score, args, best_score, best_combo):
                 best_score = score
                 best_combo = args
 
-    # Print best configuration
-    kp_x, kd_x, kp_th, kd_th, ki_th = best_combo
-    print("\nBest PID combo:")
-    print(f"  KP_X={kp_x:.2f}")
-    print(f"  KD_X={kd_x:.2f}")
-    print(f"  KP_TH={kp_th:.2f}")
-    print(f"  KD_TH={kd_th:.2f}")
-    print(f"  KI_TH={ki_th:.2f}")
-    print(f"  → Avg: {best_score:.1f} steps")
-
+    print_best_combo(best_combo, best_score)
     return best_combo
 
 
 # -------------------------
-# Plot Results
+# Adaptive (Coarse-to-Fine) Search
 # -------------------------
-def plot_pid_results(filepath=LOG_FILE):
+def refine_grid(center, spacing, points_per_axis=ADAPTIVE_POINTS_PER_AXIS):
+    """
+    Builds a local grid around a combination, clipped to the search ranges.
+
+    Parameters:
+        center (tuple): 5-tuple of PID values at the middle of the grid
+        spacing (ndarray): Distance between neighbouring grid points, per parameter
+        points_per_axis (int): Grid points per parameter
+
+    Returns:
+        list: 5-tuples of PID values (duplicates from clipping removed)
+    """
+    offsets = np.arange(points_per_axis) - (points_per_axis - 1) / 2
+    axes = [
+        np.unique(np.round(np.clip(value + offsets * step, low, high), 10))
+        for value, step, (low, high) in zip(center, spacing, PARAMETER_RANGES)
+    ]
+    return [tuple(map(float, combo)) for combo in product(*axes)]
+
+
+def optimize_pid_gains_adaptive(
+    resume=RESUME,
+    points_per_axis=ADAPTIVE_POINTS_PER_AXIS,
+    top_k=ADAPTIVE_TOP_K,
+    rounds=ADAPTIVE_ROUNDS,
+    shrink=ADAPTIVE_SHRINK
+):
     """
-    Loads the logged results from CSV and generates a heatmap
-    showing how average steps vary with KP_TH and KD_TH.
+    Coarse-to-fine grid refinement over the same ranges as the full grid.
+
+    Starts with points_per_axis evenly spaced values per parameter. Every
+    following round evaluates a local grid around each of the top_k best
+    combinations so far, with the spacing multiplied by shrink. Combinations
+    that were already evaluated are never submitted again, and every result is
+    logged to LOG_FILE with the grid search schema, so plot_pid_results and
+    resume work unchanged. Stops early once a combination balances for MAX_STEPS
+    over the full horizon (see verify_best).
 
     Parameters:
-        filepath (str): Path to the CSV file containing grid search results
+        resume (bool): Reuse the results already in LOG_FILE
+        points_per_axis (int): Grid points per parameter in every round
+        top_k (int): Number of best combinations refined per round
+        rounds (int): Maximum number of rounds
+        shrink (float): Spacing factor between rounds
+
+    Returns:
+        tuple: The best-performing PID parameter combination.
     """
-    df = pd.read_csv(filepath)
+    scores = start_search_log(resume)
+    verified = set()                                                                # Combinations re-scored without early exit
+    episode_seeds = draw_episode_seeds()                                           # Same initial states for every combination
+    spacing = np.array([(high - low) / (points_per_axis - 1) for low, high in PARAMETER_RANGES])
+    centers = [tuple((low + high) / 2 for low, high in PARAMETER_RANGES)]
+    log_file, log_writer = create_search_log()
+
+    with log_file, ProcessPoolExecutor() as executor:
+        for round_index in range(rounds):
+            round_combos = dict.fromkeys(
+                combo for center in centers for combo in refine_grid(center, spacing, points_per_axis)
+            )
+            new_combos = [combo for combo in round_combos if combo not in scores]
+            for score, args in evaluate_combos(executor, new_combos, episode_seeds, log_file, log_writer,
+                                               round_index=round_index):
+                scores[args] = score
+
+            # Best first, ties in combination order so the refined centers do not depend on completion order
+            best_combo, best_score = verify_best(scores, verified, episode_seeds)
+            ranking = sorted(scores.items(), key=lambda entry: (-entry[1], entry[0]))
+            centers = [combo for combo, _ in ranking[:top_k]]
+            print(f"Round {round_index}: {len(new_combos)} new combinations, "
+                  f"{len(scores)} total → best {best_score:.1f} steps")
+            if best_score >= MAX_STEPS:
+                break
+            spacing = spacing * shrink
+
+    print_best_combo(best_combo, best_score)
+    return best_combo
 
-    # Pivot data for heatmap
-    pivot = df.groupby(['kp_th', 'kd_th'])['avg_steps'].mean().unstack()
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(pivot, annot=True, fmt=".0f", cmap="viridis")
-    plt.title("PID Performance Heatmap (avg steps)")
-    plt.xlabel("KD_TH")
-    plt.ylabel("KP_TH")
-    plt.tight_layout()
-    os.makedirs("results/plots", exist_ok=True)
-    plt.savefig("results/plots/pid_heatmap.png")
-    plt.show()
 
 # -------------------------
 # Main Entry Point
 # -------------------------
 if __name__ == "__main__":
     freeze_support()                                                                # Required for Windows multiprocessing
-    best_combo = optimize_pid_gains()                                               # Run the grid search
-    plot_pid_results()                                                              # Visualize the results
\ No newline at end of file
+    if SEARCH_MODE == "adaptive":
+        best_combo = optimize_pid_gains_adaptive()                                  # Run the coarse-to-fine search
+    else:
+        best_combo = optimize_pid_gains()                                           # Run the grid search
+    from utils.pid.pid_plot import plot_pid_results                                 # Plotting libraries stay out of the pool workers
+    plot_pid_results(LOG_FILE)                                                      # Visualize the results
@@ -0,0 +1,35 @@
+# pid_plot.py
+# Plots of the PID search log, kept apart from pid_optimize so its worker processes never import the plotting stack
+
+import os
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from utils.pid.pid_optimize import LOG_FILE
+
+
+# -------------------------
+# Plot Results
+# -------------------------
+def plot_pid_results(filepath=LOG_FILE):
+    """
+    Loads the logged results from CSV and generates a heatmap
+    showing how average steps vary with KP_TH and KD_TH.
+
+    Parameters:
+        filepath (str): Path to the CSV file containing grid search results
+    """
+    df = pd.read_csv(filepath)
+
+    # Pivot data for heatmap
+    pivot = df.groupby(['kp_th', 'kd_th'])['avg_steps'].mean().unstack()
+    plt.figure(figsize=(10, 6))
+    sns.heatmap(pivot, annot=True, fmt=".0f", cmap="viridis")
+    plt.title("PID Performance Heatmap (avg steps)")
+    plt.xlabel("KD_TH")
+    plt.ylabel("KP_TH")
+    plt.tight_layout()
+    os.makedirs("results/plots", exist_ok=True)
+    plt.savefig("results/plots/pid_heatmap.png")
+    plt.show()